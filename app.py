@@ -1,11 +1,78 @@
-from flask import Flask, request, render_template
+import argparse
+import logging
+import math
+import os
+import time
+
+import numpy as np
+from flask import Flask, request, render_template, jsonify, url_for, g, Response
 
 app = Flask(__name__)
+app.config['MAX_BATCH_SIZE'] = int(os.environ.get('MAX_BATCH_SIZE', 1000))
+app.config['MAX_JOB_SIZE'] = int(os.environ.get('MAX_JOB_SIZE', 1000000))
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+# POST /metrics/profile may change the sample rate only when enabled
+app.config['PROFILE_CONTROL'] = os.environ.get('PROFILE_CONTROL', '') == '1'
 
-import rebar_props
-from conc_analysis_classes import ConcreteBeam, BeamCapacity, BeamStress
-from conc_analysis_classes import calc_fr
 import design_check_funcs
+import batch_analysis
+import sensitivity
+import section_cache
+import response_cache
+import incremental
+import worker_pool
+import metrics
+
+job_manager = worker_pool.JobManager(
+    max_workers=int(os.environ.get('WORKER_PROCESSES', 0)) or None,
+    chunk_size=int(os.environ.get('JOB_CHUNK_SIZE', 10000)),
+    result_ttl=float(os.environ.get('JOB_RESULT_TTL', 600)),
+    max_rows=int(os.environ.get('MAX_RETAINED_ROWS', 5000000)))
+
+profiler = metrics.SamplingProfiler()
+
+live_sessions = incremental.SessionStore(int(os.environ.get('LIVE_SESSIONS', 1024)))
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    profiler.sample_rate = app.config['PROFILE_SAMPLE_RATE']
+    g.profiler = profiler.start()
+
+@app.teardown_request
+def stop_request_profiler(exc):
+    # teardown runs even when the view raises, so the profiler is released
+    if g.get('profiler') is not None:
+        profiler.stop(g.pop('profiler'))
+
+@app.after_request
+def record_request_time(response):
+    if 'request_start' in g:
+        metrics.request_seconds.observe(request.endpoint or 'unknown',
+                                        time.perf_counter() - g.pop('request_start'))
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    text = metrics.render_metrics(section_cache.section_cache.stats(),
+                                  response_cache.response_cache.stats())
+    return Response(text, mimetype='text/plain; version=0.0.4')
+
+@app.route('/metrics/profile', methods=['GET', 'POST'])
+def profile_report():
+    if request.method == 'POST':
+        if not app.config['PROFILE_CONTROL']:
+            return jsonify(error="Profiler control is disabled; set PROFILE_CONTROL=1 to enable it."), 403
+        settings = request.get_json(silent=True) or {}
+        if 'sample_rate' in settings:
+            app.config['PROFILE_SAMPLE_RATE'] = min(max(float(settings['sample_rate']), 0.0), 1.0)
+        if settings.get('reset'):
+            profiler.reset()
+        return jsonify(sample_rate=app.config['PROFILE_SAMPLE_RATE'], profiled=profiler.num_profiled)
+    limit = request.args.get('limit', '30')
+    if not limit.isdigit() or int(limit) < 1:
+        return jsonify(error="'limit' must be a positive integer."), 400
+    return Response(profiler.report(int(limit)), mimetype='text/plain')
 
 @app.route('/')
 def index():
@@ -13,112 +80,373 @@ def index():
 
 @app.route('/process', methods=['POST'])
 def process():
+    # identical submissions are served from the response cache
+    key = response_cache.canonical_key(request.form)
+    if key is None:
+        return _process_form()
+    # the result depends only on the inputs, so a matching ETag is current
+    if request.if_none_match.contains(key):
+        response = Response(status=304)
+        response.set_etag(key)
+        return response
+    body = response_cache.response_cache.get(key)
+    if body is None:
+        body = _process_form().encode()
+        response_cache.response_cache.set(key, body)
+    response = Response(body, mimetype='text/html')
+    response.set_etag(key)
+    return response
+
+def _process_form() -> str:
     #---Input---
-    # beam dimensions
-    width = float(request.form['width'])
-    height = float(request.form['height'])
-    # reinforcing
-    cover = float(request.form['cover'])
-    bar_size = str(request.form['bar_size'])
-    spacing = float(request.form['spacing'])
-    # material properties
-    f_c = float(request.form['f_c'])
-    f_y = float(request.form['f_y'])
-    E_s = float(request.form['E_s'])
-    conc_density = float(request.form['conc_density'])
-    # loads
-    M_u = float(request.form['M_u'])
-    M_s = float(request.form['M_s'])
-    V_u = float(request.form['V_u'])
-    # resistance factors
-    phi_m = float(request.form['phi_m'])
-    phi_v = float(request.form['phi_v'])
+    with metrics.stage_timer('parse'):
+        # beam dimensions
+        width = float(request.form['width'])
+        height = float(request.form['height'])
+        # reinforcing
+        cover = float(request.form['cover'])
+        bar_size = str(request.form['bar_size'])
+        spacing = float(request.form['spacing'])
+        # material properties
+        f_c = float(request.form['f_c'])
+        f_y = float(request.form['f_y'])
+        E_s = float(request.form['E_s'])
+        conc_density = float(request.form['conc_density'])
+        # loads
+        M_u = float(request.form['M_u'])
+        M_s = float(request.form['M_s'])
+        V_u = float(request.form['V_u'])
+        # resistance factors
+        phi_m = float(request.form['phi_m'])
+        phi_v = float(request.form['phi_v'])
+        # intermediate results are rounded unless full precision is chosen;
+        # result.html rounds for display either way
+        full_precision = request.form.get('precision', 'rounded') == 'full'
 
     # Analysis
-    # steel area
-    rebar = rebar_props.RebarProperties(bar_size)
-    bar_area = rebar.bar_area
-    bar_diameter = rebar.bar_diameter
-    d_c = rebar_props.calc_position(cover, bar_diameter)
-    num_bars = width / spacing
-    steel_area = num_bars * bar_area
-    As_per_ft = rebar_props.calc_As_per_ft(bar_area, spacing)
-    # beam properties
-    beam = ConcreteBeam(width, height, d_c, f_c)
-    d_s = beam.d
-    w_DL = beam.calc_self_load(conc_density)
-    M_cr = beam.calc_Mcr()
-    f_r = calc_fr(f_c)
-    # beam capacity
-    capacity_analyzer = BeamCapacity(width, height, d_c, f_c, steel_area, f_y)
-    a = capacity_analyzer.calc_comp_block_depth()
-    M_n = capacity_analyzer.calc_moment_capacity()
-    epsilon_st = capacity_analyzer.calc_epsilon_t()
-    d_v = capacity_analyzer.calc_dv()
-    V_c = capacity_analyzer.calc_Vc()
-    V_n = capacity_analyzer.calc_shear_capacity()
-    # beam service stress
-    stress_analyzer = BeamStress(width, height, d_c, f_c, steel_area, E_s, conc_density)
-    cracking_ratio = M_u / M_cr
-    f_ct = stress_analyzer.calc_uncracked_stress(M_s)
-    if cracking_ratio < 1:
-        f_c = stress_analyzer.calc_uncracked_stress(M_s)
-        # update for uncracked steel stress
-        f_s = stress_analyzer.calc_steel_stress(M_s)
-    else:
-        f_s = stress_analyzer.calc_steel_stress(M_s)
-        f_c = stress_analyzer.calc_conc_stress(M_s)
+    with metrics.stage_timer('section'):
+        # section properties, capacity and stiffness (cached per section)
+        section = section_cache.analyze_section(width, height, cover, bar_size, spacing,
+                                                f_c, f_y, E_s, conc_density, full_precision)
+        d_c = section['d_c']
+        As_per_ft = section['As_per_ft']
+        d_s = section['d_s']
+        w_DL = section['w_DL']
+        M_cr = section['M_cr']
+        f_r = section['f_r']
+        a = section['a']
+        M_n = section['M_n']
+        epsilon_st = section['epsilon_st']
+        d_v = section['d_v']
+        V_n = section['V_n']
 
-    # Design Checks
-    # flexure reinforcing
-    moment_check = design_check_funcs.check_capacity(M_n, M_u, phi_m) >= 1
-    moment_ratio = design_check_funcs.calc_demand_ratio(M_u, M_n, phi_m)
-    gamma_3 = design_check_funcs.determine_gamma_3(f_y)
-    M_design = design_check_funcs.calc_design_M(M_u, M_cr, gamma_3=gamma_3)
-    min_reinf_check = design_check_funcs.check_capacity(M_n, M_design, phi_m) >= 1
-    min_reinf_ratio = design_check_funcs.calc_demand_ratio(M_design, M_n, phi_m)
-    s_max = design_check_funcs.calc_design_spacing(f_r, f_ct, f_s, f_y, height, d_c)
-    crack_control_check = spacing <= s_max
-    crack_control_ratio = spacing / s_max
-    epsilon_tl = design_check_funcs.calc_epsilon_tl(f_y)
-    ductility_check = epsilon_st > epsilon_tl
-    ductility_ratio = epsilon_tl / epsilon_st
-    A_ts = design_check_funcs.calc_dist_reinf(width, height, f_y)
-    distr_reinf_check = As_per_ft / A_ts >= 1
-    dist_reinf_ratio = A_ts / As_per_ft
-    gamma_er = design_check_funcs.calc_excess_reinf(M_design, phi_m * M_n)
-    # shear
-    shear_check = design_check_funcs.check_capacity(V_n, V_u, phi_v) >= 1
-    shear_ratio = design_check_funcs.calc_demand_ratio(V_u, V_n, phi_v)
+    with metrics.stage_timer('stress'):
+        # beam service stress from the cached section stiffness
+        stresses = section_cache.calc_service_stresses(section, M_s)
+        cracking_ratio = M_u / M_cr
+        f_ct = stresses['f_ct']
+        if cracking_ratio < 1:
+            f_c = stresses['f_ct']
+            # update for uncracked steel stress
+            f_s = stresses['f_s']
+        else:
+            f_s = stresses['f_s']
+            f_c = stresses['f_c']
 
+    # Design Checks
+    with metrics.stage_timer('design_checks'):
+        # flexure reinforcing
+        moment_check = design_check_funcs.check_capacity(M_n, M_u, phi_m) >= 1
+        moment_ratio = design_check_funcs.calc_demand_ratio(M_u, M_n, phi_m)
+        gamma_3 = design_check_funcs.determine_gamma_3(f_y)
+        M_design = design_check_funcs.calc_design_M(M_u, M_cr, gamma_3=gamma_3)
+        min_reinf_check = design_check_funcs.check_capacity(M_n, M_design, phi_m) >= 1
+        min_reinf_ratio = design_check_funcs.calc_demand_ratio(M_design, M_n, phi_m)
+        s_max = design_check_funcs.calc_design_spacing(f_r, f_ct, f_s, f_y, height, d_c)
+        crack_control_check = spacing <= s_max
+        crack_control_ratio = spacing / s_max
+        epsilon_tl = design_check_funcs.calc_epsilon_tl(f_y)
+        ductility_check = epsilon_st > epsilon_tl
+        ductility_ratio = epsilon_tl / epsilon_st
+        A_ts = design_check_funcs.calc_dist_reinf(width, height, f_y, full_precision)
+        distr_reinf_check = As_per_ft / A_ts >= 1
+        dist_reinf_ratio = A_ts / As_per_ft
+        gamma_er = design_check_funcs.calc_excess_reinf(M_design, phi_m * M_n, full_precision)
+        # shear
+        shear_check = design_check_funcs.check_capacity(V_n, V_u, phi_v) >= 1
+        shear_ratio = design_check_funcs.calc_demand_ratio(V_u, V_n, phi_v)
 
     # Return results to the user
-    return render_template('result.html',
-                           d_s=d_s,
-                           w_DL=w_DL,
-                           M_cr=M_cr,
-                           a=a,
-                           moment_capacity=phi_m * M_n,
-                           epsilon_st=epsilon_st,
-                           d_v=d_v,
-                           shear_capacity=phi_v * V_n,
-                           f_s=f_s,
-                           f_c=f_c,
-                           A_ts=A_ts,
-                           moment_check=moment_check,
-                           shear_check=shear_check,
-                           min_reinf_check=min_reinf_check,
-                           crack_control_check=crack_control_check,
-                           ductility_check=ductility_check,
-                           distr_reinf_check=distr_reinf_check,
-                           gamma_er=gamma_er,
-                           moment_ratio=moment_ratio,
-                           shear_ratio=shear_ratio,
-                           min_reinf_ratio=min_reinf_ratio,
-                           crack_control_ratio=crack_control_ratio,
-                           ductility_ratio=ductility_ratio,
-                           dist_reinf_ratio=dist_reinf_ratio
-                           )
+    with metrics.stage_timer('render'):
+        return render_template('result.html',
+                               d_s=d_s,
+                               w_DL=w_DL,
+                               M_cr=M_cr,
+                               a=a,
+                               moment_capacity=phi_m * M_n,
+                               epsilon_st=epsilon_st,
+                               d_v=d_v,
+                               shear_capacity=phi_v * V_n,
+                               f_s=f_s,
+                               f_c=f_c,
+                               A_ts=A_ts,
+                               moment_check=moment_check,
+                               shear_check=shear_check,
+                               min_reinf_check=min_reinf_check,
+                               crack_control_check=crack_control_check,
+                               ductility_check=ductility_check,
+                               distr_reinf_check=distr_reinf_check,
+                               gamma_er=gamma_er,
+                               moment_ratio=moment_ratio,
+                               shear_ratio=shear_ratio,
+                               min_reinf_ratio=min_reinf_ratio,
+                               crack_control_ratio=crack_control_ratio,
+                               ductility_ratio=ductility_ratio,
+                               dist_reinf_ratio=dist_reinf_ratio
+                               )
+
+def _parse_live_inputs(fields) -> dict:
+    """
+    Converts the submitted subset of form fields into process graph inputs.
+    """
+    inputs = {}
+    for field, value in fields.items():
+        if field == 'precision':
+            inputs['full_precision'] = value == 'full'
+        elif field == 'bar_size':
+            inputs[field] = str(value)
+        elif field in batch_analysis.INPUT_FIELDS:
+            inputs[field] = float(value)
+    return inputs
+
+@app.route('/api/v1/live', methods=['POST'])
+def live_update():
+    # body is a JSON object with 'session' and 'inputs', or form fields
+    # with a 'session' field; only the changed outputs are returned
+    body = request.get_json(silent=True)
+    if isinstance(body, dict):
+        session_id, fields = body.get('session'), body.get('inputs', {})
+    else:
+        session_id, fields = request.form.get('session'), request.form
+    if not isinstance(fields, dict) and fields is not request.form:
+        return jsonify(error="'inputs' must be an object of form fields."), 400
+    evaluator = live_sessions.get(session_id)
+    if evaluator is None:
+        # a session is kept only once its first update succeeds
+        session_id = None
+        evaluator = incremental.IncrementalEvaluator(incremental.process_graph, incremental.INPUT_DEFAULTS)
+    try:
+        changed = evaluator.update(_parse_live_inputs(fields))
+    except (TypeError, ValueError, ZeroDivisionError) as err:
+        return jsonify(session=session_id, error=str(err)), 400
+    if session_id is None:
+        session_id = live_sessions.add(evaluator)
+    outputs = incremental.changed_outputs(changed)
+    return jsonify(session=session_id, outputs={name: _json_value(value) for name, value in outputs.items()})
+
+def _json_value(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def _json_array(values):
+    """
+    Converts an array of any shape into nested lists with non-finite
+    values as None.
+    """
+    values = np.asarray(values)
+    if values.ndim == 0:
+        return _json_value(values.item())
+    return [_json_array(value) for value in values]
+
+# inputs that must be greater than zero, and those that must not be negative
+POSITIVE_FIELDS = ('width', 'height', 'spacing', 'f_c', 'f_y', 'E_s', 'conc_density', 'phi_m', 'phi_v')
+NON_NEGATIVE_FIELDS = ('cover',)
+
+def _parse_cases(cases: list) -> dict:
+    """
+    Converts a list of JSON beam cases into input columns for
+    batch_analysis.check_sections. phi_m and phi_v default to 0.9.
+
+    Raises ValueError naming the case for a case that is not an object, a
+    missing field, or a value outside its physical range.
+    """
+    defaults = {'phi_m': 0.9, 'phi_v': 0.9}
+    columns = {field: [] for field in batch_analysis.INPUT_FIELDS}
+    for index, case in enumerate(cases):
+        if not isinstance(case, dict):
+            raise ValueError(f"Case {index} must be an object of input fields.")
+        for field in batch_analysis.INPUT_FIELDS:
+            if field not in case and field not in defaults:
+                raise ValueError(f"Case {index}: missing input field '{field}'.")
+            value = case.get(field, defaults.get(field))
+            if field == 'bar_size':
+                columns[field].append(str(value))
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Case {index}: '{field}' must be a number.") from None
+            if not math.isfinite(value):
+                raise ValueError(f"Case {index}: '{field}' must be finite.")
+            if field in POSITIVE_FIELDS and value <= 0:
+                raise ValueError(f"Case {index}: '{field}' must be greater than zero.")
+            if field in NON_NEGATIVE_FIELDS and value < 0:
+                raise ValueError(f"Case {index}: '{field}' must not be negative.")
+            columns[field].append(value)
+    batch_analysis.lookup_bar_props(columns['bar_size'])
+    return columns
+
+def _results_to_json(results: dict, num_rows: int) -> list:
+    """
+    Converts result columns into one JSON object per case.
+    """
+    columns = {field: list(results[field]) for field in batch_analysis.RESULT_FIELDS}
+    return [{field: _json_value(columns[field][index]) for field in batch_analysis.RESULT_FIELDS}
+            for index in range(num_rows)]
+
+def _parse_precision(cases: list, default) -> np.ndarray:
+    """
+    Reads the 'precision' of each case, 'rounded' or 'full' as in the input
+    form, falling back to default.
+
+    Returns:
+    - Boolean array, True for the cases checked at full precision.
+    """
+    precisions = [case.get('precision', default) for case in cases]
+    unknown = {str(value) for value in precisions} - {'rounded', 'full'}
+    if unknown:
+        raise ValueError(f"Unknown precision {', '.join(sorted(unknown))}; use 'rounded' or 'full'.")
+    return np.array([value == 'full' for value in precisions], dtype=bool)
+
+def _read_cases(max_cases: int, precision: bool=False):
+    """
+    Reads and parses the JSON array of beam cases in the request body.
+
+    Parameters:
+    - max_cases: Largest number of cases accepted.
+    - precision: Also accept an object with 'cases' and a default
+      'precision', and a 'precision' field on each case.
+
+    Returns:
+    - Input columns and number of cases, and with precision the boolean
+      full precision array of _parse_precision, or an error response.
+    """
+    body = request.get_json(silent=True)
+    cases, default = body, 'rounded'
+    if precision and isinstance(body, dict):
+        cases, default = body.get('cases'), body.get('precision', default)
+    if not isinstance(cases, list):
+        return None, (jsonify(error="Request body must be a JSON array of beam cases."), 400)
+    if len(cases) > max_cases:
+        return None, (jsonify(error=f"Batch exceeds the maximum of {max_cases} cases."), 413)
+    try:
+        parsed = (_parse_cases(cases), len(cases))
+        if precision:
+            parsed += (_parse_precision(cases, default),)
+        return parsed, None
+    except ValueError as err:
+        return None, (jsonify(error=str(err)), 400)
+
+@app.route('/api/v1/check', methods=['POST'])
+def api_check():
+    # body is a JSON array of cases, or an object with 'cases' and a
+    # default 'precision'; each case may set its own 'precision'
+    parsed, error = _read_cases(app.config['MAX_BATCH_SIZE'], precision=True)
+    if error:
+        return error
+    columns, num_rows, full_precision = parsed
+    metrics.batch_size.observe('api_check', num_rows)
+    if not num_rows:
+        return jsonify([])
+    results = {field: [None] * num_rows for field in batch_analysis.RESULT_FIELDS}
+    for precision in np.unique(full_precision):
+        rows = np.flatnonzero(full_precision == precision)
+        group = {field: [values[row] for row in rows] for field, values in columns.items()}
+        group_results = batch_analysis.check_sections(**group, full_precision=bool(precision))
+        for field in batch_analysis.RESULT_FIELDS:
+            for row, value in zip(rows, np.broadcast_to(group_results[field], rows.shape).tolist()):
+                results[field][row] = value
+    return jsonify(_results_to_json(results, num_rows))
+
+@app.route('/api/v1/sweep', methods=['POST'])
+def api_sweep():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not isinstance(body.get('inputs'), dict) \
+            or not isinstance(body.get('grid'), dict) or not body['grid']:
+        return jsonify(error="Request body must be an object with 'inputs' and 'grid'."), 400
+    grid = body['grid']
+    num_points = math.prod(len(values) if isinstance(values, list) else 1 for values in grid.values())
+    if num_points > app.config['MAX_BATCH_SIZE']:
+        return jsonify(error=f"Sweep exceeds the maximum of {app.config['MAX_BATCH_SIZE']} points."), 413
+    try:
+        swept = sensitivity.sweep(body['inputs'], grid, derivatives=bool(body.get('derivatives')))
+    except (TypeError, ValueError, KeyError) as err:
+        return jsonify(error=str(err)), 400
+    metrics.batch_size.observe('api_sweep', num_points)
+    response = {
+        'grid': {name: _json_array(values) for name, values in swept['grid'].items()},
+        'results': {field: _json_array(swept['results'][field]) for field in batch_analysis.RESULT_FIELDS},
+    }
+    if 'sensitivities' in swept:
+        response['sensitivities'] = {
+            'values': {name: _json_array(values) for name, values in swept['sensitivities']['values'].items()},
+            'derivatives': {name: {param: _json_array(values) for param, values in partials.items()}
+                            for name, partials in swept['sensitivities']['derivatives'].items()},
+        }
+    return jsonify(response)
+
+@app.route('/api/v1/jobs', methods=['POST'])
+def submit_job():
+    parsed, error = _read_cases(app.config['MAX_JOB_SIZE'])
+    if error:
+        return error
+    columns, num_rows = parsed
+    metrics.batch_size.observe('jobs', num_rows)
+    try:
+        job_id = job_manager.submit(columns, num_rows)
+    except worker_pool.JobCapacityError as err:
+        return jsonify(error=str(err)), 503
+    return jsonify(job_id=job_id, status_url=url_for('job_status', job_id=job_id)), 202
+
+@app.route('/api/v1/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    state = job_manager.status(job_id)
+    if state is None:
+        return jsonify(error=f"Unknown or expired job '{job_id}'."), 404
+    if state['status'] == 'retrieved':
+        return jsonify(error=f"Results of job '{job_id}' were already retrieved."), 410
+    if state['status'] == 'done':
+        state['results'] = _results_to_json(state['results'], state['num_rows'])
+    return jsonify(state)
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the concrete beam web app.")
+    parser.add_argument('--production', action='store_true',
+                        help="Serve with waitress when installed, with the batch worker pool "
+                             "started before any request thread.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, help="Number of batch worker processes.")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('SERVER_THREADS', 8)),
+                        help="Number of waitress request threads.")
+    args = parser.parse_args()
+
+    if args.workers:
+        job_manager.max_workers = args.workers
+    if args.production:
+        # workers start from a forkserver (or spawn) process, before the
+        # server creates its threads
+        job_manager.start()
+        try:
+            from waitress import serve
+        except ImportError:
+            # the Werkzeug server is for development only; install waitress or
+            # run under a WSGI server such as gunicorn ("gunicorn app:app")
+            logging.getLogger(__name__).warning(
+                "waitress is not installed; falling back to the development server.")
+            app.run(host=args.host, port=args.port, threaded=True)
+        else:
+            serve(app, host=args.host, port=args.port, threads=args.threads)
+    else:
+        app.run(host=args.host, port=args.port, debug=True)
\ No newline at end of file
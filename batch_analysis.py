@@ -0,0 +1,381 @@
+import numpy as np
+import rebar_props
+
+SECTION_FIELDS = ('width', 'height', 'd_c', 'f_c', 'steel_area', 'f_y', 'E_s', 'conc_density')
+
+INPUT_FIELDS = ('width', 'height', 'cover', 'bar_size', 'spacing', 'f_c', 'f_y', 'E_s',
+                'conc_density', 'M_u', 'M_s', 'V_u', 'phi_m', 'phi_v')
+
+RESULT_FIELDS = ('d_s', 'w_DL', 'M_cr', 'a', 'moment_capacity', 'epsilon_st', 'd_v',
+                 'shear_capacity', 'f_s', 'f_c', 'A_ts', 'moment_check', 'shear_check',
+                 'min_reinf_check', 'crack_control_check', 'ductility_check',
+                 'distr_reinf_check', 'gamma_er', 'moment_ratio', 'shear_ratio',
+                 'min_reinf_ratio', 'crack_control_ratio', 'ductility_ratio',
+                 'dist_reinf_ratio')
+
+# decimals the scalar classes round each result to, applied at output
+DISPLAY_DECIMALS = {'w_DL': 2, 'M_cr': 1, 'a': 3, 'moment_capacity': 1, 'epsilon_st': 3, 'd_v': 2,
+                    'shear_capacity': 1, 'f_s': 3, 'f_c': 3, 'A_ts': 3, 'gamma_er': 2}
+
+def calc_beta1_array(f_c):
+    """
+    Calculates concrete stress block factor for an array of strengths.
+
+    Parameters:
+    - f_c: Compressive strength of concrete (ksi).
+    """
+    f_c = np.asarray(f_c, dtype=float)
+    return np.clip(0.85 - (f_c - 4) * 0.05, 0.65, 0.85)
+
+def round_array(values, decimals: int):
+    """
+    Array form of the built-in round used by the scalar classes.
+
+    np.round scales by 10**decimals before rounding, so it rounds values
+    such as 0.765 (stored just above the tie) down where round gives 0.77.
+    Values whose scaled form lies close to a tie are rounded with round
+    itself, the rest with np.round.
+
+    Parameters:
+    - values: Array or scalar.
+    - decimals: Number of decimals.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.array(np.round(values, decimals))
+    scaled = values * 10.0 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, decimals) for value in values[near_tie].tolist()]
+    return rounded[()]
+
+def _rounder(full_precision: bool):
+    return (lambda values, decimals: values) if full_precision else round_array
+
+def round_results(results: dict, decimals: dict=None) -> dict:
+    """
+    Rounds full precision results for display or export.
+
+    Parameters:
+    - results: Arrays keyed by result name.
+    - decimals: Decimals per result name, DISPLAY_DECIMALS by default.
+      Results without an entry are returned unchanged.
+    """
+    decimals = DISPLAY_DECIMALS if decimals is None else decimals
+    return {name: round_array(values, decimals[name]) if name in decimals else values
+            for name, values in results.items()}
+
+def analyze_sections(width, height, d_c, f_c, steel_area, f_y, E_s, conc_density, M_s=None,
+                     full_precision: bool=False) -> dict:
+    """
+    Calculates the ConcreteBeam, BeamCapacity and BeamStress quantities for
+    many sections at once. Inputs are scalars or arrays that broadcast
+    together; values are rounded the same way as the scalar classes.
+
+    Parameters:
+    - width: Beam width (in).
+    - height: Beam height (in).
+    - d_c: Concrete face in tension to center of reinforcing (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - steel_area: Area of steel reinforcement (in²).
+    - f_y: Yield strength of steel (ksi).
+    - E_s: Elastic modulus of steel (ksi).
+    - conc_density: Concrete density (pcf).
+    - M_s: Service moment (k-ft), optional.
+    - full_precision: Skip the rounding of the scalar classes.
+
+    Returns:
+    - Dictionary of arrays keyed by quantity name.
+    """
+    rnd = _rounder(full_precision)
+    b, h, d_c, f_c, A_s, f_y, E_s, density = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in
+          (width, height, d_c, f_c, steel_area, f_y, E_s, conc_density)))
+    d = h - d_c
+
+    # ConcreteBeam
+    f_r = 0.24 * f_c ** 0.5
+    I_g = b * h ** 3 / 12
+    # same operation order as ConcreteBeam.calc_Sc, so M_cr rounds alike
+    S_c = (1 / 12 * b * h ** 3) / (h / 2)
+    M_cr = f_r * S_c / 12
+    w_DL = density / 1000 * b / 12 * h / 12
+    E_c = 33000 * (density / 1000) ** 1.5 * f_c ** 0.5
+
+    # BeamCapacity
+    a = (A_s * f_y) / (0.85 * f_c * b)
+    M_n = A_s * f_y * (d - a / 2) / 12
+    c = a / calc_beta1_array(f_c)
+    epsilon_t = 0.003 * (d - c) / c
+    d_v = np.maximum.reduce([d - c / 2, 0.9 * d, 0.72 * h])
+    V_c = 0.0316 * 2 * f_c ** 0.5 * b * d_v
+    V_n = np.minimum(V_c, 0.25 * f_c * b * d_v)
+
+    # BeamStress
+    n = E_s / E_c
+    rho = A_s / (b * d)
+    k = -rho * n + ((rho * n) ** 2 + 2 * rho * n) ** 0.5
+    j = 1 - k / 3
+
+    results = {
+        'd': d,
+        'w_DL': rnd(w_DL, 2),
+        'f_r': f_r,
+        'I_g': I_g,
+        'M_cr': rnd(M_cr, 1),
+        'a': rnd(a, 3),
+        'M_n': rnd(M_n, 1),
+        'epsilon_t': rnd(epsilon_t, 3),
+        'd_v': rnd(d_v, 2),
+        'V_c': V_c,
+        'V_n': rnd(V_n, 1),
+        'E_c': E_c,
+        'n': n,
+        'rho': rho,
+        'k': k,
+        'j': j,
+    }
+    if M_s is not None:
+        results.update(calc_stresses_array(b, h, A_s, d, I_g, k, j, M_s, full_precision))
+    return results
+
+def calc_stresses_array(width, height, steel_area, d, I_g, k, j, M_s, full_precision: bool=False) -> dict:
+    """
+    Calculates the BeamStress service stresses for many sections.
+
+    Parameters:
+    - width, height, steel_area, d: Section dimensions (in) and steel area (in²).
+    - I_g, k, j: Results of analyze_sections.
+    - M_s: Service moment (k-ft).
+    - full_precision: Skip the rounding of the scalar classes.
+
+    Returns:
+    - Dictionary of the uncracked tensile stress 'f_ct', steel stress 'f_s'
+      and concrete compressive stress 'f_c' (ksi).
+    """
+    rnd = _rounder(full_precision)
+    M_s = np.asarray(M_s, dtype=float)
+    return {
+        'f_ct': rnd(M_s * 12 * height / 2 / I_g, 2),
+        'f_s': rnd(M_s * 12 / (steel_area * j * d), 3),
+        'f_c': rnd(2 * M_s * 12 / (j * k * width * d ** 2), 3),
+    }
+
+def analyze_table(table, M_s=None, full_precision: bool=False) -> dict:
+    """
+    Runs analyze_sections over a table of sections.
+
+    Parameters:
+    - table: DataFrame, structured array or mapping with a column for each
+      name in SECTION_FIELDS (and optionally 'M_s').
+    - M_s: Service moment (k-ft), overrides an 'M_s' column.
+    - full_precision: Skip the rounding of the scalar classes.
+    """
+    names = table.dtype.names if isinstance(table, np.ndarray) else table.keys()
+    if M_s is None and 'M_s' in names:
+        M_s = table['M_s']
+    missing = [field for field in SECTION_FIELDS if field not in names]
+    if missing:
+        raise ValueError(f"Missing section fields: {', '.join(missing)}.")
+    return analyze_sections(*(np.asarray(table[field]) for field in SECTION_FIELDS), M_s=M_s,
+                            full_precision=full_precision)
+
+def lookup_bar_props(bar_size) -> dict:
+    """
+    Looks up rebar properties for an array of bar sizes.
+
+    Parameters:
+    - bar_size: Bar size designations, e.g. '#5'.
+
+    Returns:
+    - Dictionary of bar_diameter, bar_area, bar_weight and bar_perimeter arrays.
+    """
+    catalog = rebar_props.get_bar_catalog()
+    bar_size = np.asarray(bar_size, dtype=str)
+    sizes, inverse = np.unique(bar_size, return_inverse=True)
+    inverse = inverse.reshape(bar_size.shape)
+    records = []
+    for size in sizes:
+        record = catalog.get(size)
+        if record is None:
+            raise ValueError(f"Bar size '{size}' not found in the properties file.")
+        records.append(record)
+    return {field: np.array([getattr(record, field) for record in records])[inverse]
+            for field in ('bar_diameter', 'bar_area', 'bar_weight', 'bar_perimeter')}
+
+def calc_epsilon_tl_array(f_y, epsilon_c=0.003):
+    """
+    Array form of design_check_funcs.calc_epsilon_tl.
+    """
+    f_y = np.asarray(f_y, dtype=float)
+    return np.where(f_y <= 75, 0.005, (f_y - 75) / (100 - 75) * epsilon_c + 0.005)
+
+def determine_gamma_3_array(f_y):
+    """
+    Array form of design_check_funcs.determine_gamma_3.
+    """
+    f_y = np.asarray(f_y, dtype=float)
+    return np.where(f_y == 75, 0.75, np.where(f_y == 80, 0.76, 0.67))
+
+def calc_design_M_array(M_u, M_cr, gamma_3=0.67, gamma_1=1.6):
+    """
+    Array form of design_check_funcs.calc_design_M.
+    """
+    return np.maximum(np.minimum(gamma_1 * gamma_3 * M_cr, 1.33 * M_u), M_u)
+
+def calc_design_spacing_array(f_r, f_ct, f_s, f_y, h, d_c, gamma_e=0.75):
+    """
+    Array form of design_check_funcs.calc_design_spacing.
+    """
+    beta_s = 1 + d_c / (0.7 * (h - d_c))
+    f_ss = np.minimum(f_s, 0.6 * f_y)
+    return np.where(f_ct > 0.8 * f_r, 700 * gamma_e / (beta_s * f_ss) - 2 * d_c, 18.0)
+
+def calc_dist_reinf_array(width, height, f_y, full_precision=False):
+    """
+    Array form of design_check_funcs.calc_dist_reinf.
+    """
+    A_TS = 1.3 * width * height / (2 * (width + height) * f_y)
+    return _rounder(full_precision)(np.clip(A_TS, 0.11, 0.6), 3)
+
+def prepare_sections(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                     full_precision: bool=False) -> dict:
+    """
+    Calculates the load-independent part of check_sections: reinforcement
+    layout, analyze_sections results and the design check limits.
+
+    Parameters take the same names and units as the input form.
+    full_precision skips the rounding of the scalar classes.
+
+    Returns:
+    - Dictionary of section arrays for check_loads.
+    """
+    width, height, cover, spacing, f_c, f_y, E_s, conc_density = (
+        np.asarray(value, dtype=float) for value in
+        (width, height, cover, spacing, f_c, f_y, E_s, conc_density))
+    bars = lookup_bar_props(bar_size)
+    d_c = cover + bars['bar_diameter']
+    steel_area = width / spacing * bars['bar_area']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        section = analyze_sections(width, height, d_c, f_c, steel_area, f_y, E_s, conc_density,
+                                   full_precision=full_precision)
+        section.update({
+            'full_precision': full_precision,
+            'width': width,
+            'height': height,
+            'd_c': d_c,
+            'spacing': spacing,
+            'steel_area': steel_area,
+            'As_per_ft': bars['bar_area'] / (spacing / 12),
+            'f_y': f_y,
+            'gamma_3': determine_gamma_3_array(f_y),
+            'epsilon_tl': calc_epsilon_tl_array(f_y),
+            'A_ts': calc_dist_reinf_array(width, height, f_y, full_precision),
+        })
+    return section
+
+def check_loads(section: dict, M_u, M_s, V_u, phi_m=0.9, phi_v=0.9) -> dict:
+    """
+    Runs the load-dependent part of check_sections on prepared sections.
+
+    Parameters:
+    - section: Result of prepare_sections, or arrays taken from it, that
+      broadcast against the loads. Results are rounded unless it was
+      prepared with full_precision.
+    - M_u: Factored moment (k-ft).
+    - M_s: Service moment (k-ft).
+    - V_u: Factored shear (kips).
+    - phi_m: Moment resistance factor.
+    - phi_v: Shear resistance factor.
+
+    Returns:
+    - Dictionary of arrays keyed by the names in RESULT_FIELDS, plus the
+      intermediate 'cracked', 'M_design' and 's_max' arrays.
+    """
+    M_u, M_s, V_u, phi_m, phi_v = (np.asarray(value, dtype=float) for value in (M_u, M_s, V_u, phi_m, phi_v))
+    b, h, d, d_c = section['width'], section['height'], section['d'], section['d_c']
+    A_s, f_y, spacing = section['steel_area'], section['f_y'], section['spacing']
+    j, k = section['j'], section['k']
+    rnd = _rounder(section.get('full_precision', False))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        M_cr = section['M_cr']
+        M_n = section['M_n']
+        V_n = section['V_n']
+        epsilon_st = section['epsilon_t']
+        cracked = M_u / M_cr >= 1
+        f_ct = rnd(M_s * 12 * h / 2 / section['I_g'], 2)
+        f_s = rnd(M_s * 12 / (A_s * j * d), 3)
+        f_c_service = np.where(cracked, rnd(2 * M_s * 12 / (j * k * b * d ** 2), 3), f_ct)
+
+        M_design = calc_design_M_array(M_u, M_cr, gamma_3=section['gamma_3'])
+        s_max = calc_design_spacing_array(section['f_r'], f_ct, f_s, f_y, h, d_c)
+        epsilon_tl = section['epsilon_tl']
+        A_ts = section['A_ts']
+        As_per_ft = section['As_per_ft']
+
+        results = {
+            'd_s': d,
+            'w_DL': section['w_DL'],
+            'M_cr': M_cr,
+            'a': section['a'],
+            'moment_capacity': phi_m * M_n,
+            'epsilon_st': epsilon_st,
+            'd_v': section['d_v'],
+            'shear_capacity': phi_v * V_n,
+            'f_s': f_s,
+            'f_c': f_c_service,
+            'A_ts': A_ts,
+            'moment_check': phi_m * M_n / M_u >= 1,
+            'shear_check': phi_v * V_n / V_u >= 1,
+            'min_reinf_check': phi_m * M_n / M_design >= 1,
+            'crack_control_check': spacing <= s_max,
+            'ductility_check': epsilon_st > epsilon_tl,
+            'distr_reinf_check': As_per_ft / A_ts >= 1,
+            'gamma_er': rnd(M_design / (phi_m * M_n), 2),
+            'moment_ratio': M_u / (phi_m * M_n),
+            'shear_ratio': V_u / (phi_v * V_n),
+            'min_reinf_ratio': M_design / (phi_m * M_n),
+            'crack_control_ratio': spacing / s_max,
+            'ductility_ratio': epsilon_tl / epsilon_st,
+            'dist_reinf_ratio': A_ts / As_per_ft,
+            'cracked': cracked,
+            'M_design': M_design,
+            's_max': s_max,
+        }
+    shape = np.broadcast(*(np.asarray(value) for value in results.values())).shape
+    return {name: np.broadcast_to(value, shape) for name, value in results.items()}
+
+def check_sections(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                   M_u, M_s, V_u, phi_m=0.9, phi_v=0.9, full_precision: bool=False) -> dict:
+    """
+    Runs the full design check chain of app.process over arrays of beams.
+
+    Parameters take the same names and units as the input form. With
+    full_precision, float64 values are carried through the chain without
+    the intermediate rounding of the scalar classes; use round_results to
+    format them for output.
+
+    Returns:
+    - Dictionary of arrays keyed by the names in RESULT_FIELDS, plus the
+      intermediate 'cracked', 'M_design' and 's_max' arrays.
+    """
+    section = prepare_sections(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                               full_precision)
+    return check_loads(section, M_u, M_s, V_u, phi_m, phi_v)
+
+def check_table(table, full_precision: bool=False) -> dict:
+    """
+    Runs check_sections over a table of beams.
+
+    Parameters:
+    - table: DataFrame, structured array or mapping with a column for each
+      name in INPUT_FIELDS. phi_m and phi_v default to 0.9 when absent.
+    - full_precision: Skip the rounding of the scalar classes.
+    """
+    names = table.dtype.names if isinstance(table, np.ndarray) else table.keys()
+    missing = [field for field in INPUT_FIELDS if field not in names and field not in ('phi_m', 'phi_v')]
+    if missing:
+        raise ValueError(f"Missing input fields: {', '.join(missing)}.")
+    return check_sections(**{field: np.asarray(table[field]) for field in INPUT_FIELDS if field in names},
+                          full_precision=full_precision)
@@ -0,0 +1,141 @@
+import argparse
+import functools
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import batch_analysis
+import result_store
+import worker_pool
+
+def read_chunks(input_path: str, chunk_size: int=100000):
+    """
+    Yields beam definitions from a CSV or Parquet file as DataFrame chunks.
+
+    Parameters:
+    - input_path: Path to a .csv or .parquet file.
+    - chunk_size: Number of rows per chunk.
+    """
+    if input_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(input_path, chunksize=chunk_size, dtype={'bar_size': str})
+
+class ResultWriter:
+    """
+    Appends result chunks to a CSV or Parquet file, or to a columnar
+    result store when the path ends in result_store.STORE_SUFFIX.
+    """
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.parquet = output_path.endswith('.parquet')
+        self.store = output_path.rstrip('/').endswith(result_store.STORE_SUFFIX)
+        self._writer = None
+        self._header = True
+
+    def write(self, chunk_df):
+        if self.store:
+            if self._writer is None:
+                self._writer = result_store.open_store(self.output_path, result_store.infer_schema(chunk_df))
+            self._writer.append(chunk_df)
+        elif self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk_df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._writer.write_table(table)
+        else:
+            chunk_df.to_csv(self.output_path, mode='w' if self._header else 'a',
+                            header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None and self.parquet:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+PRECISIONS = ('rounded', 'full', 'raw')
+
+def check_chunk(chunk_df, precision: str='rounded'):
+    """
+    Runs the design check chain on a chunk and returns the inputs with the
+    results appended as columns.
+
+    Parameters:
+    - chunk_df: Beam definitions.
+    - precision: 'rounded' rounds intermediate results like the scalar
+      classes, 'full' carries full precision and rounds only the written
+      results, 'raw' writes the full precision results.
+    """
+    results = batch_analysis.check_table(chunk_df, full_precision=precision != 'rounded')
+    if precision == 'full':
+        results = batch_analysis.round_results(results)
+    results_df = pd.DataFrame({field: results[field] for field in batch_analysis.RESULT_FIELDS},
+                              index=chunk_df.index)
+    return pd.concat([chunk_df, results_df.add_prefix('result_')], axis=1)
+
+def run_batch(input_path: str, output_path: str, chunk_size: int=100000, workers: int=1,
+              precision: str='rounded') -> int:
+    """
+    Streams beams from input_path through the design checks into output_path.
+
+    Parameters:
+    - input_path: CSV or Parquet file with a column per form input.
+    - output_path: CSV or Parquet file, or result store directory, for the
+      results.
+    - chunk_size: Number of rows per chunk.
+    - workers: Number of processes checking chunks. Results are written in
+      input order; about two chunks per worker are held in memory.
+    - precision: One of PRECISIONS, see check_chunk.
+
+    Returns:
+    - Number of beams checked.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}'.")
+    check = functools.partial(check_chunk, precision=precision)
+    num_rows = 0
+    if os.path.isfile(os.path.join(output_path, result_store.SCHEMA_FILE)):
+        shutil.rmtree(output_path)
+    elif os.path.isfile(output_path):
+        os.remove(output_path)
+    with ResultWriter(output_path) as writer:
+        if workers > 1:
+            with ProcessPoolExecutor(workers, initializer=worker_pool.init_worker) as executor:
+                for result_df in worker_pool.map_ordered(executor, check,
+                                                         read_chunks(input_path, chunk_size), 2 * workers):
+                    writer.write(result_df)
+                    num_rows += len(result_df)
+        else:
+            for chunk_df in read_chunks(input_path, chunk_size):
+                writer.write(check(chunk_df))
+                num_rows += len(chunk_df)
+    return num_rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the beam design checks over a file of beams.")
+    parser.add_argument('input', help="CSV or Parquet file of beam definitions.")
+    parser.add_argument('output', help="CSV or Parquet file, or a directory ending in "
+                                       f"'{result_store.STORE_SUFFIX}' for a columnar result store.")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Rows per chunk.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes; 0 uses every CPU core.")
+    parser.add_argument('--precision', choices=PRECISIONS, default='rounded',
+                        help="'rounded' matches the web form, 'full' rounds only the written "
+                             "results, 'raw' writes full precision.")
+    args = parser.parse_args()
+
+    num_rows = run_batch(args.input, args.output, args.chunk_size, args.workers or os.cpu_count() or 1,
+                         args.precision)
+    print(f"Checked {num_rows} beams -> {args.output}")
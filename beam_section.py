@@ -0,0 +1,204 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from conc_analysis_classes import BeamCapacity, BeamStress
+import batch_analysis
+
+class BeamSection(NamedTuple):
+    """
+    Immutable record of one reinforced concrete section.
+
+    - width: Beam width (in).
+    - height: Beam height (in).
+    - d_c: Concrete face in tension to center of reinforcing (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - steel_area: Area of steel reinforcement (in²).
+    - f_y: Yield strength of steel (ksi).
+    - E_s: Elastic modulus of steel (ksi).
+    - conc_density: Concrete density (pcf).
+    """
+    width: float
+    height: float
+    d_c: float
+    f_c: float
+    steel_area: float
+    f_y: float
+    E_s: float = 29000
+    conc_density: float = 150
+
+    def capacity_analyzer(self) -> BeamCapacity:
+        return BeamCapacity(self.width, self.height, self.d_c, self.f_c, self.steel_area, self.f_y)
+
+    def stress_analyzer(self) -> BeamStress:
+        return BeamStress(self.width, self.height, self.d_c, self.f_c, self.steel_area,
+                          self.E_s, self.conc_density)
+
+    def results(self) -> dict:
+        """
+        Returns the section quantities of BeamCapacity and BeamStress.
+        """
+        capacity = self.capacity_analyzer()
+        stress = self.stress_analyzer()
+        return {
+            'd': capacity.d,
+            'w_DL': capacity.calc_self_load(self.conc_density),
+            'M_cr': capacity.calc_Mcr(),
+            'a': capacity.calc_comp_block_depth(),
+            'M_n': capacity.calc_moment_capacity(),
+            'epsilon_t': capacity.calc_epsilon_t(),
+            'd_v': capacity.calc_dv(),
+            'V_c': capacity.calc_Vc(),
+            'V_n': capacity.calc_shear_capacity(),
+            'k': stress.calc_k(),
+            'j': stress.calc_j(),
+        }
+
+def _derived(name: str, doc: str):
+    """
+    Read-only property for a batch_analysis.analyze_sections quantity,
+    computed with the others on first access and cached on the instance.
+    """
+    def getter(self):
+        if name not in self._cache:
+            self._analyze()
+        return self._cache[name]
+    return property(getter, doc=doc)
+
+class BeamSectionArray:
+    """
+    Columnar container of many sections backed by NumPy arrays.
+
+    Input columns are read-only copies; scalar inputs are stored once and broadcast.
+    Derived quantities come from batch_analysis.analyze_sections, computed
+    together on first access and cached. Values are rounded like the scalar
+    classes unless full_precision is set.
+    """
+    __slots__ = ('width', 'height', 'd_c', 'f_c', 'steel_area', 'f_y', 'E_s', 'conc_density',
+                 'full_precision', '_size', '_cache')
+
+    def __init__(self, width, height, d_c, f_c, steel_area, f_y, E_s=29000, conc_density=150,
+                 dtype=np.float64, full_precision: bool=False):
+        """
+        Parameters:
+        - width, height, d_c, f_c, steel_area, f_y, E_s, conc_density: Arrays
+          or scalars with the units of BeamSection. All-scalar inputs give a
+          container of one section.
+        - dtype: Floating point type of the stored columns and results.
+        - full_precision: Skip the rounding of the scalar classes.
+        """
+        columns = [np.asarray(value, dtype=dtype) for value in
+                   (width, height, d_c, f_c, steel_area, f_y, E_s, conc_density)]
+        shape = np.broadcast_shapes((1,), *(column.shape for column in columns))
+        if len(shape) > 1:
+            raise ValueError("Section columns must be one-dimensional.")
+        for field, column in zip(batch_analysis.SECTION_FIELDS, columns):
+            if column.size == 1:
+                # stored once as a private copy, viewed at the full length
+                column = np.broadcast_to(column.reshape(1).copy(), shape)
+            else:
+                # copied so later changes to the caller's array cannot
+                # leave the cached quantities stale
+                column = np.array(column, dtype=dtype, copy=True)
+                column.flags.writeable = False
+            object.__setattr__(self, field, column)
+        object.__setattr__(self, 'full_precision', full_precision)
+        object.__setattr__(self, '_size', shape[0])
+        object.__setattr__(self, '_cache', {})
+
+    @classmethod
+    def from_table(cls, table, dtype=np.float64, full_precision: bool=False):
+        """
+        Builds the container from a DataFrame, structured array or mapping
+        with a column for each name in batch_analysis.SECTION_FIELDS.
+        """
+        return cls(*(np.asarray(table[field]) for field in batch_analysis.SECTION_FIELDS), dtype=dtype,
+                   full_precision=full_precision)
+
+    @classmethod
+    def from_records(cls, records, dtype=np.float64, full_precision: bool=False):
+        """
+        Builds the container from a sequence of BeamSection records.
+        """
+        return cls(*zip(*records), dtype=dtype, full_precision=full_precision)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' is immutable.")
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index) -> BeamSection:
+        return BeamSection(*(float(getattr(self, field)[index]) for field in batch_analysis.SECTION_FIELDS))
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the stored columns and cached quantities (bytes).
+        """
+        arrays = [getattr(self, field) for field in batch_analysis.SECTION_FIELDS]
+        arrays += list(self._cache.values())
+        # broadcast scalar columns are views of a one-value buffer, counted once
+        buffers = {}
+        for array in arrays:
+            while array.base is not None:
+                array = array.base
+            buffers[id(array)] = array
+        return sum(buffer.nbytes for buffer in buffers.values())
+
+    def clear_cache(self):
+        """
+        Releases all cached derived quantities.
+        """
+        self._cache.clear()
+
+    def _analyze(self):
+        results = batch_analysis.analyze_sections(
+            *(getattr(self, field) for field in batch_analysis.SECTION_FIELDS), full_precision=self.full_precision)
+        for name, value in results.items():
+            value = np.broadcast_to(value, (self._size,)).astype(self.width.dtype)
+            value.flags.writeable = False
+            self._cache[name] = value
+
+    d = _derived('d', "Effective depth (in).")
+    f_r = _derived('f_r', "Modulus of rupture (ksi).")
+    I_g = _derived('I_g', "Moment of inertia (in⁴).")
+    w_DL = _derived('w_DL', "Dead load, w_DL (k/ft).")
+    M_cr = _derived('M_cr', "Cracking moment (k-ft).")
+    E_c = _derived('E_c', "Elastic modulus of concrete (ksi).")
+    a = _derived('a', "Stress block depth (in).")
+    M_n = _derived('M_n', "Moment capacity, M_n (k-ft).")
+    epsilon_t = _derived('epsilon_t', "Design tensile strain in steel.")
+    d_v = _derived('d_v', "Effective shear depth, d_v (in).")
+    V_c = _derived('V_c', "Concrete shear capacity, V_c (kips).")
+    V_n = _derived('V_n', "Shear capacity, V_n (kips).")
+    n = _derived('n', "Modular ratio.")
+    rho = _derived('rho', "Reinforcement ratio.")
+    k = _derived('k', "Compressive depth factor.")
+    j = _derived('j', "Moment arm factor.")
+
+    def _stresses(self, M) -> dict:
+        return batch_analysis.calc_stresses_array(self.width, self.height, self.steel_area, self.d, self.I_g,
+                                                  self.k, self.j, M, self.full_precision)
+
+    def uncracked_stress(self, M):
+        """
+        Tensile stress in the uncracked section (ksi) under service moment M (k-ft).
+        """
+        return self._stresses(M)['f_ct']
+
+    def steel_stress(self, M):
+        """
+        Stress in reinforcing steel, f_s (ksi), under service moment M (k-ft).
+        """
+        return self._stresses(M)['f_s']
+
+    def conc_stress(self, M):
+        """
+        Maximum compressive stress in concrete (ksi) under service moment M (k-ft).
+        """
+        return self._stresses(M)['f_c']
@@ -0,0 +1,306 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import rebar_props
+from conc_analysis_classes import BeamCapacity, BeamStress
+import batch_analysis
+import load_envelope
+import worker_pool
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DEFAULT_SIZES = (1, 1000, 1000000)
+
+# modules: (import budget (s), modules that must not be imported)
+IMPORT_BUDGETS = {
+    'rebar_props, conc_analysis_classes, design_check_funcs': (0.05, ('pandas', 'numpy')),
+    'batch_analysis': (0.2, ('pandas',)),
+    'app': (0.5, ('pandas',)),
+}
+
+CAPACITY_METHODS = ('calc_comp_block_depth', 'calc_moment_capacity', 'calc_epsilon_t',
+                    'calc_dv', 'calc_Vc', 'calc_shear_capacity')
+STRESS_METHODS = ('calc_uncracked_stress', 'calc_rho', 'calc_k', 'calc_j',
+                  'calc_steel_stress', 'calc_conc_stress')
+
+def make_sections(n: int, seed: int=0) -> dict:
+    """
+    Generates n reproducible beam cases with the form field names.
+    """
+    rng = np.random.default_rng(seed)
+    bar_sizes = np.array(['#4', '#5', '#6', '#7', '#8'])
+    return {
+        'width': np.full(n, 12.0),
+        'height': rng.uniform(8, 30, n).round(1),
+        'cover': rng.choice([1.0, 1.5, 2.0], n),
+        'bar_size': rng.choice(bar_sizes, n),
+        'spacing': rng.choice([6.0, 8.0, 9.0, 12.0], n),
+        'f_c': rng.choice([4.0, 5.0, 6.0], n),
+        'f_y': rng.choice([60.0, 75.0, 80.0], n),
+        'E_s': np.full(n, 29000.0),
+        'conc_density': np.full(n, 150.0),
+        'M_u': rng.uniform(5, 40, n).round(2),
+        'M_s': rng.uniform(3, 25, n).round(2),
+        'V_u': rng.uniform(2, 10, n).round(2),
+        'phi_m': np.full(n, 0.9),
+        'phi_v': np.full(n, 0.9),
+    }
+
+def _section_rows(sections: dict) -> list:
+    n = len(sections['width'])
+    rows = []
+    for i in range(n):
+        row = {field: sections[field][i].item() for field in batch_analysis.INPUT_FIELDS}
+        bar = rebar_props.RebarProperties(row['bar_size'])
+        row['d_c'] = rebar_props.calc_position(row['cover'], bar.bar_diameter)
+        row['steel_area'] = row['width'] / row['spacing'] * bar.bar_area
+        rows.append(row)
+    return rows
+
+def bench_rebar_properties(sections, get_rows):
+    bar_sizes = sections['bar_size'].tolist()
+    def run():
+        for bar_size in bar_sizes:
+            rebar_props.RebarProperties(bar_size)
+    return run
+
+def _bench_capacity_method(method_name):
+    def setup(sections, get_rows):
+        analyzers = []
+        for row in get_rows():
+            analyzer = BeamCapacity(row['width'], row['height'], row['d_c'], row['f_c'],
+                                    row['steel_area'], row['f_y'])
+            analyzer.calc_comp_block_depth()
+            analyzer.calc_dv()
+            analyzers.append(analyzer)
+        def run():
+            for analyzer in analyzers:
+                getattr(analyzer, method_name)()
+        return run
+    return setup
+
+def _bench_stress_method(method_name):
+    def setup(sections, get_rows):
+        calls = []
+        for row in get_rows():
+            analyzer = BeamStress(row['width'], row['height'], row['d_c'], row['f_c'],
+                                  row['steel_area'], row['E_s'], row['conc_density'])
+            args = (row['M_s'],) if method_name in ('calc_uncracked_stress', 'calc_steel_stress',
+                                                     'calc_conc_stress') else ()
+            calls.append((getattr(analyzer, method_name), args))
+        def run():
+            for method, args in calls:
+                method(*args)
+        return run
+    return setup
+
+def bench_app_process(sections, get_rows):
+    import app
+    client = app.app.test_client()
+    forms = [{field: str(value) for field, value in row.items() if field in batch_analysis.INPUT_FIELDS}
+             for row in get_rows()]
+    def run():
+        # every repeat runs the full process chain, not cache lookups
+        app.response_cache.response_cache.clear()
+        app.section_cache.section_cache.clear()
+        for form in forms:
+            client.post('/process', data=form)
+    return run
+
+def bench_app_process_cached(sections, get_rows):
+    import app
+    client = app.app.test_client()
+    forms = [{field: str(value) for field, value in row.items() if field in batch_analysis.INPUT_FIELDS}
+             for row in get_rows()]
+    app.response_cache.response_cache.clear()
+    for form in forms:
+        client.post('/process', data=form)
+    def run():
+        for form in forms:
+            client.post('/process', data=form)
+    return run
+
+def bench_api_check(sections, get_rows):
+    import app
+    client = app.app.test_client()
+    cases = [{field: row[field] for field in batch_analysis.INPUT_FIELDS} for row in get_rows()]
+    batch_size = app.app.config['MAX_BATCH_SIZE']
+    batches = [cases[i:i + batch_size] for i in range(0, len(cases), batch_size)]
+    def run():
+        for batch in batches:
+            client.post('/api/v1/check', json=batch)
+    return run
+
+def bench_analyze_sections(sections, get_rows):
+    bars = batch_analysis.lookup_bar_props(sections['bar_size'])
+    d_c = sections['cover'] + bars['bar_diameter']
+    steel_area = sections['width'] / sections['spacing'] * bars['bar_area']
+    def run():
+        batch_analysis.analyze_sections(sections['width'], sections['height'], d_c, sections['f_c'],
+                                        steel_area, sections['f_y'], sections['E_s'],
+                                        sections['conc_density'], M_s=sections['M_s'])
+    return run
+
+def bench_check_sections(sections, get_rows):
+    def run():
+        batch_analysis.check_sections(**sections)
+    return run
+
+def bench_check_parallel(sections, get_rows):
+    def run():
+        worker_pool.check_parallel(sections, len(sections['width']))
+    return run
+
+def bench_load_envelope(sections, get_rows):
+    def run():
+        load_envelope.analyze_load_cases(12, 12, 1.5, '#5', 8, 4, 60, 29000, 150,
+                                         sections['M_u'], sections['M_s'], sections['V_u'])
+    return run
+
+# name: (setup, largest size run by default)
+BENCHMARKS = {'rebar_properties': (bench_rebar_properties, None)}
+for _method in CAPACITY_METHODS:
+    BENCHMARKS['capacity.' + _method] = (_bench_capacity_method(_method), None)
+for _method in STRESS_METHODS:
+    BENCHMARKS['stress.' + _method] = (_bench_stress_method(_method), None)
+BENCHMARKS.update({
+    'app.process': (bench_app_process, 1000),
+    'app.process_cached': (bench_app_process_cached, 1000),
+    'api.check': (bench_api_check, 100000),
+    'batch.analyze_sections': (bench_analyze_sections, None),
+    'batch.check_sections': (bench_check_sections, None),
+    'batch.check_parallel': (bench_check_parallel, None),
+    'batch.load_envelope': (bench_load_envelope, None),
+})
+
+def time_benchmark(setup, sections, get_rows, repeat: int=3) -> float:
+    """
+    Returns the best wall time per section (s) over repeated runs.
+    """
+    run = setup(sections, get_rows)
+    n = len(sections['width'])
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times) / n
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, repeat: int=3, full: bool=False) -> dict:
+    """
+    Runs the selected benchmarks at each input size.
+
+    Parameters:
+    - sizes: Numbers of sections per run.
+    - names: Benchmark names to run, all when None.
+    - repeat: Runs per measurement; the fastest is kept.
+    - full: Ignore the per-benchmark size limits.
+
+    Returns:
+    - Dictionary of seconds per section keyed by benchmark name and size.
+    """
+    results = {}
+    for size in sizes:
+        sections = make_sections(size)
+        rows = []
+        def get_rows():
+            # per-row inputs for the scalar paths, built on first use
+            if not rows:
+                rows.extend(_section_rows(sections))
+            return rows
+        for name, (setup, max_size) in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            if not full and max_size is not None and size > max_size:
+                continue
+            results.setdefault(name, {})[str(size)] = time_benchmark(setup, sections, get_rows, repeat)
+            print(f"{name:32s} n={size:<8d} {results[name][str(size)] * 1e6:12.3f} us/section")
+    return results
+
+def measure_import_time(modules: str, repeat: int=5):
+    """
+    Measures the cold import time of modules in fresh interpreters.
+
+    Returns:
+    - Best import time (s) and the names of all modules that were loaded.
+    """
+    script = ("import sys, time, json; start = time.perf_counter(); import " + modules
+              + "; print(json.dumps([time.perf_counter() - start, sorted(sys.modules)]))")
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', script], cwd=package_dir,
+                                capture_output=True, text=True, check=True).stdout
+        seconds, loaded = json.loads(output)
+        best = seconds if best is None else min(best, seconds)
+    return best, loaded
+
+def check_import_budgets(budgets: dict=IMPORT_BUDGETS) -> list:
+    """
+    Lists import time budgets that are exceeded and forbidden imports.
+    """
+    failures = []
+    for modules, (budget, forbidden) in budgets.items():
+        seconds, loaded = measure_import_time(modules)
+        print(f"import {modules:54s} {seconds * 1e3:8.1f} ms (budget {budget * 1e3:.0f} ms)")
+        if seconds > budget:
+            failures.append(f"import {modules} took {seconds * 1e3:.1f} ms")
+        for name in forbidden:
+            if name in loaded:
+                failures.append(f"import {modules} loaded {name}")
+    return failures
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float=0.25) -> list:
+    """
+    Lists measurements slower than the baseline by more than threshold.
+    """
+    regressions = []
+    for name, timings in results.items():
+        for size, seconds in timings.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference and seconds > reference * (1 + threshold):
+                regressions.append((name, size, reference, seconds))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the analysis and check hot paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Numbers of sections per run.")
+    parser.add_argument('--only', nargs='+', help="Benchmark names to run.")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement.")
+    parser.add_argument('--full', action='store_true', help="Run slow paths at every size.")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline results file.")
+    parser.add_argument('--save', action='store_true', help="Store these results as the baseline.")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline before failing.")
+    parser.add_argument('--imports', action='store_true',
+                        help="Only check the cold import time budgets.")
+    args = parser.parse_args()
+
+    if args.imports:
+        failures = check_import_budgets()
+        for failure in failures:
+            print("OVER BUDGET", failure)
+        sys.exit(1 if failures else 0)
+
+    results = run_benchmarks(args.sizes, args.only, args.repeat, args.full)
+    if args.save:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump({'python': sys.version, 'platform': platform.platform(), 'results': results},
+                      baseline_file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        for name, size, reference, seconds in regressions:
+            print(f"REGRESSION {name} n={size}: {reference * 1e6:.3f} -> {seconds * 1e6:.3f} us/section")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
@@ -39,7 +39,9 @@ def calc_n(E_s, E_c):
 
 
 class ConcreteBeam:
-    def __init__(self, width: float, height: float, d_c: float, f_c: float):
+    __slots__ = ('b', 'h', 'd_c', 'f_c', 'd', 'full_precision')
+
+    def __init__(self, width: float, height: float, d_c: float, f_c: float, full_precision: bool=False):
         """
         Base class for concrete beam properties.
         
@@ -48,6 +50,7 @@ class ConcreteBeam:
         - height: Beam height (in).
         - d_c: Concrete face in tension to center of reinforcing (in).
         - f_c: Compressive strength of concrete (ksi).
+        - full_precision: Return unrounded results.
 
         - d: Effective depth (in).
         """
@@ -56,6 +59,10 @@ class ConcreteBeam:
         self.d_c = d_c
         self.f_c = f_c
         self.d = height - d_c
+        self.full_precision = full_precision
+
+    def _round(self, value: float, digits: int) -> float:
+        return value if self.full_precision else round(value, digits)
 
     def calc_Ec(self, conc_density: float) -> float:
         """
@@ -80,7 +87,7 @@ class ConcreteBeam:
         - Dead load, w_DL (k/ft).
         """
         w_DL = conc_density / 1000 * self.b / 12 * self.h / 12
-        return round(w_DL, 2)
+        return self._round(w_DL, 2)
 
     def calc_Ig(self) -> float:
         """
@@ -104,10 +111,12 @@ class ConcreteBeam:
         f_r = calc_fr(self.f_c)
         S_c = self.calc_Sc()
         M_cr = f_r * S_c / 12
-        return round(M_cr, 1)
+        return self._round(M_cr, 1)
 
 class BeamCapacity(ConcreteBeam):
-    def __init__(self, width, height, d_c, f_c, steel_area: float, f_y: float):
+    __slots__ = ('A_s', 'f_y', 'a', 'd_v')
+
+    def __init__(self, width, height, d_c, f_c, steel_area: float, f_y: float, full_precision=False):
         """
         Subclass to calculate beam capacity.
 
@@ -115,10 +124,17 @@ class BeamCapacity(ConcreteBeam):
         - steel_area, A_s: Area of steel reinforcement (in²).
         - f_y: Yield strength of steel (ksi).
         """
-        super().__init__(width, height, d_c, f_c)
+        super().__init__(width, height, d_c, f_c, full_precision)
         self.A_s = steel_area
         self.f_y = f_y
 
+    def _calc_a(self) -> float:
+        return (self.A_s * self.f_y) / (0.85 * self.f_c * self.b)
+
+    def _calc_dv(self) -> float:
+        c = self._calc_a() / calc_beta1(self.f_c)
+        return max(self.d - c / 2, 0.9 * self.d, 0.72 * self.h)
+
     def calc_comp_block_depth(self) -> float:
         """
         Calculates the depth of the compressive stress block (a).
@@ -126,16 +142,16 @@ class BeamCapacity(ConcreteBeam):
         Returns:
         - Stress block depth (in).
         """
-        self.a = (self.A_s * self.f_y) / (0.85 * self.f_c * self.b)
-        return round(self.a, 3)
+        self.a = self._calc_a()
+        return self._round(self.a, 3)
 
     def calc_moment_capacity(self) -> float:
         """
         Returns:
         - Moment capacity, M_n (k-ft).
         """
-        M_n = self.A_s * self.f_y * (self.d - self.a / 2) / 12
-        return round(M_n, 1)
+        M_n = self.A_s * self.f_y * (self.d - self._calc_a() / 2) / 12
+        return self._round(M_n, 1)
     
     def calc_epsilon_t(self, epsilon_c=0.003):
         """
@@ -145,19 +161,17 @@ class BeamCapacity(ConcreteBeam):
         - epsilon_c: Design concrete compressive strain.
         """
         beta_1 = calc_beta1(self.f_c)
-        c = self.a / beta_1
+        c = self._calc_a() / beta_1
         epsilon_t = epsilon_c * (self.d - c) / c
-        return round(epsilon_t, 3)
+        return self._round(epsilon_t, 3)
 
     def calc_dv(self):
         """
         Returns:
         Effective shear depth, d_v (in).
         """
-        beta_1 = calc_beta1(self.f_c)
-        c = self.a / beta_1
-        self.d_v = max(self.d - c / 2, 0.9 * self.d, 0.72 * self.h)
-        return round(self.d_v, 2)
+        self.d_v = self._calc_dv()
+        return self._round(self.d_v, 2)
 
     def calc_Vc(self, gamma=1, beta=2) -> float:
         """
@@ -168,7 +182,7 @@ class BeamCapacity(ConcreteBeam):
         Returns:
         - Concrete shear capacity, V_c (kips).
         """
-        V_c = 0.0316 * beta * gamma * self.f_c ** 0.5 * self.b * self.d_v
+        V_c = 0.0316 * beta * gamma * self.f_c ** 0.5 * self.b * self._calc_dv()
         return V_c
 
     def calc_shear_capacity(self, V_s=0):
@@ -177,12 +191,15 @@ class BeamCapacity(ConcreteBeam):
         - Shear capacity, V_n (kips).
         """
         V_c = self.calc_Vc()
-        max_V_n = 0.25 * self.f_c * self.b * self.d_v
+        max_V_n = 0.25 * self.f_c * self.b * self._calc_dv()
         V_n = min(V_c + V_s, max_V_n)
-        return round(V_n, 1)
+        return self._round(V_n, 1)
 
 class BeamStress(ConcreteBeam):
-    def __init__(self, width, height, d_c, f_c, steel_area: float, E_s: float, conc_density: float):
+    __slots__ = ('A_s', 'E_s', 'conc_density')
+
+    def __init__(self, width, height, d_c, f_c, steel_area: float, E_s: float, conc_density: float,
+                 full_precision=False):
         """
         Subclass to calculate beam stresses.
 
@@ -191,7 +208,7 @@ class BeamStress(ConcreteBeam):
         - E_s: Elastic modulus of steel (ksi).
         - conc_density: Cubic weight of concrete (pcf).
         """
-        super().__init__(width, height, d_c, f_c)
+        super().__init__(width, height, d_c, f_c, full_precision)
         self.A_s = steel_area
         self.E_s = E_s
         self.conc_density = conc_density
@@ -202,7 +219,7 @@ class BeamStress(ConcreteBeam):
         """
         I_g = self.calc_Ig()
         f_ct = M * 12 * self.h / 2 / I_g
-        return round(f_ct, 2)
+        return self._round(f_ct, 2)
 
     def calc_rho(self) -> float:
         """
@@ -241,7 +258,7 @@ class BeamStress(ConcreteBeam):
         """
         j = self.calc_j()
         f_s = M * 12 / (self.A_s * j * self.d)
-        return round(f_s, 3)
+        return self._round(f_s, 3)
 
     def calc_conc_stress(self, M) -> float:
         """
@@ -258,4 +275,4 @@ class BeamStress(ConcreteBeam):
         j = self.calc_j()
         k = self.calc_k()
         f_c = 2 * M * 12 / (j * k * self.b * self.d**2)
-        return round(f_c, 3)
\ No newline at end of file
+        return self._round(f_c, 3)
\ No newline at end of file
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+import batch_analysis
+from conc_analysis_classes import BeamCapacity, BeamStress, calc_fr
+import design_check_funcs
+
+AXES = ('height', 'f_c', 'steel_area', 'f_y')
+TABLES = ('M_n', 'j')
+
+def generate_charts(path: str, heights, f_cs, steel_areas, f_ys, width: float=12, d_c: float=2,
+                    E_s: float=29000, conc_density: float=150) -> 'DesignChart':
+    """
+    Precomputes M_n and j over a height × f_c × A_s × f_y grid and saves
+    them as .npy files for memory-mapped lookups.
+
+    Parameters:
+    - path: Directory for the chart files.
+    - heights: Beam heights (in), increasing.
+    - f_cs: Concrete strengths (ksi), increasing.
+    - steel_areas: Steel areas (in²), increasing.
+    - f_ys: Steel yield strengths (ksi), increasing.
+    - width: Beam width (in), e.g. 12 for a per-foot strip.
+    - d_c: Concrete face in tension to center of reinforcing (in).
+    - E_s: Elastic modulus of steel (ksi).
+    - conc_density: Concrete density (pcf).
+
+    Returns:
+    - The saved chart, memory-mapped.
+    """
+    axes = [np.asarray(values, dtype=float) for values in (heights, f_cs, steel_areas, f_ys)]
+    for name, values in zip(AXES, axes):
+        if len(values) < 2 or np.any(np.diff(values) <= 0):
+            raise ValueError(f"Axis '{name}' needs at least two increasing values.")
+    height, f_c, steel_area, f_y = np.meshgrid(*axes, indexing='ij')
+    section = batch_analysis.analyze_sections(width, height, d_c, f_c, steel_area, f_y, E_s, conc_density)
+
+    os.makedirs(path, exist_ok=True)
+    for name in TABLES:
+        np.save(os.path.join(path, name + '.npy'), section[name])
+    with open(os.path.join(path, 'axes.json'), 'w') as axes_file:
+        json.dump({
+            'axes': {name: values.tolist() for name, values in zip(AXES, axes)},
+            'params': {'width': width, 'd_c': d_c, 'E_s': E_s, 'conc_density': conc_density}
+        }, axes_file, indent=2)
+    chart = DesignChart(path)
+    chart.save_error_bounds(chart.check_error_bounds())
+    return chart
+
+class DesignChart:
+    def __init__(self, path: str):
+        """
+        Interpolated lookups in a chart written by generate_charts. The
+        tables are memory-mapped read-only so processes share one copy.
+
+        Parameters:
+        - path: Directory with the chart files.
+        """
+        self.path = path
+        with open(os.path.join(path, 'axes.json')) as axes_file:
+            meta = json.load(axes_file)
+        self.axes = [np.asarray(meta['axes'][name]) for name in AXES]
+        self.params = meta['params']
+        self.error_bounds = meta.get('error_bounds')
+        self.tables = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+                       for name in TABLES}
+
+    def interpolate(self, name: str, height, f_c, steel_area, f_y):
+        """
+        Multilinear interpolation of a table. Points outside the grid are
+        clamped to its edges.
+        """
+        points = np.broadcast_arrays(*(np.asarray(value, dtype=float)
+                                       for value in (height, f_c, steel_area, f_y)))
+        lower = []
+        weight = []
+        for axis, values in zip(self.axes, points):
+            values = np.clip(values, axis[0], axis[-1])
+            index = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+            lower.append(index)
+            weight.append((values - axis[index]) / (axis[index + 1] - axis[index]))
+        table = self.tables[name]
+        result = np.zeros(points[0].shape)
+        for corner in range(16):
+            offsets = [(corner >> dim) & 1 for dim in range(4)]
+            corner_weight = np.ones(points[0].shape)
+            for dim, offset in enumerate(offsets):
+                corner_weight = corner_weight * (weight[dim] if offset else 1 - weight[dim])
+            index = tuple(lower[dim] + offsets[dim] for dim in range(4))
+            result += corner_weight * table[index]
+        return result
+
+    def moment_capacity(self, height, f_c, steel_area, f_y):
+        """
+        Returns:
+        - Moment capacity, M_n (k-ft).
+        """
+        return self.interpolate('M_n', height, f_c, steel_area, f_y)
+
+    def moment_arm_factor(self, height, f_c, steel_area, f_y):
+        """
+        Returns:
+        - Moment arm factor, j.
+        """
+        return self.interpolate('j', height, f_c, steel_area, f_y)
+
+    def steel_stress(self, height, f_c, steel_area, f_y, M_s):
+        """
+        Returns:
+        - Stress in reinforcing steel, f_s (ksi), from the interpolated j.
+        """
+        j = self.moment_arm_factor(height, f_c, steel_area, f_y)
+        d = np.asarray(height) - self.params['d_c']
+        return np.asarray(M_s) * 12 / (np.asarray(steel_area) * j * d)
+
+    def design_spacing(self, height, f_c, steel_area, f_y, M_s):
+        """
+        Returns:
+        - Maximum spacing, s_max (in), from the interpolated steel stress.
+        """
+        height = np.asarray(height, dtype=float)
+        f_c = np.asarray(f_c, dtype=float)
+        d_c = self.params['d_c']
+        f_s = self.steel_stress(height, f_c, steel_area, f_y, M_s)
+        I_g = self.params['width'] * height ** 3 / 12
+        f_ct = batch_analysis.round_array(np.asarray(M_s) * 12 * height / 2 / I_g, 2)
+        return batch_analysis.calc_design_spacing_array(0.24 * f_c ** 0.5, f_ct, f_s, f_y, height, d_c)
+
+    def check_error_bounds(self, num_samples: int=2000, M_s_ratio: float=0.6, seed: int=0) -> dict:
+        """
+        Compares lookups at random points inside the grid with the exact
+        BeamCapacity, BeamStress and design_check_funcs results.
+
+        Parameters:
+        - num_samples: Number of random points.
+        - M_s_ratio: Service moment as a fraction of M_n at each point.
+        - seed: Random seed.
+
+        Returns:
+        - Maximum absolute and relative error of each lookup.
+        """
+        rng = np.random.default_rng(seed)
+        height, f_c, steel_area, f_y = (rng.uniform(axis[0], axis[-1], num_samples) for axis in self.axes)
+        width, d_c = self.params['width'], self.params['d_c']
+        E_s, conc_density = self.params['E_s'], self.params['conc_density']
+        exact = {'M_n': [], 'f_s': [], 's_max': []}
+        M_s = np.empty(num_samples)
+        for i in range(num_samples):
+            capacity = BeamCapacity(width, height[i], d_c, f_c[i], steel_area[i], f_y[i])
+            capacity.calc_comp_block_depth()
+            M_n = capacity.calc_moment_capacity()
+            stress = BeamStress(width, height[i], d_c, f_c[i], steel_area[i], E_s, conc_density)
+            M_s[i] = M_s_ratio * M_n
+            f_s = stress.calc_steel_stress(M_s[i])
+            f_ct = stress.calc_uncracked_stress(M_s[i])
+            exact['M_n'].append(M_n)
+            exact['f_s'].append(f_s)
+            exact['s_max'].append(design_check_funcs.calc_design_spacing(
+                calc_fr(f_c[i]), f_ct, f_s, f_y[i], height[i], d_c))
+        approx = {
+            'M_n': self.moment_capacity(height, f_c, steel_area, f_y),
+            'f_s': self.steel_stress(height, f_c, steel_area, f_y, M_s),
+            's_max': self.design_spacing(height, f_c, steel_area, f_y, M_s),
+        }
+        bounds = {}
+        for name, values in exact.items():
+            values = np.asarray(values)
+            error = np.abs(approx[name] - values)
+            rel_error = error / np.maximum(np.abs(values), 1e-12)
+            bounds[name] = {
+                'max_abs_error': float(error.max()),
+                'max_rel_error': float(rel_error.max()),
+                'p99_rel_error': float(np.percentile(rel_error, 99))
+            }
+        return bounds
+
+    def save_error_bounds(self, bounds: dict):
+        """
+        Stores error bounds in the chart metadata.
+        """
+        meta_path = os.path.join(self.path, 'axes.json')
+        with open(meta_path) as axes_file:
+            meta = json.load(axes_file)
+        meta['error_bounds'] = bounds
+        with open(meta_path, 'w') as axes_file:
+            json.dump(meta, axes_file, indent=2)
+        self.error_bounds = bounds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute design chart tables.")
+    parser.add_argument('path', help="Output directory.")
+    parser.add_argument('--width', type=float, default=12)
+    parser.add_argument('--d-c', type=float, default=2)
+    parser.add_argument('--heights', type=float, nargs=3, default=[6, 48, 169],
+                        metavar=('MIN', 'MAX', 'NUM'), help="Height range (in).")
+    parser.add_argument('--f-c', type=float, nargs='+', default=[3, 3.5, 4, 4.5, 5, 5.5, 6, 7, 8, 9, 10],
+                        help="Concrete strengths (ksi).")
+    parser.add_argument('--steel-areas', type=float, nargs=3, default=[0.1, 3.0, 117],
+                        metavar=('MIN', 'MAX', 'NUM'), help="Steel area range (in²).")
+    parser.add_argument('--f-y', type=float, nargs='+', default=[40, 50, 60, 70, 75, 80, 90, 100],
+                        help="Steel yield strengths (ksi).")
+    args = parser.parse_args()
+
+    chart = generate_charts(args.path,
+                            np.linspace(args.heights[0], args.heights[1], int(args.heights[2])),
+                            args.f_c,
+                            np.linspace(args.steel_areas[0], args.steel_areas[1], int(args.steel_areas[2])),
+                            args.f_y, width=args.width, d_c=args.d_c)
+    print(json.dumps(chart.error_bounds, indent=2))
@@ -85,18 +85,19 @@ def calc_design_spacing(f_r, f_ct, f_s, f_y, h, d_c, gamma_e=0.75):
         s_max = 18
     return s_max
 
-def calc_excess_reinf(M_design, phi_Mn):
+def calc_excess_reinf(M_design, phi_Mn, full_precision=False):
     """
     Calculates excess reinforcement factor, gamma_er.
 
     Parameters:
     - M_design: Design moment load (k-ft).
     - phi_Mn: Factored moment capacity (k-ft).
+    - full_precision: Return the unrounded factor.
     """
     gamma_er = M_design / phi_Mn
-    return round(gamma_er, 2)
+    return gamma_er if full_precision else round(gamma_er, 2)
 
-def calc_dist_reinf(width, height, f_y):
+def calc_dist_reinf(width, height, f_y, full_precision=False):
     """
     Calculates the required distribution reinforcement for a section.
 
@@ -104,9 +105,10 @@ def calc_dist_reinf(width, height, f_y):
     - width: Beam width in cross-section (in).
     - height: Beam height in cross-section (in).
     - f_y: Yield strength of steel (ksi).
+    - full_precision: Return the unrounded area.
 
     Returns:
     - Reinforcing area per foot (in²/ft).
     """
-    A_TS = 1.3 * width * height / (2 * (width + height) * f_y)
-    return round(min(max(A_TS, 0.11), 0.6), 3)
\ No newline at end of file
+    A_TS = min(max(1.3 * width * height / (2 * (width + height) * f_y), 0.11), 0.6)
+    return A_TS if full_precision else round(A_TS, 3)
\ No newline at end of file
@@ -0,0 +1,223 @@
+import numpy as np
+
+import rebar_props
+import batch_analysis
+
+STOCK_LENGTH = 60.0
+DETAIL_FIELDS = ('bar_size', 'f_c', 'f_y', 'bar_length', 'width', 'spacing')
+SPLICE_FACTORS = {'A': 1.0, 'B': 1.3}
+
+def lookup_bends(bar_size, bar_bend, bend_type: str='main') -> dict:
+    """
+    Looks up standard hook dimensions for arrays of bar sizes and bend
+    angles from rebar_props.get_bend_table.
+
+    Parameters:
+    - bar_size: Bar size designations, e.g. '#5'.
+    - bar_bend: Bend angles (degrees), e.g. 90 or 180.
+    - bend_type: 'main' or 'other'.
+
+    Returns:
+    - Dictionary of D, A and C arrays (in). C is NaN for 90° hooks.
+    """
+    table = rebar_props.get_bend_table(bend_type)
+    bar_size, bar_bend = np.broadcast_arrays(np.asarray(bar_size, dtype=str),
+                                             np.asarray(bar_bend, dtype=int))
+    keys = np.char.add(np.char.add(bar_size, '|'), bar_bend.astype(str))
+    unique, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(keys.shape)
+    records = []
+    for key in unique:
+        size, bend = key.split('|')
+        record = table.get((size, int(bend)))
+        if record is None:
+            raise ValueError(f"No {bend_type} bend of {bend}° for bar size '{size}'.")
+        records.append(record)
+    return {
+        'D': np.array([record.D for record in records])[inverse],
+        'A': np.array([record.A for record in records])[inverse],
+        'C': np.array([np.nan if record.C is None else record.C for record in records])[inverse],
+    }
+
+def calc_development_length(bar_diameter, f_c, f_y, lambda_rl=1.0, lambda_cf=1.0, lambda_rc=1.0,
+                            lambda_er=1.0):
+    """
+    Calculates the tension development length of straight bars,
+    ℓ_d = ℓ_db·λ_rl·λ_cf·λ_rc·λ_er with ℓ_db = 2.4·d_b·f_y/√f'c, not less
+    than 12 in. λ_rl·λ_cf need not exceed 1.7.
+
+    Parameters:
+    - bar_diameter: Bar diameter, d_b (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - f_y: Yield strength of steel (ksi).
+    - lambda_rl: Reinforcement location factor, 1.3 for top bars.
+    - lambda_cf: Coating factor for epoxy-coated bars.
+    - lambda_rc: Reinforcement confinement factor.
+    - lambda_er: Excess reinforcement factor, A_s required / A_s provided.
+
+    Returns:
+    - Development length, ℓ_d (in).
+    """
+    l_db = 2.4 * np.asarray(bar_diameter) * np.asarray(f_y) / np.sqrt(f_c)
+    factor = np.minimum(np.asarray(lambda_rl) * lambda_cf, 1.7) * lambda_rc * lambda_er
+    return np.maximum(l_db * factor, 12.0)
+
+def calc_splice_length(development_length, splice_class='B'):
+    """
+    Calculates the tension lap splice length, 1.0·ℓ_d for Class A and
+    1.3·ℓ_d for Class B splices, not less than 12 in.
+
+    Returns:
+    - Splice length (in).
+    """
+    splice_class = np.asarray(splice_class, dtype=str)
+    for value in np.unique(splice_class):
+        if value not in SPLICE_FACTORS:
+            raise ValueError(f"Splice class '{value}' must be 'A' or 'B'.")
+    factor = np.where(splice_class == 'A', SPLICE_FACTORS['A'], SPLICE_FACTORS['B'])
+    return np.maximum(factor * development_length, 12.0)
+
+def calc_hook_development_length(bar_diameter, f_c, f_y, lambda_rc=1.0, lambda_cw=1.0, lambda_er=1.0):
+    """
+    Calculates the development length of standard hooks in tension,
+    ℓ_dh = ℓ_hb·λ_rc·λ_cw·λ_er with ℓ_hb = 38·d_b/60·f_y/√f'c, not less
+    than 8·d_b or 6 in.
+
+    Parameters:
+    - bar_diameter: Bar diameter, d_b (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - f_y: Yield strength of steel (ksi).
+    - lambda_rc: Reinforcement confinement factor.
+    - lambda_cw: Coating factor, 1.2 for epoxy-coated bars.
+    - lambda_er: Excess reinforcement factor.
+
+    Returns:
+    - Hook development length, ℓ_dh (in).
+    """
+    bar_diameter = np.asarray(bar_diameter)
+    l_hb = 38 * bar_diameter / 60 * np.asarray(f_y) / np.sqrt(f_c)
+    return np.maximum(l_hb * lambda_rc * lambda_cw * lambda_er, np.maximum(8 * bar_diameter, 6.0))
+
+def calc_num_splices(bar_length, splice_length, stock_length=STOCK_LENGTH):
+    """
+    Calculates the lap splices needed to build a run from stock lengths.
+
+    Parameters:
+    - bar_length: Out-to-out length of the run (ft).
+    - splice_length: Lap splice length (in).
+    - stock_length: Longest bar supplied (ft).
+
+    Returns:
+    - Number of splices.
+    """
+    lap = np.asarray(splice_length) / 12
+    excess = np.maximum(np.asarray(bar_length) - stock_length, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(excess > 0, np.ceil(excess / (stock_length - lap)), 0).astype(int)
+
+def detail_bars(bar_size, f_c, f_y, bar_length, width, spacing, num_hooks=0, hook_angle=90,
+                bend_type='main', splice_class='B', offset=0, stock_length=STOCK_LENGTH,
+                lambda_rl=1.0, lambda_cf=1.0, lambda_rc=1.0, lambda_er=1.0) -> dict:
+    """
+    Calculates development, splice and hook lengths, cut lengths and
+    takeoff weights for many bar runs.
+
+    Each run is a layer of parallel bars at spacing across width. Cut
+    lengths add the hook detailing dimension A for each hook and a lap for
+    each splice to the straight length.
+
+    Parameters:
+    - bar_size: Bar size designations.
+    - f_c: Compressive strength of concrete (ksi).
+    - f_y: Yield strength of steel (ksi).
+    - bar_length: Straight out-to-out length of the run (ft).
+    - width: Width of concrete section the bars are spread across (in).
+    - spacing: Center-to-center bar spacing (in).
+    - num_hooks: Hooked ends per bar, 0, 1 or 2.
+    - hook_angle: Bend angle of the hooks (degrees).
+    - bend_type: 'main' or 'other' bend table.
+    - splice_class: 'A' or 'B' lap splices.
+    - offset: Edge of concrete to center of the outer bars (in), see
+      rebar_props.calc_num_bars.
+    - stock_length: Longest bar supplied (ft).
+    - lambda_rl, lambda_cf, lambda_rc, lambda_er: Development length
+      modification factors, see calc_development_length.
+
+    Returns:
+    - Dictionary of arrays: development, splice and hook lengths (in),
+      average bond stress at development (ksi), hook D, A and C (in, NaN
+      for straight bars),
+      number of splices and bars, cut length (ft) and steel weight (lb).
+    """
+    bars = batch_analysis.lookup_bar_props(bar_size)
+    bar_diameter = bars['bar_diameter']
+    num_hooks = np.asarray(num_hooks, dtype=int)
+    if np.any((num_hooks < 0) | (num_hooks > 2)):
+        raise ValueError("Bars have 0, 1 or 2 hooked ends.")
+    # straight runs need no bend, and the bend tables stop short of the
+    # largest bar sizes
+    bar_size, hook_angle, num_hooks = np.broadcast_arrays(np.asarray(bar_size, dtype=str),
+                                                          np.asarray(hook_angle), num_hooks)
+    hooked = num_hooks > 0
+    hooks = {name: np.full(num_hooks.shape, np.nan) for name in ('D', 'A', 'C')}
+    if hooked.any():
+        for name, values in lookup_bends(bar_size[hooked], hook_angle[hooked], bend_type).items():
+            hooks[name][hooked] = values
+
+    l_d = calc_development_length(bar_diameter, f_c, f_y, lambda_rl, lambda_cf, lambda_rc, lambda_er)
+    splice_length = calc_splice_length(l_d, splice_class)
+    l_dh = calc_hook_development_length(bar_diameter, f_c, f_y, lambda_rc=lambda_rc, lambda_er=lambda_er)
+    num_splices = calc_num_splices(bar_length, splice_length, stock_length)
+    hook_length = np.where(hooked, num_hooks * hooks['A'], 0)
+    cut_length = np.asarray(bar_length) + (hook_length + num_splices * splice_length) / 12
+    # array form of rebar_props.calc_num_bars, rounded up to whole bars
+    width, spacing, offset = (np.asarray(value, dtype=float) for value in (width, spacing, offset))
+    num_bars = np.ceil(np.where(offset == 0, width / spacing, (width - 2 * offset) / spacing + 1) - 1e-9)
+    return {
+        'development_length': l_d,
+        'splice_length': splice_length,
+        'hook_development_length': l_dh,
+        'bond_stress': bars['bar_area'] * np.asarray(f_y) / (bars['bar_perimeter'] * l_d),
+        'hook_D': hooks['D'],
+        'hook_A': hooks['A'],
+        'hook_C': hooks['C'],
+        'num_splices': num_splices,
+        'num_bars': num_bars,
+        'cut_length': cut_length,
+        'steel_weight': num_bars * cut_length * bars['bar_weight'],
+    }
+
+def detail_table(table, **options) -> dict:
+    """
+    Runs detail_bars over a table of bar runs.
+
+    Parameters:
+    - table: DataFrame, structured array or mapping with a column for each
+      name in DETAIL_FIELDS. Columns named like the optional arguments of
+      detail_bars are used too.
+    - options: Values for optional arguments without a column.
+    """
+    names = table.dtype.names if isinstance(table, np.ndarray) else table.keys()
+    missing = [field for field in DETAIL_FIELDS if field not in names]
+    if missing:
+        raise ValueError(f"Missing detailing fields: {', '.join(missing)}.")
+    optional = ('num_hooks', 'hook_angle', 'splice_class', 'offset', 'lambda_rl', 'lambda_cf',
+                'lambda_rc', 'lambda_er')
+    columns = {field: np.asarray(table[field]) for field in DETAIL_FIELDS + optional if field in names}
+    return detail_bars(**columns, **{name: value for name, value in options.items() if name not in columns})
+
+def summarize_takeoff(bar_size, steel_weight) -> dict:
+    """
+    Totals steel weight by bar size.
+
+    Returns:
+    - Dictionary of weight (lb) keyed by bar size, with the overall
+      'total'.
+    """
+    bar_size = np.asarray(bar_size, dtype=str)
+    steel_weight = np.broadcast_to(np.asarray(steel_weight, dtype=float), bar_size.shape)
+    sizes, inverse = np.unique(bar_size, return_inverse=True)
+    totals = np.bincount(inverse.ravel(), weights=steel_weight.ravel(), minlength=len(sizes))
+    summary = {str(size): float(total) for size, total in zip(sizes, totals)}
+    summary['total'] = float(totals.sum())
+    return summary
@@ -0,0 +1,286 @@
+import math
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+import rebar_props
+import design_check_funcs
+from conc_analysis_classes import ConcreteBeam, BeamCapacity, BeamStress, calc_fr
+
+INPUT_NAMES = ('width', 'height', 'cover', 'bar_size', 'spacing', 'f_c', 'f_y', 'E_s', 'conc_density',
+               'M_u', 'M_s', 'V_u', 'phi_m', 'phi_v', 'full_precision')
+# inputs that may be left out, as on the form
+INPUT_DEFAULTS = {'full_precision': False}
+
+class Node(NamedTuple):
+    """
+    Derived value in a DependencyGraph.
+
+    - func: Called with the values of inputs, in order.
+    - inputs: Names of the inputs and nodes the value depends on.
+    """
+    func: Callable
+    inputs: tuple
+
+class DependencyGraph:
+    """
+    Named input values and the nodes derived from them, ordered so every
+    node comes after the values it depends on.
+    """
+    def __init__(self, input_names: tuple, nodes: dict):
+        self.input_names = tuple(input_names)
+        self.nodes = dict(nodes)
+        self.dependents = {name: [] for name in self.input_names + tuple(self.nodes)}
+        for name, node in self.nodes.items():
+            for dependency in node.inputs:
+                if dependency not in self.dependents:
+                    raise ValueError(f"Node '{name}' depends on unknown value '{dependency}'.")
+                self.dependents[dependency].append(name)
+        self.order = self._sort()
+
+    def _sort(self) -> tuple:
+        order = []
+        remaining = {name: len(node.inputs) for name, node in self.nodes.items()}
+        for name in self.nodes:
+            remaining[name] -= sum(dependency in self.input_names for dependency in self.nodes[name].inputs)
+        ready = [name for name, count in remaining.items() if count == 0]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.nodes):
+            raise ValueError("Node dependencies form a cycle.")
+        return tuple(order)
+
+    def downstream(self, names) -> set:
+        """
+        Returns the nodes that depend, directly or not, on any of names.
+        """
+        found = set()
+        pending = list(names)
+        while pending:
+            for dependent in self.dependents[pending.pop()]:
+                if dependent not in found:
+                    found.add(dependent)
+                    pending.append(dependent)
+        return found
+
+def _same(old, new) -> bool:
+    if type(old) is not type(new):
+        return False
+    if isinstance(new, float) and math.isnan(old) and math.isnan(new):
+        return True
+    return old == new
+
+class IncrementalEvaluator:
+    """
+    Holds the values of a DependencyGraph and re-evaluates only the nodes
+    downstream of changed inputs.
+
+    Nodes whose recomputed value is unchanged do not dirty their own
+    dependents. If a node raises, the nodes not yet evaluated stay dirty
+    and are retried on the next update.
+    """
+    def __init__(self, graph: DependencyGraph, defaults: dict=None):
+        self.graph = graph
+        self.values = dict(defaults or {})
+        self.num_evaluated = 0
+        self._dirty = set(graph.nodes)
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    def update(self, inputs: dict) -> dict:
+        """
+        Sets input values and re-evaluates the affected nodes.
+
+        Parameters:
+        - inputs: Values keyed by input name. Every input without a default
+          must be given on the first update.
+
+        Returns:
+        - Values of the inputs and nodes that changed since the last
+          successful update.
+        """
+        unknown = [name for name in inputs if name not in self.graph.input_names]
+        if unknown:
+            raise ValueError(f"Unknown inputs: {', '.join(unknown)}.")
+        with self._lock:
+            missing = [name for name in self.graph.input_names if name not in self.values and name not in inputs]
+            if missing:
+                raise ValueError(f"Missing inputs: {', '.join(missing)}.")
+            for name, value in inputs.items():
+                if name not in self.values or not _same(self.values[name], value):
+                    self.values[name] = value
+                    self._changed.add(name)
+                    self._dirty.update(self.graph.dependents[name])
+
+            self.num_evaluated = 0
+            for name in self.graph.order:
+                if name not in self._dirty:
+                    continue
+                node = self.graph.nodes[name]
+                value = node.func(*(self.values[dependency] for dependency in node.inputs))
+                self.num_evaluated += 1
+                self._dirty.discard(name)
+                if name not in self.values or not _same(self.values[name], value):
+                    self.values[name] = value
+                    self._changed.add(name)
+                    self._dirty.update(self.graph.dependents[name])
+
+            changed = {name: self.values[name] for name in self._changed}
+            self._changed = set()
+            return changed
+
+def _round(value, digits, full_precision):
+    return value if full_precision else round(value, digits)
+
+def _calc_f_ct(M_s, height, I_g, full_precision):
+    # BeamStress.calc_uncracked_stress
+    return _round(M_s * 12 * height / 2 / I_g, 2, full_precision)
+
+def _calc_conc_stress(cracking_ratio, M_s, k, j, width, d_s, f_ct, full_precision):
+    # the uncracked stress stands in for the concrete stress below cracking
+    if cracking_ratio < 1:
+        return f_ct
+    # BeamStress.calc_conc_stress
+    return _round(2 * M_s * 12 / (j * k * width * d_s**2), 3, full_precision)
+
+def _capacity(width, height, d_c, f_c, steel_area, f_y, full_precision):
+    return BeamCapacity(width, height, d_c, f_c, steel_area, f_y, full_precision)
+
+# the quantities of app.process; spacing reaches only the steel area, so a
+# spacing change leaves w_DL, M_cr and I_g alone
+PROCESS_NODES = {
+    'bar_area': Node(lambda bar_size: rebar_props.RebarProperties(bar_size).bar_area, ('bar_size',)),
+    'bar_diameter': Node(lambda bar_size: rebar_props.RebarProperties(bar_size).bar_diameter, ('bar_size',)),
+    'd_c': Node(rebar_props.calc_position, ('cover', 'bar_diameter')),
+    'steel_area': Node(lambda width, spacing, bar_area: width / spacing * bar_area,
+                       ('width', 'spacing', 'bar_area')),
+    'As_per_ft': Node(rebar_props.calc_As_per_ft, ('bar_area', 'spacing')),
+    'd_s': Node(lambda height, d_c: height - d_c, ('height', 'd_c')),
+    'w_DL': Node(lambda width, height, f_c, conc_density, full_precision:
+                 ConcreteBeam(width, height, 0, f_c, full_precision).calc_self_load(conc_density),
+                 ('width', 'height', 'f_c', 'conc_density', 'full_precision')),
+    'M_cr': Node(lambda width, height, f_c, full_precision:
+                 ConcreteBeam(width, height, 0, f_c, full_precision).calc_Mcr(),
+                 ('width', 'height', 'f_c', 'full_precision')),
+    'I_g': Node(lambda width, height: ConcreteBeam(width, height, 0, 0).calc_Ig(), ('width', 'height')),
+    'f_r': Node(calc_fr, ('f_c',)),
+    'a': Node(lambda *args: _capacity(*args).calc_comp_block_depth(),
+              ('width', 'height', 'd_c', 'f_c', 'steel_area', 'f_y', 'full_precision')),
+    'M_n': Node(lambda *args: _capacity(*args).calc_moment_capacity(),
+                ('width', 'height', 'd_c', 'f_c', 'steel_area', 'f_y', 'full_precision')),
+    'epsilon_st': Node(lambda *args: _capacity(*args).calc_epsilon_t(),
+                       ('width', 'height', 'd_c', 'f_c', 'steel_area', 'f_y', 'full_precision')),
+    'd_v': Node(lambda *args: _capacity(*args).calc_dv(),
+                ('width', 'height', 'd_c', 'f_c', 'steel_area', 'f_y', 'full_precision')),
+    'V_n': Node(lambda *args: _capacity(*args).calc_shear_capacity(),
+                ('width', 'height', 'd_c', 'f_c', 'steel_area', 'f_y', 'full_precision')),
+    'k': Node(lambda width, height, d_c, f_c, steel_area, E_s, conc_density:
+              BeamStress(width, height, d_c, f_c, steel_area, E_s, conc_density).calc_k(),
+              ('width', 'height', 'd_c', 'f_c', 'steel_area', 'E_s', 'conc_density')),
+    'j': Node(lambda k: 1 - k / 3, ('k',)),
+    'cracking_ratio': Node(lambda M_u, M_cr: M_u / M_cr, ('M_u', 'M_cr')),
+    'f_ct': Node(_calc_f_ct, ('M_s', 'height', 'I_g', 'full_precision')),
+    # BeamStress.calc_steel_stress
+    'f_s': Node(lambda M_s, steel_area, j, d_s, full_precision:
+                _round(M_s * 12 / (steel_area * j * d_s), 3, full_precision),
+                ('M_s', 'steel_area', 'j', 'd_s', 'full_precision')),
+    'conc_stress': Node(_calc_conc_stress,
+                        ('cracking_ratio', 'M_s', 'k', 'j', 'width', 'd_s', 'f_ct', 'full_precision')),
+    'moment_capacity': Node(lambda phi_m, M_n: phi_m * M_n, ('phi_m', 'M_n')),
+    'shear_capacity': Node(lambda phi_v, V_n: phi_v * V_n, ('phi_v', 'V_n')),
+    'moment_check': Node(lambda M_n, M_u, phi_m: design_check_funcs.check_capacity(M_n, M_u, phi_m) >= 1,
+                         ('M_n', 'M_u', 'phi_m')),
+    'moment_ratio': Node(design_check_funcs.calc_demand_ratio, ('M_u', 'M_n', 'phi_m')),
+    'gamma_3': Node(design_check_funcs.determine_gamma_3, ('f_y',)),
+    'M_design': Node(lambda M_u, M_cr, gamma_3: design_check_funcs.calc_design_M(M_u, M_cr, gamma_3=gamma_3),
+                     ('M_u', 'M_cr', 'gamma_3')),
+    'min_reinf_check': Node(lambda M_n, M_design, phi_m:
+                            design_check_funcs.check_capacity(M_n, M_design, phi_m) >= 1,
+                            ('M_n', 'M_design', 'phi_m')),
+    'min_reinf_ratio': Node(design_check_funcs.calc_demand_ratio, ('M_design', 'M_n', 'phi_m')),
+    's_max': Node(design_check_funcs.calc_design_spacing, ('f_r', 'f_ct', 'f_s', 'f_y', 'height', 'd_c')),
+    'crack_control_check': Node(lambda spacing, s_max: spacing <= s_max, ('spacing', 's_max')),
+    'crack_control_ratio': Node(lambda spacing, s_max: spacing / s_max, ('spacing', 's_max')),
+    'epsilon_tl': Node(design_check_funcs.calc_epsilon_tl, ('f_y',)),
+    'ductility_check': Node(lambda epsilon_st, epsilon_tl: epsilon_st > epsilon_tl, ('epsilon_st', 'epsilon_tl')),
+    'ductility_ratio': Node(lambda epsilon_st, epsilon_tl: epsilon_tl / epsilon_st, ('epsilon_st', 'epsilon_tl')),
+    'A_ts': Node(design_check_funcs.calc_dist_reinf, ('width', 'height', 'f_y', 'full_precision')),
+    'distr_reinf_check': Node(lambda As_per_ft, A_ts: As_per_ft / A_ts >= 1, ('As_per_ft', 'A_ts')),
+    'dist_reinf_ratio': Node(lambda As_per_ft, A_ts: A_ts / As_per_ft, ('As_per_ft', 'A_ts')),
+    'gamma_er': Node(lambda M_design, phi_m, M_n, full_precision:
+                     design_check_funcs.calc_excess_reinf(M_design, phi_m * M_n, full_precision),
+                     ('M_design', 'phi_m', 'M_n', 'full_precision')),
+    'shear_check': Node(lambda V_n, V_u, phi_v: design_check_funcs.check_capacity(V_n, V_u, phi_v) >= 1,
+                        ('V_n', 'V_u', 'phi_v')),
+    'shear_ratio': Node(design_check_funcs.calc_demand_ratio, ('V_u', 'V_n', 'phi_v')),
+}
+
+process_graph = DependencyGraph(INPUT_NAMES, PROCESS_NODES)
+
+# result.html names of the process outputs, keyed by node
+OUTPUT_NAMES = {
+    'd_s': 'd_s', 'w_DL': 'w_DL', 'M_cr': 'M_cr', 'a': 'a', 'moment_capacity': 'moment_capacity',
+    'epsilon_st': 'epsilon_st', 'd_v': 'd_v', 'shear_capacity': 'shear_capacity', 'f_s': 'f_s',
+    'conc_stress': 'f_c', 'A_ts': 'A_ts', 'moment_check': 'moment_check', 'shear_check': 'shear_check',
+    'min_reinf_check': 'min_reinf_check', 'crack_control_check': 'crack_control_check',
+    'ductility_check': 'ductility_check', 'distr_reinf_check': 'distr_reinf_check', 'gamma_er': 'gamma_er',
+    'moment_ratio': 'moment_ratio', 'shear_ratio': 'shear_ratio', 'min_reinf_ratio': 'min_reinf_ratio',
+    'crack_control_ratio': 'crack_control_ratio', 'ductility_ratio': 'ductility_ratio',
+    'dist_reinf_ratio': 'dist_reinf_ratio',
+}
+
+def changed_outputs(changed: dict) -> dict:
+    """
+    Selects the process outputs from an update, under their result.html
+    names.
+    """
+    return {output: changed[node] for node, output in OUTPUT_NAMES.items() if node in changed}
+
+class SessionStore:
+    """
+    Incremental evaluators of the process graph keyed by session id, with
+    least recently used sessions evicted beyond maxsize.
+    """
+    def __init__(self, maxsize: int=1024):
+        self.maxsize = maxsize
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str=None):
+        """
+        Returns the evaluator of a session, or None when session_id is None
+        or unknown.
+        """
+        with self._lock:
+            if session_id not in self._sessions:
+                return None
+            self._sessions.move_to_end(session_id)
+            return self._sessions[session_id]
+
+    def add(self, evaluator: IncrementalEvaluator) -> str:
+        """
+        Stores the evaluator of a new session, once it has been updated
+        successfully.
+
+        Returns:
+        - Session id.
+        """
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = evaluator
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,258 @@
+import numpy as np
+
+import batch_analysis
+from rebar_optimizer import calc_required_steel_area
+
+def calc_max_steel_area_array(width, d, f_c, f_y):
+    """
+    Array form of rebar_optimizer.calc_max_steel_area: the largest steel
+    area that keeps the section ductile (in²).
+    """
+    epsilon_tl = batch_analysis.calc_epsilon_tl_array(f_y)
+    c_max = 0.003 * d / (0.003 + epsilon_tl)
+    return 0.85 * f_c * width * batch_analysis.calc_beta1_array(f_c) * c_max / f_y
+
+def solve_required_steel_area(M_u, width, height, d_c, f_c, f_y, phi_m=0.9) -> dict:
+    """
+    Calculates the steel area needed for the moment and minimum
+    reinforcement checks from the quadratic in the stress block depth.
+
+    Parameters:
+    - M_u: Factored moment (k-ft).
+    - width: Beam width (in).
+    - height: Beam height (in).
+    - d_c: Concrete face in tension to center of reinforcing (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - f_y: Yield strength of steel (ksi).
+    - phi_m: Moment resistance factor.
+
+    Returns:
+    - Dictionary with the required 'steel_area' (in², NaN where no steel
+      area reaches the design moment), the governing 'M_design' (k-ft),
+      the ductility limit 'max_steel_area' (in²) and whether the required
+      area is 'ductile'.
+    """
+    M_u, width, height, d_c, f_c, f_y, phi_m = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (M_u, width, height, d_c, f_c, f_y, phi_m)))
+    d = height - d_c
+    M_cr = 0.24 * f_c ** 0.5 * (width * height ** 2 / 6) / 12
+    M_design = batch_analysis.calc_design_M_array(M_u, M_cr, gamma_3=batch_analysis.determine_gamma_3_array(f_y))
+    steel_area = calc_required_steel_area(M_design / phi_m, width, d, f_c, f_y)
+    max_steel_area = calc_max_steel_area_array(width, d, f_c, f_y)
+    return {
+        'steel_area': steel_area,
+        'M_design': M_design,
+        'max_steel_area': max_steel_area,
+        'ductile': steel_area < max_steel_area,
+    }
+
+def calc_max_factored_moment(section: dict, phi_m=0.9):
+    """
+    Calculates the largest factored moment passing the moment and minimum
+    reinforcement checks.
+
+    When 1.6·γ3·M_cr exceeds φM_n the minimum reinforcement check limits
+    1.33·M_u to φM_n, otherwise the moment check limits M_u to φM_n.
+
+    Parameters:
+    - section: Result of batch_analysis.prepare_sections.
+    - phi_m: Moment resistance factor.
+
+    Returns:
+    - Maximum M_u (k-ft).
+    """
+    phi_M_n = phi_m * section['M_n']
+    cracking_limited = 1.6 * section['gamma_3'] * section['M_cr'] > phi_M_n
+    return np.where(cracking_limited, phi_M_n / 1.33, phi_M_n)
+
+def calc_max_service_moment(section: dict, gamma_e=0.75):
+    """
+    Calculates the largest service moment passing the crack control check.
+
+    Below the cracking limit f_ct = 0.8·f_r the maximum spacing is 18 in.
+    Above it the spacing limit gives an allowable steel stress
+    700·γe / (β_s·(s + 2·d_c)); if that is at least 0.6·f_y no cracked
+    section fails the check.
+
+    With spacing over 18 in the passing moments are not a range from
+    zero: uncracked sections fail and only moments above the cracking
+    limit pass. The result is still the largest passing moment, inf when
+    the cracked section passes at any moment.
+
+    Parameters:
+    - section: Result of batch_analysis.prepare_sections.
+    - gamma_e: AASHTO exposure factor.
+
+    Returns:
+    - Maximum M_s (k-ft), inf where any moment passes and NaN where none
+      does.
+    """
+    h, d, d_c = section['height'], section['d'], section['d_c']
+    spacing, f_y = section['spacing'], section['f_y']
+    f_ct_limit = 0.8 * section['f_r']
+    beta_s = 1 + d_c / (0.7 * (h - d_c))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f_allow = 700 * gamma_e / (beta_s * (spacing + 2 * d_c))
+        f_s_limit = f_allow
+        if not section.get('full_precision', False):
+            # f_ct and f_s are compared after rounding to 2 and 3 decimals
+            f_ct_limit = np.floor(f_ct_limit * 100) / 100 + 0.005
+            f_s_limit = np.floor(f_allow * 1000) / 1000 + 0.0005
+        # moment at which the section is taken as cracked for crack control
+        M_ct = f_ct_limit * section['I_g'] / (h / 2) / 12
+        M_fs = f_s_limit * section['steel_area'] * section['j'] * d / 12
+        M_cracked = np.where(M_fs > M_ct, M_fs, np.nan)
+        M_max = np.where(spacing <= 18, np.fmax(M_cracked, M_ct), M_cracked)
+        return np.where(f_allow >= 0.6 * f_y, np.inf, M_max)
+
+def calc_max_shear(section: dict, phi_v=0.9):
+    """
+    Returns:
+    - Largest factored shear passing the shear check, φV_n (kips).
+    """
+    return phi_v * section['V_n']
+
+def calc_max_loads(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                   phi_m=0.9, phi_v=0.9, full_precision: bool=False) -> dict:
+    """
+    Calculates the capacity-limited loads of many sections.
+
+    Parameters take the same names and units as the input form.
+    full_precision skips the rounding of the scalar classes.
+
+    Returns:
+    - Dictionary of 'M_u', 'M_s' and 'V_u' arrays.
+    """
+    section = batch_analysis.prepare_sections(width, height, cover, bar_size, spacing, f_c, f_y, E_s,
+                                              conc_density, full_precision)
+    phi_m = np.asarray(phi_m, dtype=float)
+    phi_v = np.asarray(phi_v, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'M_u': calc_max_factored_moment(section, phi_m),
+            'M_s': calc_max_service_moment(section),
+            'V_u': calc_max_shear(section, phi_v),
+        }
+
+# checks passed by the section found; min_reinf_check can pass, fail and pass
+# again as the height grows, the others improve with height
+HEIGHT_CHECKS = ('moment_check', 'shear_check', 'min_reinf_check', 'crack_control_check',
+                 'ductility_check')
+MONOTONIC_CHECKS = ('moment_check', 'shear_check', 'crack_control_check', 'ductility_check')
+
+def solve_min_height(width, cover, bar_size, spacing, f_c, f_y, E_s, conc_density, M_u, M_s, V_u,
+                     phi_m=0.9, phi_v=0.9, max_height=120.0, tolerance=0.01, grid_step=0.5,
+                     full_precision: bool=False) -> dict:
+    """
+    Finds the smallest height passing every check for many sections.
+
+    The minimum reinforcement check can pass, fail and pass again as the
+    height grows, since M_cr grows with h² and φM_n only with d. Its pass
+    windows start where φM_n reaches M_u, 1.33·M_u or 1.6·γ3·M_cr, which
+    are solved in closed form. The smallest height passing the other
+    checks is found by bisection. Heights around each of these starts and
+    a grid of grid_step between the moment and ductility lower bound and
+    max_height are checked with the vectorized check chain, and the first
+    fail-to-pass bracket is narrowed by bisection.
+
+    Parameters:
+    - width, cover, bar_size, spacing, f_c, f_y, E_s, conc_density, M_u, M_s,
+      V_u, phi_m, phi_v: Inputs as on the form.
+    - max_height: Largest height considered (in).
+    - tolerance: Height resolution (in).
+    - grid_step: Spacing of the candidate heights (in).
+    - full_precision: Skip the rounding of the scalar classes.
+
+    Returns:
+    - Dictionary with 'height' (in, NaN where no height up to max_height
+      passes) and whether the distribution reinforcement check also passes
+      there ('distr_reinf_check').
+    """
+    inputs = dict(width=width, cover=cover, bar_size=bar_size, spacing=spacing, f_c=f_c, f_y=f_y, E_s=E_s,
+                  conc_density=conc_density, M_u=M_u, M_s=M_s, V_u=V_u, phi_m=phi_m, phi_v=phi_v)
+    shape = np.broadcast(*(np.asarray(value) for value in inputs.values())).shape
+    inputs = {name: np.broadcast_to(np.asarray(value), shape).ravel() for name, value in inputs.items()}
+    num_rows = len(inputs['width'])
+
+    def passes(height, rows, checks=HEIGHT_CHECKS):
+        # height has one row per section in rows and any number of columns
+        columns = {name: value[rows].reshape(-1, *(1,) * (np.ndim(height) - 1)) for name, value in inputs.items()}
+        results = batch_analysis.check_sections(height=height, full_precision=full_precision, **columns)
+        return np.logical_and.reduce([np.broadcast_to(results[check], np.shape(height))
+                                      for check in checks]), results
+
+    def bisect(lower, upper, active, checks=HEIGHT_CHECKS):
+        # narrows brackets failing at lower and passing at upper
+        lower, upper = lower.copy(), upper.copy()
+        while True:
+            rows = np.flatnonzero(active & (upper - lower > tolerance))
+            if not len(rows):
+                return upper
+            middle = (lower[rows] + upper[rows]) / 2
+            ok, _ = passes(middle, rows, checks)
+            upper[rows] = np.where(ok, middle, upper[rows])
+            lower[rows] = np.where(ok, lower[rows], middle)
+
+    # closed-form lower bound from the moment and ductility checks
+    bars = batch_analysis.lookup_bar_props(inputs['bar_size'])
+    d_c = inputs['cover'] + bars['bar_diameter']
+    steel_area = inputs['width'] / inputs['spacing'] * bars['bar_area']
+    f_c, f_y = inputs['f_c'].astype(float), inputs['f_y'].astype(float)
+    a = steel_area * f_y / (0.85 * f_c * inputs['width'])
+    c = a / batch_analysis.calc_beta1_array(f_c)
+    phi_T = inputs['phi_m'] * steel_area * f_y / 12
+    M_n_limit = inputs['M_u'] / inputs['phi_m']
+    epsilon_limit = batch_analysis.calc_epsilon_tl_array(f_y)
+    if not full_precision:
+        # M_n and epsilon_st are compared after rounding to 1 and 3 decimals
+        M_n_limit = M_n_limit - 0.05
+        epsilon_limit = np.minimum(epsilon_limit, np.floor(epsilon_limit * 1000 + 1) / 1000 - 0.0005)
+    d_moment = M_n_limit * inputs['phi_m'] / phi_T + a / 2
+    d_ductile = c * (1 + epsilon_limit / 0.003)
+    lower = np.minimum(np.maximum(d_moment, d_ductile) + d_c, max_height)
+    top = np.full(num_rows, float(max_height))
+
+    # smallest height passing the monotonic checks
+    lower_ok, _ = passes(lower, slice(None), MONOTONIC_CHECKS)
+    top_ok, _ = passes(top, slice(None), MONOTONIC_CHECKS)
+    h_monotonic = np.where(lower_ok, lower, bisect(lower, top, top_ok & ~lower_ok, MONOTONIC_CHECKS))
+
+    # starts of the min_reinf_check pass windows: φM_n = M_u, φM_n = 1.33·M_u
+    # and the lower root of 1.6·γ3·M_cr(h) = φM_n(h), quadratic in h.
+    # Rounding moves them slightly, so each is checked on a fine grid.
+    h_moment = inputs['M_u'] / phi_T + a / 2 + d_c
+    h_133 = 1.33 * inputs['M_u'] / phi_T + a / 2 + d_c
+    alpha = 1.6 * batch_analysis.determine_gamma_3_array(f_y) * 0.24 * f_c ** 0.5 * inputs['width'] / 72
+    with np.errstate(invalid='ignore'):
+        h_root = (phi_T - np.sqrt(phi_T ** 2 - 4 * alpha * phi_T * (d_c + a / 2))) / (2 * alpha)
+    starts = np.stack([h_monotonic, h_moment, h_133, h_root], 1)
+    offsets = np.arange(-10, 11) * tolerance
+    grid = np.arange(0, max_height, grid_step)
+    candidates = np.concatenate([np.broadcast_to(grid, (num_rows, len(grid))),
+                                 (starts[:, :, None] + offsets).reshape(num_rows, -1),
+                                 np.stack([lower, top], 1)], axis=1)
+    candidates = np.where((candidates >= lower[:, None]) & (candidates <= max_height), candidates, np.nan)
+    candidates.sort(axis=1)
+
+    # first passing candidate of each section, checked a block of columns at a time
+    first = np.full(num_rows, -1)
+    for start in range(0, candidates.shape[1], 16):
+        rows = np.flatnonzero((first < 0) & ~np.isnan(candidates[:, start]))
+        if not len(rows):
+            break
+        block = candidates[rows, start:start + 16]
+        ok, _ = passes(np.where(np.isnan(block), max_height, block), rows)
+        ok &= ~np.isnan(block)
+        found = ok.any(axis=1)
+        first[rows[found]] = start + ok[found].argmax(axis=1)
+
+    feasible = first >= 0
+    index = np.arange(num_rows)
+    upper = np.where(feasible, candidates[index, np.maximum(first, 0)], max_height)
+    below = np.where(first > 0, candidates[index, np.maximum(first - 1, 0)], upper)
+    upper = bisect(below, upper, feasible)
+
+    _, results = passes(upper, slice(None))
+    return {'height': np.where(feasible, upper, np.nan).reshape(shape),
+            'distr_reinf_check': (np.broadcast_to(results['distr_reinf_check'], upper.shape)
+                                  & feasible).reshape(shape)}
@@ -0,0 +1,64 @@
+import numpy as np
+
+import batch_analysis
+
+ENVELOPE_CHECKS = {
+    'moment': ('moment_ratio', 'moment_check'),
+    'shear': ('shear_ratio', 'shear_check'),
+    'min_reinf': ('min_reinf_ratio', 'min_reinf_check'),
+    'crack_control': ('crack_control_ratio', 'crack_control_check'),
+    'ductility': ('ductility_ratio', 'ductility_check'),
+    'dist_reinf': ('dist_reinf_ratio', 'distr_reinf_check'),
+    'excess_reinf': ('gamma_er', None),
+}
+
+def analyze_load_cases(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                       M_u, M_s, V_u, phi_m=0.9, phi_v=0.9) -> dict:
+    """
+    Checks one section against many load cases.
+
+    Section quantities are computed once; the load-dependent stresses,
+    design moment, design spacing and ratios are evaluated for all cases
+    together.
+
+    Parameters:
+    - width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density:
+      Section inputs as on the form.
+    - M_u: Factored moments, one per case (k-ft).
+    - M_s: Service moments, one per case (k-ft).
+    - V_u: Factored shears, one per case (kips).
+    - phi_m: Moment resistance factor.
+    - phi_v: Shear resistance factor.
+
+    Returns:
+    - Dictionary with 'cases' (per-case result arrays, including 'cracked',
+      'M_design' and 's_max') and 'envelope' (governing ratio, controlling
+      case index and pass/fail for each check).
+    """
+    M_u, M_s, V_u = np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=float))
+                                          for value in (M_u, M_s, V_u)))
+    cases = batch_analysis.check_sections(width, height, cover, bar_size, spacing, f_c, f_y,
+                                          E_s, conc_density, M_u, M_s, V_u, phi_m, phi_v)
+    return {'cases': cases, 'envelope': calc_envelope(cases)}
+
+def calc_envelope(cases: dict) -> dict:
+    """
+    Finds the governing case of each check.
+
+    Parameters:
+    - cases: Per-case result arrays from batch_analysis.check_sections.
+
+    Returns:
+    - Dictionary keyed by check name with the governing 'ratio', the index
+      of the controlling 'case' and whether every case 'passes'.
+    """
+    envelope = {}
+    for name, (ratio_field, check_field) in ENVELOPE_CHECKS.items():
+        ratios = np.asarray(cases[ratio_field], dtype=float)
+        if np.isnan(ratios).all():
+            case = 0
+        else:
+            case = int(np.nanargmax(ratios))
+        passes = None if check_field is None else bool(np.all(cases[check_field]))
+        envelope[name] = {'ratio': float(ratios[case]), 'case': case, 'passes': passes}
+    return envelope
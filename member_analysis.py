@@ -0,0 +1,259 @@
+from typing import NamedTuple
+
+import numpy as np
+
+import batch_analysis
+import load_envelope
+from conc_analysis_classes import ConcreteBeam
+
+SUPPORT_RESTRAINTS = {
+    'pin': (True, False),
+    'fixed': (True, True),
+    'free': (False, False),
+}
+
+class MemberSection(NamedTuple):
+    """
+    Cross-section of a span, in the units of the input form.
+    """
+    width: float
+    height: float
+    cover: float
+    bar_size: str
+    spacing: float
+    f_c: float
+    f_y: float
+    E_s: float = 29000
+    conc_density: float = 150
+
+class PointLoad(NamedTuple):
+    """
+    Concentrated load on a span.
+
+    - span: Index of the loaded span.
+    - position: Distance from the left end of the span (ft).
+    - P: Load, positive downward (kips).
+    - case: 'dead' or 'live'.
+    """
+    span: int
+    position: float
+    P: float
+    case: str = 'live'
+
+def _per_span(value, num_spans: int, name: str) -> list:
+    if isinstance(value, MemberSection) or np.ndim(value) == 0:
+        return [value] * num_spans
+    value = list(value)
+    if len(value) != num_spans:
+        raise ValueError(f"Expected one {name} per span.")
+    return value
+
+def _fixed_end_forces(length: float, w: float, point_loads) -> np.ndarray:
+    """
+    Fixed-end reactions (V_left, M_left, V_right, M_right) of a span, with
+    shears positive upward and moments positive counterclockwise.
+    """
+    forces = np.array([w * length / 2, w * length ** 2 / 12, w * length / 2, -w * length ** 2 / 12])
+    for a, P in point_loads:
+        b = length - a
+        forces += P * np.array([b ** 2 * (3 * a + b) / length ** 3, a * b ** 2 / length ** 2,
+                                a ** 2 * (a + 3 * b) / length ** 3, -a ** 2 * b / length ** 2])
+    return forces
+
+def _element_stiffness(length: float, EI: float) -> np.ndarray:
+    L = length
+    return EI / L ** 3 * np.array([[12, 6 * L, -12, 6 * L],
+                                   [6 * L, 4 * L ** 2, -6 * L, 2 * L ** 2],
+                                   [-12, -6 * L, 12, -6 * L],
+                                   [6 * L, 2 * L ** 2, -6 * L, 4 * L ** 2]])
+
+def solve_end_forces(spans, supports, EI, w, point_loads) -> np.ndarray:
+    """
+    Solves a continuous beam by the stiffness method.
+
+    Parameters:
+    - spans: Span lengths (ft).
+    - supports: Support type at each end of every span, 'pin', 'fixed' or
+      'free'.
+    - EI: Relative flexural stiffness of each span.
+    - w: Uniform load on each span, positive downward (k/ft).
+    - point_loads: For each span, a list of (position (ft), P (kips)).
+
+    Returns:
+    - Array of (V_left, M_left, V_right, M_right) end forces on each span
+      (kips, k-ft), shears positive upward and moments counterclockwise.
+    """
+    num_nodes = len(spans) + 1
+    K = np.zeros((2 * num_nodes, 2 * num_nodes))
+    F = np.zeros(2 * num_nodes)
+    fixed_end = []
+    for i, length in enumerate(spans):
+        dofs = slice(2 * i, 2 * i + 4)
+        K[dofs, dofs] += _element_stiffness(length, EI[i])
+        fixed_end.append(_fixed_end_forces(length, w[i], point_loads[i]))
+        F[dofs] -= fixed_end[-1]
+    free = np.array([not restrained for support in supports
+                     for restrained in SUPPORT_RESTRAINTS[support]])
+    displacements = np.zeros(2 * num_nodes)
+    if free.any():
+        K_ff = K[np.ix_(free, free)]
+        if np.linalg.matrix_rank(K_ff) < K_ff.shape[0]:
+            raise ValueError("Member supports do not form a stable structure.")
+        displacements[free] = np.linalg.solve(K_ff, F[free])
+    return np.array([_element_stiffness(length, EI[i]) @ displacements[2 * i:2 * i + 4] + fixed_end[i]
+                     for i, length in enumerate(spans)])
+
+def calc_station_actions(spans, end_forces, w, point_loads, span_index, x):
+    """
+    Calculates moment and shear at stations from the span end forces.
+
+    Parameters:
+    - spans: Span lengths (ft).
+    - end_forces: Result of solve_end_forces.
+    - w: Uniform load on each span (k/ft).
+    - point_loads: For each span, a list of (position (ft), P (kips)).
+    - span_index: Span of each station.
+    - x: Distance of each station from the left end of its span (ft).
+
+    Returns:
+    - Moment (k-ft, sagging positive) and shear (kips) at each station.
+    """
+    w = np.asarray(w, dtype=float)[span_index]
+    V_left = end_forces[span_index, 0]
+    M = -end_forces[span_index, 1] + V_left * x - w * x ** 2 / 2
+    V = V_left - w * x
+    for i in range(len(spans)):
+        on_span = span_index == i
+        for a, P in point_loads[i]:
+            past = on_span & (x > a)
+            M = M - np.where(past, P * (x - a), 0.0)
+            V = V - np.where(past, P, 0.0)
+    return M, V
+
+def analyze_member(spans, section, supports=None, w_dead=0.0, w_live=0.0, point_loads=(),
+                   top_section=None, stations_per_span: int=21, strength_factors=(1.25, 1.75),
+                   service_factors=(1.0, 1.0), phi_m=0.9, phi_v=0.9, full_precision: bool=False) -> dict:
+    """
+    Analyzes a multi-span beam or slab strip and runs the design checks at
+    stations along its length.
+
+    Self-weight from ConcreteBeam.calc_self_load is added to the dead load.
+    Live load is patterned span by span to envelope positive and negative
+    actions. The section checks run once per distinct section and are
+    reused at every station with that section; station loads are then
+    checked together.
+
+    Parameters:
+    - spans: Span lengths (ft).
+    - section: MemberSection for all spans, or one per span.
+    - supports: Support types 'pin', 'fixed' or 'free' at the len(spans) + 1
+      supports. Defaults to pinned.
+    - w_dead: Superimposed dead load (k/ft), one value or one per span.
+    - w_live: Live load (k/ft), one value or one per span.
+    - point_loads: PointLoad records.
+    - top_section: Section resisting negative moment, one or one per span.
+      Defaults to section.
+    - stations_per_span: Number of evenly spaced stations on each span.
+    - strength_factors: Dead and live load factors for M_u and V_u.
+    - service_factors: Dead and live load factors for M_s.
+    - phi_m: Moment resistance factor.
+    - phi_v: Shear resistance factor.
+    - full_precision: Skip the rounding of the scalar classes.
+
+    Returns:
+    - Dictionary with 'stations' (span, x and the load envelopes at each
+      station), 'checks' (check results for the positive then the negative
+      face of every station, with 'station' and 'face') and 'governing'
+      (ratio, location and pass/fail of each check).
+    """
+    spans = [float(length) for length in spans]
+    num_spans = len(spans)
+    if num_spans == 0 or min(spans) <= 0:
+        raise ValueError("Spans must be positive lengths.")
+    supports = ['pin'] * (num_spans + 1) if supports is None else list(supports)
+    if len(supports) != num_spans + 1:
+        raise ValueError("Expected one support per span end.")
+    for support in supports:
+        if support not in SUPPORT_RESTRAINTS:
+            raise ValueError(f"Unknown support type '{support}'.")
+    bottom = _per_span(section, num_spans, 'section')
+    top = bottom if top_section is None else _per_span(top_section, num_spans, 'top section')
+    w_dead = np.asarray(_per_span(w_dead, num_spans, 'dead load'), dtype=float)
+    w_live = np.asarray(_per_span(w_live, num_spans, 'live load'), dtype=float)
+    dead_points = [[] for _ in spans]
+    live_points = [[] for _ in spans]
+    for load in point_loads:
+        load = PointLoad(*load)
+        if not 0 <= load.span < num_spans or not 0 <= load.position <= spans[load.span]:
+            raise ValueError(f"Point load at span {load.span}, {load.position} ft is off the member.")
+        if load.case not in ('dead', 'live'):
+            raise ValueError(f"Unknown load case '{load.case}'.")
+        (dead_points if load.case == 'dead' else live_points)[load.span].append((load.position, load.P))
+
+    # distinct sections, each analyzed once
+    unique = {}
+    span_sections = np.array([[unique.setdefault(s, len(unique)) for s in (bottom[i], top[i])]
+                              for i in range(num_spans)])
+    sections = batch_analysis.prepare_sections(*(np.asarray(column) for column in zip(*unique)),
+                                               full_precision=full_precision)
+
+    beams = [ConcreteBeam(s.width, s.height, 0, s.f_c) for s in bottom]
+    w_self = np.array([beam.calc_self_load(s.conc_density) for beam, s in zip(beams, bottom)])
+    EI = np.array([beam.calc_Ec(s.conc_density) * beam.calc_Ig() for beam, s in zip(beams, bottom)])
+
+    # stations, including point load positions
+    span_index, x = [], []
+    for i, length in enumerate(spans):
+        positions = np.linspace(0, length, stations_per_span)
+        positions = np.union1d(positions, [a for a, _ in dead_points[i] + live_points[i]])
+        span_index.append(np.full(len(positions), i))
+        x.append(positions)
+    span_index = np.concatenate(span_index)
+    x = np.concatenate(x)
+
+    # dead load, then live load on one span at a time
+    w_DC = w_dead + w_self
+    end_forces = solve_end_forces(spans, supports, EI, w_DC, dead_points)
+    M_D, V_D = calc_station_actions(spans, end_forces, w_DC, dead_points, span_index, x)
+    M_L = np.zeros((num_spans, len(x)))
+    V_L = np.zeros((num_spans, len(x)))
+    for i in range(num_spans):
+        w = np.where(np.arange(num_spans) == i, w_live, 0.0)
+        points = [live_points[i] if j == i else [] for j in range(num_spans)]
+        end_forces = solve_end_forces(spans, supports, EI, w, points)
+        M_L[i], V_L[i] = calc_station_actions(spans, end_forces, w, points, span_index, x)
+
+    gamma_D, gamma_L = strength_factors
+    service_D, service_L = service_factors
+    M_L_pos, M_L_neg = np.maximum(M_L, 0).sum(axis=0), np.minimum(M_L, 0).sum(axis=0)
+    V_L_pos, V_L_neg = np.maximum(V_L, 0).sum(axis=0), np.minimum(V_L, 0).sum(axis=0)
+    stations = {
+        'span': span_index,
+        'x': x,
+        'M_u_pos': np.maximum(gamma_D * M_D + gamma_L * M_L_pos, 0),
+        'M_u_neg': np.minimum(gamma_D * M_D + gamma_L * M_L_neg, 0),
+        'M_s_pos': np.maximum(service_D * M_D + service_L * M_L_pos, 0),
+        'M_s_neg': np.minimum(service_D * M_D + service_L * M_L_neg, 0),
+        'V_u': np.maximum(np.abs(gamma_D * V_D + gamma_L * V_L_pos), np.abs(gamma_D * V_D + gamma_L * V_L_neg)),
+    }
+
+    # positive face with the bottom section, negative face with the top
+    section_index = np.concatenate([span_sections[span_index, 0], span_sections[span_index, 1]])
+    station_sections = {name: values if np.ndim(values) == 0 else np.asarray(values)[section_index]
+                        for name, values in sections.items()}
+    checks = batch_analysis.check_loads(
+        station_sections,
+        np.concatenate([stations['M_u_pos'], -stations['M_u_neg']]),
+        np.concatenate([stations['M_s_pos'], -stations['M_s_neg']]),
+        np.concatenate([stations['V_u'], stations['V_u']]),
+        phi_m, phi_v)
+    checks['station'] = np.tile(np.arange(len(x)), 2)
+    checks['face'] = np.repeat(np.array(['positive', 'negative']), len(x))
+
+    governing = load_envelope.calc_envelope(checks)
+    for result in governing.values():
+        row = result.pop('case')
+        station = int(checks['station'][row])
+        result.update({'span': int(span_index[station]), 'x': float(x[station]),
+                       'face': str(checks['face'][row])})
+    return {'stations': stations, 'checks': checks, 'governing': governing}
@@ -0,0 +1,161 @@
+import cProfile
+import io
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+TIME_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+class Histogram:
+    """
+    Cumulative histogram with one label, rendered in Prometheus text format.
+    """
+    def __init__(self, name: str, help_text: str, label: str, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_value, series in sorted(self._series.items()):
+                label = f'{self.label}="{label_value}"'
+                for bound, count in zip(self.buckets, series['counts']):
+                    lines.append(f'{self.name}_bucket{{{label},le="{bound:g}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {series["count"]}')
+                lines.append(f"{self.name}_sum{{{label}}} {series['sum']!r}")
+                lines.append(f"{self.name}_count{{{label}}} {series['count']}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+stage_seconds = Histogram('concrete_beam_stage_seconds',
+                          'Wall time of each pipeline stage in seconds.', 'stage', TIME_BUCKETS)
+request_seconds = Histogram('concrete_beam_request_seconds',
+                            'Wall time of each request in seconds.', 'endpoint', TIME_BUCKETS)
+batch_size = Histogram('concrete_beam_batch_size',
+                       'Number of beam cases per batch request.', 'endpoint', SIZE_BUCKETS)
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Records the wall time of the enclosed block under the given stage name.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(stage, time.perf_counter() - start)
+
+def _cache_lines(cache: str, description: str, stats: dict) -> list:
+    prefix = f"concrete_beam_{cache}_cache"
+    return [
+        f"# HELP {prefix}_hits_total {description} cache hits.",
+        f"# TYPE {prefix}_hits_total counter",
+        f"{prefix}_hits_total {stats['hits']}",
+        f"# HELP {prefix}_misses_total {description} cache misses.",
+        f"# TYPE {prefix}_misses_total counter",
+        f"{prefix}_misses_total {stats['misses']}",
+        f"# HELP {prefix}_size Entries held in the {description.lower()} cache.",
+        f"# TYPE {prefix}_size gauge",
+        f"{prefix}_size {stats['size']}",
+        f"# HELP {prefix}_hit_ratio Fraction of {description.lower()} lookups served from cache.",
+        f"# TYPE {prefix}_hit_ratio gauge",
+        f"{prefix}_hit_ratio {stats['hit_rate']!r}",
+    ]
+
+def render_metrics(cache_stats: dict=None, response_cache_stats: dict=None) -> str:
+    """
+    Returns all metrics in Prometheus text exposition format.
+
+    Parameters:
+    - cache_stats: LRUCache.stats() of the section cache, if one is in use.
+    - response_cache_stats: ResponseCache.stats() of the response cache,
+      if one is in use.
+    """
+    lines = stage_seconds.render() + request_seconds.render() + batch_size.render()
+    if cache_stats is not None:
+        lines += _cache_lines('section', 'Section', cache_stats)
+    if response_cache_stats is not None:
+        lines += _cache_lines('response', 'Response', response_cache_stats)
+    return '\n'.join(lines) + '\n'
+
+class SamplingProfiler:
+    """
+    Profiles a random fraction of requests with cProfile and accumulates
+    the statistics. Disabled while sample_rate is 0.
+    """
+    def __init__(self, sample_rate: float=0.0):
+        self.sample_rate = sample_rate
+        self.num_profiled = 0
+        self._stats = None
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+
+    def start(self):
+        """
+        Starts profiling the current request if it is sampled.
+
+        Returns:
+        - Active profiler, or None when the request is not sampled.
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            self._busy.release()
+            return None
+        return profiler
+
+    def stop(self, profiler):
+        try:
+            profiler.disable()
+        finally:
+            self._busy.release()
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profiler)
+            else:
+                self._stats.add(profiler)
+            self.num_profiled += 1
+
+    def report(self, limit: int=30) -> str:
+        """
+        Returns the accumulated statistics sorted by cumulative time.
+        """
+        with self._lock:
+            if self._stats is None:
+                return "No requests profiled.\n"
+            stream = io.StringIO()
+            self._stats.stream = stream
+            self._stats.sort_stats('cumulative').print_stats(limit)
+        return f"Profiled requests: {self.num_profiled}\n" + stream.getvalue()
+
+    def reset(self):
+        with self._lock:
+            self._stats = None
+            self.num_profiled = 0
@@ -0,0 +1,134 @@
+import numpy as np
+
+import rebar_props
+import batch_analysis
+from conc_analysis_classes import ConcreteBeam, calc_beta1
+import design_check_funcs
+
+DEFAULT_BAR_SIZES = ('#3', '#4', '#5', '#6', '#7', '#8', '#9', '#10', '#11')
+DEFAULT_SPACINGS = tuple(np.arange(3, 18.5, 0.5))
+
+CHECK_FIELDS = ('moment_check', 'shear_check', 'min_reinf_check', 'crack_control_check',
+                'ductility_check', 'distr_reinf_check')
+
+def calc_required_steel_area(M_n, width, d, f_c, f_y):
+    """
+    Calculates the steel area giving a nominal moment capacity from the
+    quadratic in the stress block depth.
+
+    Parameters:
+    - M_n: Required nominal moment capacity (k-ft).
+    - width: Beam width (in).
+    - d: Effective depth (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - f_y: Yield strength of steel (ksi).
+
+    Returns:
+    - Steel area (in²), NaN where the section cannot reach M_n.
+    """
+    C = 0.85 * f_c * width
+    discriminant = d ** 2 - 2 * 12 * M_n / C
+    with np.errstate(invalid='ignore'):
+        return np.where(discriminant >= 0, C * (d - np.sqrt(discriminant)) / f_y, np.nan)
+
+def calc_max_steel_area(width, d, f_c, f_y):
+    """
+    Calculates the largest steel area that keeps the section ductile.
+
+    Returns:
+    - Steel area (in²).
+    """
+    epsilon_tl = design_check_funcs.calc_epsilon_tl(f_y)
+    c_max = 0.003 * d / (0.003 + epsilon_tl)
+    return 0.85 * f_c * width * calc_beta1(f_c) * c_max / f_y
+
+def optimize_reinforcement(width, height, cover, f_c, f_y, E_s, conc_density, M_u, M_s, V_u,
+                           phi_m=0.9, phi_v=0.9, bar_sizes=DEFAULT_BAR_SIZES,
+                           spacings=DEFAULT_SPACINGS, tolerance=0.02, full_precision: bool=False) -> list:
+    """
+    Searches bar size and spacing for the lightest passing flexure reinforcement.
+
+    Spacings outside the bounds implied by the monotonic checks are skipped
+    and the remaining candidates are checked together in one batch.
+
+    Parameters:
+    - width, height, cover, f_c, f_y, E_s, conc_density: Section inputs as on the form.
+    - M_u: Factored moment (k-ft).
+    - M_s: Service moment (k-ft).
+    - V_u: Factored shear (kips).
+    - phi_m: Moment resistance factor.
+    - phi_v: Shear resistance factor.
+    - bar_sizes: Bar sizes to consider.
+    - spacings: Candidate bar spacings (in).
+    - tolerance: Relative slack on the pruning bounds to allow for rounding.
+    - full_precision: Check candidates without the intermediate rounding
+      of the scalar classes, so the checks vary smoothly with spacing.
+
+    Returns:
+    - Pareto set of passing layouts (lightest steel weight against widest
+      spacing), as dictionaries sorted by steel weight.
+    """
+    spacings = np.sort(np.asarray(spacings, dtype=float))
+    gamma_3 = design_check_funcs.determine_gamma_3(f_y)
+    A_ts = design_check_funcs.calc_dist_reinf(width, height, f_y, full_precision)
+    candidate_sizes = []
+    candidate_spacings = []
+    for bar_size in bar_sizes:
+        bar = rebar_props.RebarProperties(bar_size)
+        d_c = rebar_props.calc_position(cover, bar.bar_diameter)
+        beam = ConcreteBeam(width, height, d_c, f_c, full_precision)
+        M_design = design_check_funcs.calc_design_M(M_u, beam.calc_Mcr(), gamma_3=gamma_3)
+        # spacing upper bound: moment capacity rises with steel area
+        A_s_min = calc_required_steel_area(M_design / phi_m, width, beam.d, f_c, f_y)
+        if np.isnan(A_s_min):
+            continue
+        s_upper = width * bar.bar_area / A_s_min
+        s_upper = min(s_upper, 12 * bar.bar_area / A_ts)
+        # spacing lower bound: ductility and clear spacing between bars
+        A_s_max = calc_max_steel_area(width, beam.d, f_c, f_y)
+        s_lower = max(width * bar.bar_area / A_s_max,
+                      bar.bar_diameter + max(1.5 * bar.bar_diameter, 1.5))
+        keep = (spacings <= s_upper * (1 + tolerance)) & (spacings >= s_lower * (1 - tolerance))
+        candidate_sizes.extend([bar_size] * int(keep.sum()))
+        candidate_spacings.extend(spacings[keep])
+
+    if not candidate_sizes:
+        return []
+    candidate_sizes = np.array(candidate_sizes)
+    candidate_spacings = np.array(candidate_spacings)
+    results = batch_analysis.check_sections(width, height, cover, candidate_sizes, candidate_spacings,
+                                            f_c, f_y, E_s, conc_density, M_u, M_s, V_u, phi_m, phi_v,
+                                            full_precision=full_precision)
+    passing = np.logical_and.reduce([results[field] for field in CHECK_FIELDS])
+
+    # widest passing spacing is the lightest layout for each bar size
+    best = {}
+    for index in np.flatnonzero(passing):
+        bar_size = str(candidate_sizes[index])
+        if bar_size not in best or candidate_spacings[index] > candidate_spacings[best[bar_size]]:
+            best[bar_size] = index
+
+    layouts = []
+    for bar_size, index in best.items():
+        bar = rebar_props.RebarProperties(bar_size)
+        spacing = float(candidate_spacings[index])
+        num_bars = rebar_props.calc_num_bars(width, spacing)
+        layout = {
+            'bar_size': bar_size,
+            'spacing': spacing,
+            'num_bars': num_bars,
+            'steel_area': num_bars * bar.bar_area,
+            'As_per_ft': rebar_props.calc_As_per_ft(bar.bar_area, spacing),
+            'steel_weight': num_bars * bar.bar_weight,
+        }
+        for field in ('moment_ratio', 'min_reinf_ratio', 'crack_control_ratio',
+                      'ductility_ratio', 'dist_reinf_ratio', 'shear_ratio'):
+            layout[field] = float(results[field][index])
+        layouts.append(layout)
+
+    layouts.sort(key=lambda layout: (layout['steel_weight'], -layout['spacing']))
+    pareto = []
+    for layout in layouts:
+        if not pareto or layout['spacing'] > pareto[-1]['spacing']:
+            pareto.append(layout)
+    return pareto
@@ -1,20 +1,147 @@
-import pandas as pd
+import csv
 import os
+import threading
+from typing import NamedTuple, Optional
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+class BarRecord(NamedTuple):
+    """
+    Immutable record of steel rebar properties.
+    """
+    bar_size: str
+    bar_diameter: float
+    bar_area: float
+    bar_weight: float
+    bar_perimeter: float
+
+class BendRecord(NamedTuple):
+    """
+    Immutable record of standard hook and bend dimensions.
+
+    - D: Finished bend diameter (in).
+    - A: Hook detailing dimension (in).
+    - C: Hook return dimension (in), None where not applicable.
+    """
+    bar_size: str
+    bar_bend: int
+    D: float
+    A: float
+    C: Optional[float]
+
+_catalog = {}
+_catalog_lock = threading.Lock()
+
+def _resolve_path(file_name: str) -> str:
+    if os.path.isabs(file_name):
+        if os.path.exists(file_name):
+            return file_name
+        # earlier releases took paths such as the old default
+        # '/data/props.csv' relative to the working directory
+        legacy_path = os.getcwd() + file_name
+        if os.path.exists(legacy_path):
+            return legacy_path
+        if file_name.startswith('/data/'):
+            return os.path.join(DATA_DIR, file_name[len('/data/'):])
+        return file_name
+    return os.path.join(DATA_DIR, file_name)
+
+def _read_rows(path: str) -> list:
+    with open(path, newline='', encoding='utf-8') as data_file:
+        return list(csv.DictReader(data_file))
+
+def _read_bar_table(path: str) -> dict:
+    table = {}
+    for row in _read_rows(path):
+        table[row['bar_size']] = BarRecord(
+            row['bar_size'],
+            float(row['bar_diameter']),
+            float(row['bar_area']),
+            float(row['bar_weight']),
+            float(row['bar_perimeter'])
+        )
+    return table
+
+def _read_bend_table(path: str) -> dict:
+    table = {}
+    for row in _read_rows(path):
+        C = None if row['C'].strip() == '-' else float(row['C'])
+        table[(row['bar_size'], int(row['bar_bend']))] = BendRecord(
+            row['bar_size'],
+            int(row['bar_bend']),
+            float(row['D']),
+            float(row['A']),
+            C
+        )
+    return table
+
+def _load_table(file_name: str, reader) -> dict:
+    path = _resolve_path(file_name)
+    table = _catalog.get(path)
+    if table is None:
+        with _catalog_lock:
+            table = _catalog.get(path)
+            if table is None:
+                table = reader(path)
+                _catalog[path] = table
+    return table
+
+def get_bar_catalog(data_path: str='props.csv') -> dict:
+    """
+    Returns the rebar property table keyed by bar size.
+
+    The table is read once per process and shared between callers.
+
+    Parameters:
+    - data_path: Properties file, relative to the package data directory.
+      The old default '/data/props.csv' is still accepted.
+    """
+    return _load_table(data_path, _read_bar_table)
+
+def get_bend_table(bend_type: str='main') -> dict:
+    """
+    Returns the standard hook dimensions keyed by (bar size, bend angle).
+
+    Parameters:
+    - bend_type: 'main' for main reinforcement, 'other' for stirrups and ties.
+    """
+    if bend_type not in ('main', 'other'):
+        raise ValueError(f"Bend type '{bend_type}' must be 'main' or 'other'.")
+    return _load_table(f'bends_{bend_type}.csv', _read_bend_table)
+
+def reload_catalog():
+    """
+    Discards all cached tables so the next lookup re-reads the data files.
+    """
+    with _catalog_lock:
+        _catalog.clear()
 
 class RebarProperties:
     """
     Class to retrieve steel rebar properties.
     """
-    def __init__(self, bar_size: str, data_path: str='/data/props.csv'):
+    __slots__ = ('bar_size', 'bar_diameter', 'bar_area', 'bar_weight', 'bar_perimeter', 'data_path')
+
+    def __init__(self, bar_size: str, data_path: str='props.csv'):
         self.bar_size = bar_size
-        bar_props_df = pd.read_csv(os.getcwd() + data_path, dtype=str)
-        self.prop_table = bar_props_df[bar_props_df['bar_size'] == bar_size]
-        if self.prop_table.empty:
+        self.data_path = data_path
+        record = get_bar_catalog(data_path).get(bar_size)
+        if record is None:
             raise ValueError(f"Bar size '{bar_size}' not found in the properties file.")
-        self.bar_diameter = float(self.prop_table['bar_diameter'].values[0])
-        self.bar_area = float(self.prop_table['bar_area'].values[0])
-        self.bar_weight = float(self.prop_table['bar_weight'].values[0])
-        self.bar_perimeter = float(self.prop_table['bar_perimeter'].values[0])
+        self.bar_diameter = record.bar_diameter
+        self.bar_area = record.bar_area
+        self.bar_weight = record.bar_weight
+        self.bar_perimeter = record.bar_perimeter
+
+    @property
+    def prop_table(self):
+        """
+        Row of the properties file for this bar size as a DataFrame of
+        strings. Read from the file on each access; prefer the attributes.
+        """
+        import pandas as pd
+        bar_props_df = pd.read_csv(_resolve_path(self.data_path), dtype=str)
+        return bar_props_df[bar_props_df['bar_size'] == self.bar_size]
 
     def return_props_dict(self):
         """
@@ -27,7 +154,7 @@ class RebarProperties:
             'Bar Perimeter (in)': self.bar_perimeter
         }
 
-    
+
 def calc_position(cover: float, bar_diameter: float, trans_diameter:float=0) -> float:
     """
     Calculates distance from face of concrete to center of rebar (in).
@@ -79,4 +206,4 @@ def calc_As_per_ft(bar_area: float, spacing: float) -> float:
     - spacing: Center-to-center spacing of rebar (in).
     """
     As_per_ft = bar_area / (spacing / 12)
-    return As_per_ft
\ No newline at end of file
+    return As_per_ft
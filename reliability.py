@@ -0,0 +1,190 @@
+import math
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+import batch_analysis
+
+RELIABILITY_CHECKS = ('moment_check', 'shear_check', 'min_reinf_check', 'crack_control_check',
+                      'ductility_check', 'distr_reinf_check')
+DISTRIBUTION_KINDS = ('normal', 'lognormal', 'uniform')
+# inputs that are only physical above zero; their samples are truncated there
+POSITIVE_FIELDS = ('width', 'height', 'cover', 'spacing', 'f_c', 'f_y', 'E_s', 'conc_density',
+                   'phi_m', 'phi_v')
+
+class Distribution(NamedTuple):
+    """
+    Random input described by its mean and standard deviation.
+
+    - kind: 'normal', 'lognormal' or 'uniform'.
+    - mean: Mean value, in the units of the input.
+    - std: Standard deviation, in the units of the input.
+    """
+    kind: str
+    mean: float
+    std: float
+
+    def sample(self, rng: np.random.Generator, size: int, positive: bool=False) -> np.ndarray:
+        """
+        Draws size values.
+
+        Parameters:
+        - rng: Random generator.
+        - size: Number of samples.
+        - positive: Truncate the distribution at zero by redrawing values
+          that are not strictly positive. Lognormal samples always are.
+        """
+        values = self._draw(rng, size)
+        if positive:
+            if self.mean <= 0:
+                raise ValueError(f"Mean of a strictly positive input must be positive, not {self.mean}.")
+            rejected = np.flatnonzero(values <= 0)
+            while rejected.size:
+                values[rejected] = self._draw(rng, rejected.size)
+                rejected = rejected[values[rejected] <= 0]
+        return values
+
+    def _draw(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.kind == 'normal':
+            return rng.normal(self.mean, self.std, size)
+        if self.kind == 'lognormal':
+            sigma = math.sqrt(math.log(1 + (self.std / self.mean) ** 2))
+            return rng.lognormal(math.log(self.mean) - sigma ** 2 / 2, sigma, size)
+        if self.kind == 'uniform':
+            half_width = math.sqrt(3) * self.std
+            return rng.uniform(self.mean - half_width, self.mean + half_width, size)
+        raise ValueError(f"Unknown distribution '{self.kind}'.")
+
+def from_bias(kind: str, nominal: float, bias: float=1.0, cov: float=0.0) -> Distribution:
+    """
+    Builds a Distribution from a nominal value, bias factor and coefficient
+    of variation, as resistance and load statistics are usually published.
+    """
+    mean = nominal * bias
+    return Distribution(kind, mean, abs(mean) * cov)
+
+def calc_beta(p_f: float) -> float:
+    """
+    Calculates the reliability index for a failure probability.
+    """
+    if p_f <= 0:
+        return math.inf
+    if p_f >= 1:
+        return -math.inf
+    return -NormalDist().inv_cdf(p_f)
+
+def _estimate(failures: int, num_samples: int) -> dict:
+    p_f = failures / num_samples
+    return {
+        'failures': failures,
+        'p_f': p_f,
+        'beta': calc_beta(p_f),
+        # coefficient of variation of the estimate, and a 95% upper bound
+        # on p_f when no failures were seen
+        'cov': math.sqrt((1 - p_f) / failures) if failures else math.inf,
+        'p_f_upper': p_f if failures else 3 / num_samples,
+    }
+
+def sample_inputs(inputs: dict, rng: np.random.Generator, size: int) -> dict:
+    """
+    Draws one chunk of beam inputs.
+
+    Parameters:
+    - inputs: Values keyed by the names in INPUT_FIELDS; Distribution
+      values are sampled independently, others are held fixed. Inputs in
+      POSITIVE_FIELDS are sampled from their distribution truncated at zero,
+      so a normal f_c or dimension never gives a non-physical section.
+    - rng: Random generator.
+    - size: Number of samples.
+
+    Returns:
+    - Input columns for batch_analysis.check_sections.
+    """
+    return {field: value.sample(rng, size, field in POSITIVE_FIELDS) if isinstance(value, Distribution)
+            else value for field, value in inputs.items()}
+
+def run_monte_carlo(inputs: dict, max_samples: int=1000000, chunk_size: int=100000, seed: int=0,
+                    target_cov: float=0.05, min_samples: int=10000, converge_on=None,
+                    full_precision: bool=True) -> dict:
+    """
+    Estimates the failure probability and reliability index of each design
+    check by Monte Carlo simulation.
+
+    Samples are drawn and checked in chunks with the vectorized check chain.
+    Each chunk has its own random stream spawned from the seed, so results
+    are reproducible for a given seed and chunk size. Sampling stops early
+    once the estimates named in converge_on reach target_cov; checks
+    without failures report an upper bound instead. Dimensions, strengths
+    and the other POSITIVE_FIELDS are truncated at zero (see sample_inputs)
+    rather than counted as failures; prefer 'lognormal' for them when the
+    coefficient of variation is large.
+
+    Parameters:
+    - inputs: Values keyed by the names in INPUT_FIELDS. Any value may be a
+      Distribution, except bar_size.
+    - max_samples: Largest number of samples to draw.
+    - chunk_size: Number of samples checked at once.
+    - seed: Seed for the random streams.
+    - target_cov: Coefficient of variation of the estimates to stop at.
+    - min_samples: Number of samples drawn before stopping early.
+    - converge_on: Names of the checks, or 'system', that must converge.
+      Defaults to the system estimate and every check with failures.
+    - full_precision: Check samples without the rounding of the scalar
+      classes.
+
+    Returns:
+    - Dictionary with 'num_samples', 'converged', 'system' (failure of any
+      check) and 'checks' (keyed by check name). Each estimate has
+      'failures', 'p_f', 'beta', 'cov' and 'p_f_upper'.
+    """
+    missing = [field for field in batch_analysis.INPUT_FIELDS
+               if field not in inputs and field not in ('phi_m', 'phi_v')]
+    if missing:
+        raise ValueError(f"Missing input fields: {', '.join(missing)}.")
+    if isinstance(inputs['bar_size'], Distribution):
+        raise ValueError("bar_size cannot be sampled.")
+    for name in converge_on or ():
+        if name != 'system' and name not in RELIABILITY_CHECKS:
+            raise ValueError(f"Unknown check '{name}'.")
+    for value in inputs.values():
+        if isinstance(value, Distribution) and value.kind not in DISTRIBUTION_KINDS:
+            raise ValueError(f"Unknown distribution '{value.kind}'.")
+    for field in POSITIVE_FIELDS:
+        value = inputs.get(field)
+        if isinstance(value, Distribution) and value.mean <= 0:
+            raise ValueError(f"Mean of '{field}' must be positive.")
+
+    num_chunks = math.ceil(max_samples / chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(num_chunks)
+    failures = dict.fromkeys(RELIABILITY_CHECKS, 0)
+    system_failures = 0
+    num_samples = 0
+    converged = False
+    for stream in streams:
+        size = min(chunk_size, max_samples - num_samples)
+        columns = sample_inputs(inputs, np.random.default_rng(stream), size)
+        results = batch_analysis.check_sections(**columns, full_precision=full_precision)
+        failed_any = np.zeros(size, dtype=bool)
+        for check in RELIABILITY_CHECKS:
+            failed = ~np.broadcast_to(results[check], (size,))
+            failures[check] += int(failed.sum())
+            failed_any |= failed
+        system_failures += int(failed_any.sum())
+        num_samples += size
+
+        if num_samples >= min_samples:
+            if converge_on is None:
+                counts = [system_failures] + [count for count in failures.values() if count]
+            else:
+                counts = [system_failures if name == 'system' else failures[name] for name in converge_on]
+            if all(_estimate(count, num_samples)['cov'] <= target_cov for count in counts):
+                converged = True
+                break
+
+    return {
+        'num_samples': num_samples,
+        'converged': converged,
+        'system': _estimate(system_failures, num_samples),
+        'checks': {check: _estimate(count, num_samples) for check, count in failures.items()},
+    }
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import batch_analysis
+
+# bump when the pipeline or templates change so stored responses are not reused
+CACHE_VERSION = 1
+FORM_FIELDS = batch_analysis.INPUT_FIELDS + ('precision',)
+FORM_DEFAULTS = {'precision': 'rounded'}
+TEXT_FIELDS = ('bar_size', 'precision')
+
+def canonical_key(form) -> str:
+    """
+    Hashes the normalized form inputs, so submissions that differ only in
+    number formatting or whitespace share a key.
+
+    Parameters:
+    - form: Submitted form fields.
+
+    Returns:
+    - Hex SHA-256 digest, or None when a field is missing or invalid.
+    """
+    values = [CACHE_VERSION]
+    for field in FORM_FIELDS:
+        value = form.get(field, FORM_DEFAULTS.get(field))
+        if value is None:
+            return None
+        if field in TEXT_FIELDS:
+            values.append(str(value).strip())
+            continue
+        try:
+            values.append(float(value) + 0.0)
+        except ValueError:
+            return None
+    return hashlib.sha256(json.dumps(values).encode()).hexdigest()
+
+class MemoryBackend:
+    """
+    In-process store with LRU eviction and a time to live.
+    """
+    def __init__(self, maxsize: int=1024, ttl: float=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            body, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes):
+        with self._lock:
+            self._data[key] = (body, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class SQLiteBackend:
+    """
+    On-disk store in a SQLite file that survives restarts, with LRU
+    eviction and a time to live.
+    """
+    def __init__(self, path: str, maxsize: int=1024, ttl: float=3600):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses ("
+                           "key TEXT PRIMARY KEY, body BLOB, expires REAL, accessed REAL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, body: bytes):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                               (key, body, now + self.ttl, now))
+            self._conn.execute("DELETE FROM responses WHERE expires < ?", (now,))
+            self._conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                               "ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+class ResponseCache:
+    """
+    Rendered responses keyed by canonical_key, with hit and miss counters.
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        body = self.backend.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def set(self, key: str, body: bytes):
+        self.backend.set(key, body)
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Returns hit and miss counters, size and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.backend),
+            'maxsize': self.backend.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+def create_cache(path: str=None, maxsize: int=1024, ttl: float=3600) -> ResponseCache:
+    """
+    Creates a response cache in memory, or in the SQLite file at path.
+    """
+    if path:
+        return ResponseCache(SQLiteBackend(path, maxsize, ttl))
+    return ResponseCache(MemoryBackend(maxsize, ttl))
+
+response_cache = create_cache(os.environ.get('RESPONSE_CACHE_PATH'),
+                              int(os.environ.get('RESPONSE_CACHE_SIZE', 1024)),
+                              float(os.environ.get('RESPONSE_CACHE_TTL', 3600)))
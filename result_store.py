@@ -0,0 +1,198 @@
+import json
+import os
+
+import numpy as np
+
+STORE_VERSION = 1
+STORE_SUFFIX = '.store'
+SCHEMA_FILE = 'schema.json'
+# fixed width of text columns such as bar_size (bytes)
+STRING_WIDTH = 16
+
+def infer_schema(columns, string_width: int=STRING_WIDTH) -> list:
+    """
+    Derives a fixed column schema from the first chunk written.
+
+    Parameters:
+    - columns: DataFrame or mapping of equal length columns.
+    - string_width: Bytes reserved for each text value.
+
+    Returns:
+    - List of (name, dtype string) pairs. Text columns are stored as fixed
+      width bytes, boolean columns as bool and other numeric columns as
+      float64, so a chunk of whole numbers does not fix an integer type for
+      the later chunks.
+    """
+    schema = []
+    for name in columns.keys():
+        if os.sep in name or name == SCHEMA_FILE:
+            raise ValueError(f"Column name '{name}' cannot be stored.")
+        values = np.asarray(columns[name])
+        if values.dtype.kind == 'b':
+            dtype = np.dtype(bool)
+        elif values.dtype.kind in 'iuf':
+            dtype = np.dtype('<f8')
+        elif values.dtype.kind in 'OSU':
+            dtype = np.dtype(f'S{string_width}')
+        else:
+            raise ValueError(f"Column '{name}' of type {values.dtype} cannot be stored.")
+        schema.append((name, dtype.str))
+    return schema
+
+class ResultStore:
+    """
+    Columnar binary store of batch results: a directory holding one raw
+    little-endian file per column and a schema.json with the column types
+    and row count.
+
+    Chunks are appended column by column and the row count is updated
+    last, so readers never see a partly written chunk. Columns are read as
+    read-only memory maps, so a query touches only the columns it uses.
+    """
+    def __init__(self, path: str):
+        """
+        Opens an existing store.
+
+        Parameters:
+        - path: Store directory.
+        """
+        self.path = path
+        with open(os.path.join(path, SCHEMA_FILE)) as schema_file:
+            schema = json.load(schema_file)
+        if schema.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported result store version {schema.get('version')}.")
+        self.schema = {column['name']: np.dtype(column['dtype']) for column in schema['columns']}
+        self.num_rows = schema['num_rows']
+
+    @classmethod
+    def create(cls, path: str, schema: list) -> 'ResultStore':
+        """
+        Creates an empty store.
+
+        Parameters:
+        - path: Store directory, which must not exist or be empty.
+        - schema: List of (name, dtype string) pairs, see infer_schema.
+        """
+        os.makedirs(path, exist_ok=True)
+        if os.listdir(path):
+            raise ValueError(f"Result store directory '{path}' is not empty.")
+        for name, _ in schema:
+            open(os.path.join(path, f'{name}.bin'), 'wb').close()
+        _write_schema(path, schema, 0)
+        return cls(path)
+
+    @property
+    def columns(self) -> tuple:
+        return tuple(self.schema)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(dtype.itemsize for dtype in self.schema.values()) * self.num_rows
+
+    def __len__(self):
+        return self.num_rows
+
+    def __contains__(self, name):
+        return name in self.schema
+
+    def append(self, columns):
+        """
+        Appends a chunk of rows.
+
+        Parameters:
+        - columns: DataFrame or mapping with a column for each name in the
+          schema.
+        """
+        missing = [name for name in self.schema if name not in columns.keys()]
+        if missing:
+            raise ValueError(f"Missing result columns: {', '.join(missing)}.")
+        arrays = {}
+        for name, dtype in self.schema.items():
+            values = np.asarray(columns[name])
+            if dtype.kind == 'S':
+                values = values.astype(str)
+                if values.size and max(len(value.encode()) for value in np.unique(values)) > dtype.itemsize:
+                    raise ValueError(f"Values of column '{name}' exceed {dtype.itemsize} bytes.")
+                values = np.char.encode(values)
+            elif not np.can_cast(values.dtype, dtype, casting='same_kind'):
+                raise ValueError(f"Column '{name}' of type {values.dtype} cannot be stored as {dtype}.")
+            arrays[name] = np.ascontiguousarray(values, dtype=dtype)
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError("Result columns differ in length.")
+        num_rows = lengths.pop() if lengths else 0
+
+        for name, values in arrays.items():
+            with open(self._column_path(name), 'r+b') as column_file:
+                # drop anything past the committed rows left by a failed append
+                column_file.truncate(self.num_rows * values.dtype.itemsize)
+                column_file.seek(0, os.SEEK_END)
+                values.tofile(column_file)
+        self.num_rows += num_rows
+        _write_schema(self.path, [(name, dtype.str) for name, dtype in self.schema.items()], self.num_rows)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a read-only memory map of a column.
+        """
+        dtype = self.schema.get(name)
+        if dtype is None:
+            raise KeyError(name)
+        if self.num_rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._column_path(name), dtype=dtype, mode='r', shape=(self.num_rows,))
+
+    __getitem__ = column
+
+    def select(self, mask=None, columns=None) -> dict:
+        """
+        Reads the rows matching mask.
+
+        Parameters:
+        - mask: Boolean array or row indices, usually built from columns,
+          e.g. store['result_moment_ratio'] > 0.95. Defaults to every row.
+        - columns: Names of the columns to read, every column by default.
+
+        Returns:
+        - Dictionary of arrays. Text columns are decoded to str.
+        """
+        selected = {}
+        for name in columns or self.columns:
+            values = self.column(name)
+            values = np.asarray(values) if mask is None else values[mask]
+            selected[name] = np.char.decode(values) if values.dtype.kind == 'S' else values
+        return selected
+
+    def count(self, mask) -> int:
+        """
+        Returns the number of rows matching a boolean mask.
+        """
+        return int(np.count_nonzero(mask))
+
+    def to_frame(self, mask=None, columns=None):
+        """
+        Reads the rows matching mask into a DataFrame.
+        """
+        import pandas as pd
+        return pd.DataFrame(self.select(mask, columns))
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f'{name}.bin')
+
+def _write_schema(path: str, schema: list, num_rows: int):
+    temp_path = os.path.join(path, SCHEMA_FILE + '.tmp')
+    with open(temp_path, 'w') as schema_file:
+        json.dump({'version': STORE_VERSION, 'num_rows': num_rows,
+                   'columns': [{'name': name, 'dtype': dtype} for name, dtype in schema]},
+                  schema_file, indent=1)
+    os.replace(temp_path, os.path.join(path, SCHEMA_FILE))
+
+def open_store(path: str, schema: list=None) -> ResultStore:
+    """
+    Opens the store at path, creating it with schema when it does not exist.
+    """
+    if os.path.exists(os.path.join(path, SCHEMA_FILE)):
+        return ResultStore(path)
+    if schema is None:
+        raise ValueError(f"No result store at '{path}'.")
+    return ResultStore.create(path, schema)
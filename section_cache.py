@@ -0,0 +1,161 @@
+import os
+import threading
+from collections import OrderedDict
+
+import rebar_props
+from metrics import stage_timer
+from conc_analysis_classes import ConcreteBeam, BeamCapacity, BeamStress
+from conc_analysis_classes import calc_fr
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry and counts
+    hits and misses.
+    """
+    def __init__(self, maxsize: int=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, calling compute() on a miss.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Returns hit and miss counters, size and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+section_cache = LRUCache(int(os.environ.get('SECTION_CACHE_SIZE', 1024)))
+
+def section_key(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                full_precision: bool=False) -> tuple:
+    """
+    Normalizes section inputs into a hashable cache key.
+    """
+    return (str(bar_size).strip(), bool(full_precision)) + tuple(
+        float(value) + 0.0 for value in (width, height, cover, spacing, f_c, f_y, E_s, conc_density))
+
+def _analyze_section(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                     full_precision: bool=False) -> dict:
+    # steel area
+    with stage_timer('rebar_lookup'):
+        rebar = rebar_props.RebarProperties(bar_size)
+        d_c = rebar_props.calc_position(cover, rebar.bar_diameter)
+        steel_area = width / spacing * rebar.bar_area
+    # beam properties
+    with stage_timer('beam_properties'):
+        beam = ConcreteBeam(width, height, d_c, f_c, full_precision)
+        w_DL = beam.calc_self_load(conc_density)
+        M_cr = beam.calc_Mcr()
+        f_r = calc_fr(f_c)
+    # beam capacity
+    with stage_timer('capacity'):
+        capacity_analyzer = BeamCapacity(width, height, d_c, f_c, steel_area, f_y, full_precision)
+        a = capacity_analyzer.calc_comp_block_depth()
+        M_n = capacity_analyzer.calc_moment_capacity()
+        epsilon_st = capacity_analyzer.calc_epsilon_t()
+        d_v = capacity_analyzer.calc_dv()
+        V_c = capacity_analyzer.calc_Vc()
+        V_n = capacity_analyzer.calc_shear_capacity()
+    # beam service stress
+    with stage_timer('stiffness'):
+        stress_analyzer = BeamStress(width, height, d_c, f_c, steel_area, E_s, conc_density, full_precision)
+        k = stress_analyzer.calc_k()
+        j = stress_analyzer.calc_j()
+    return {
+        'bar_area': rebar.bar_area,
+        'bar_diameter': rebar.bar_diameter,
+        'd_c': d_c,
+        'steel_area': steel_area,
+        'As_per_ft': rebar_props.calc_As_per_ft(rebar.bar_area, spacing),
+        'd_s': beam.d,
+        'w_DL': w_DL,
+        'M_cr': M_cr,
+        'f_r': f_r,
+        'I_g': beam.calc_Ig(),
+        'a': a,
+        'M_n': M_n,
+        'epsilon_st': epsilon_st,
+        'd_v': d_v,
+        'V_c': V_c,
+        'V_n': V_n,
+        'k': k,
+        'j': j,
+        'height': height,
+        'width': width,
+        'full_precision': full_precision,
+    }
+
+def calc_service_stresses(section: dict, M_s: float) -> dict:
+    """
+    Calculates the service stresses of an analyzed section from its cached
+    stiffness, rounded as BeamStress rounds them.
+
+    Parameters:
+    - section: Result of analyze_section.
+    - M_s: Service moment (k-ft).
+
+    Returns:
+    - Dictionary of the uncracked tensile stress 'f_ct', steel stress 'f_s'
+      and cracked concrete compressive stress 'f_c' (ksi).
+    """
+    rnd = (lambda value, digits: value) if section['full_precision'] else round
+    b, h, d = section['width'], section['height'], section['d_s']
+    j, k = section['j'], section['k']
+    return {
+        'f_ct': rnd(M_s * 12 * h / 2 / section['I_g'], 2),
+        'f_s': rnd(M_s * 12 / (section['steel_area'] * j * d), 3),
+        'f_c': rnd(2 * M_s * 12 / (j * k * b * d**2), 3),
+    }
+
+def analyze_section(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                    full_precision: bool=False) -> dict:
+    """
+    Returns the load-independent results for a section, computed once per
+    distinct section and served from section_cache afterwards.
+
+    Parameters take the same names and units as the input form.
+    full_precision skips the rounding of the scalar classes.
+
+    Returns:
+    - Dictionary of section results; calc_service_stresses gives the
+      load-dependent stresses from it. Treat as read-only.
+    """
+    key = section_key(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density, full_precision)
+    return section_cache.get_or_compute(
+        key, lambda: _analyze_section(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+                                      full_precision))
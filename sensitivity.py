@@ -0,0 +1,201 @@
+import numpy as np
+
+import batch_analysis
+
+SENSITIVITY_INPUTS = ('width', 'height', 'cover', 'spacing', 'f_c', 'f_y', 'E_s', 'conc_density',
+                      'M_u', 'M_s')
+SENSITIVITY_OUTPUTS = ('a', 'M_n', 'epsilon_t', 'k', 'j', 'f_s', 's_max',
+                       'moment_ratio', 'crack_control_ratio', 'ductility_ratio')
+
+class Dual:
+    """
+    Forward-mode dual number over arrays: a value and its gradient with
+    respect to several inputs, stacked along the first axis of grad.
+    """
+    __slots__ = ('value', 'grad')
+    # make NumPy arrays defer to the reflected operators below
+    __array_ufunc__ = None
+
+    def __init__(self, value, grad=0.0):
+        self.value = np.asarray(value, dtype=float)
+        self.grad = np.asarray(grad, dtype=float)
+
+    @staticmethod
+    def lift(other) -> 'Dual':
+        return other if isinstance(other, Dual) else Dual(other)
+
+    def __add__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value + other.value, self.grad + other.grad)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Dual(-self.value, -self.grad)
+
+    def __sub__(self, other):
+        return self + -Dual.lift(other)
+
+    def __rsub__(self, other):
+        return Dual.lift(other) + -self
+
+    def __mul__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value * other.value, self.grad * other.value + self.value * other.grad)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value / other.value,
+                    (self.grad * other.value - self.value * other.grad) / other.value ** 2)
+
+    def __rtruediv__(self, other):
+        return Dual.lift(other) / self
+
+    def __pow__(self, exponent: float):
+        return Dual(self.value ** exponent, exponent * self.value ** (exponent - 1) * self.grad)
+
+def dual_where(condition, x, y) -> Dual:
+    x, y = Dual.lift(x), Dual.lift(y)
+    return Dual(np.where(condition, x.value, y.value), np.where(condition, x.grad, y.grad))
+
+def dual_minimum(x, y) -> Dual:
+    x, y = Dual.lift(x), Dual.lift(y)
+    return dual_where(x.value <= y.value, x, y)
+
+def dual_maximum(x, y) -> Dual:
+    x, y = Dual.lift(x), Dual.lift(y)
+    return dual_where(x.value >= y.value, x, y)
+
+def calc_closed_forms(width, height, cover, bar_diameter, bar_area, spacing, f_c, f_y, E_s, conc_density,
+                      M_u, M_s, phi_m=0.9, gamma_e=0.75, epsilon_c=0.003) -> dict:
+    """
+    Evaluates the unrounded closed forms of BeamCapacity, BeamStress and
+    design_check_funcs. Inputs may be arrays or Dual numbers, so the same
+    expressions give values and derivatives.
+
+    Returns:
+    - Dictionary keyed by the names in SENSITIVITY_OUTPUTS.
+    """
+    d_c = cover + bar_diameter
+    A_s = width / spacing * bar_area
+    d = height - d_c
+
+    # BeamCapacity
+    a = (A_s * f_y) / (0.85 * f_c * width)
+    M_n = A_s * f_y * (d - a / 2) / 12
+    beta_1 = dual_maximum(dual_minimum(0.85 - (f_c - 4) * 0.05, 0.85), 0.65)
+    c = a / beta_1
+    epsilon_t = epsilon_c * (d - c) / c
+
+    # BeamStress
+    E_c = 33000 * (conc_density / 1000) ** 1.5 * f_c ** 0.5
+    rho_n = A_s / (width * d) * (E_s / E_c)
+    k = -rho_n + (rho_n ** 2 + 2 * rho_n) ** 0.5
+    j = 1 - k / 3
+    f_s = M_s * 12 / (A_s * j * d)
+
+    # design_check_funcs
+    f_r = 0.24 * f_c ** 0.5
+    f_ct = M_s * 12 * (height / 2) / (width * height ** 3 / 12)
+    beta_s = 1 + d_c / (0.7 * (height - d_c))
+    f_ss = dual_minimum(f_s, 0.6 * f_y)
+    cracked = Dual.lift(f_ct).value > 0.8 * Dual.lift(f_r).value
+    s_max = dual_where(cracked, 700 * gamma_e / (beta_s * f_ss) - 2 * d_c, 18.0)
+    f_y_value = Dual.lift(f_y).value
+    epsilon_tl = dual_where(f_y_value <= 75, 0.005, (f_y - 75) / (100 - 75) * epsilon_c + 0.005)
+
+    return {
+        'a': a,
+        'M_n': M_n,
+        'epsilon_t': epsilon_t,
+        'k': k,
+        'j': j,
+        'f_s': f_s,
+        's_max': s_max,
+        'moment_ratio': M_u / (phi_m * M_n),
+        'crack_control_ratio': spacing / s_max,
+        'ductility_ratio': epsilon_tl / epsilon_t,
+    }
+
+def calc_sensitivities(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density, M_u, M_s,
+                       wrt=('f_c', 'cover', 'spacing', 'height'), phi_m=0.9) -> dict:
+    """
+    Calculates analytic derivatives of the section results by forward-mode
+    differentiation of the closed forms, for many beams at once.
+
+    Derivatives are of the unrounded expressions; the piecewise terms
+    (beta_1, f_ss, the cracked branch of s_max, epsilon_tl) use the
+    derivative of the active branch.
+
+    Parameters:
+    - width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density,
+      M_u, M_s: Inputs as on the form, scalars or arrays.
+    - wrt: Names from SENSITIVITY_INPUTS to differentiate with respect to.
+    - phi_m: Moment resistance factor.
+
+    Returns:
+    - Dictionary with 'values' (unrounded value of each output) and
+      'derivatives' (for each output, a dictionary of partial derivatives
+      keyed by input name).
+    """
+    inputs = dict(zip(SENSITIVITY_INPUTS, np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in
+          (width, height, cover, spacing, f_c, f_y, E_s, conc_density, M_u, M_s)))))
+    for name in wrt:
+        if name not in SENSITIVITY_INPUTS:
+            raise ValueError(f"Cannot differentiate with respect to '{name}'.")
+    shape = inputs['width'].shape
+    bars = batch_analysis.lookup_bar_props(np.broadcast_to(np.asarray(bar_size, dtype=str), shape))
+    for index, name in enumerate(wrt):
+        seed = np.zeros((len(wrt),) + shape)
+        seed[index] = 1.0
+        inputs[name] = Dual(inputs[name], seed)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        outputs = calc_closed_forms(bar_diameter=bars['bar_diameter'], bar_area=bars['bar_area'],
+                                    phi_m=phi_m, **inputs)
+    values = {}
+    derivatives = {}
+    for name, output in outputs.items():
+        output = Dual.lift(output)
+        values[name] = np.broadcast_to(output.value, shape)
+        grad = np.broadcast_to(output.grad, (len(wrt),) + shape)
+        derivatives[name] = {param: grad[index] for index, param in enumerate(wrt)}
+    return {'values': values, 'derivatives': derivatives}
+
+def sweep(inputs: dict, grid: dict, derivatives: bool=False) -> dict:
+    """
+    Runs the design check chain over a grid of parameter values.
+
+    Parameters:
+    - inputs: Base inputs keyed by the names in INPUT_FIELDS.
+    - grid: Values to sweep keyed by input name. Several parameters form a
+      full grid, one axis per parameter in the given order.
+    - derivatives: Also return calc_sensitivities with respect to the swept
+      parameters at every grid point.
+
+    Returns:
+    - Dictionary with 'grid' (the swept values broadcast to the grid
+      shape), 'results' (batch_analysis.check_sections arrays with the
+      grid shape) and, if requested, 'sensitivities'.
+    """
+    missing = [field for field in batch_analysis.INPUT_FIELDS
+               if field not in inputs and field not in grid and field not in ('phi_m', 'phi_v')]
+    if missing:
+        raise ValueError(f"Missing input fields: {', '.join(missing)}.")
+    axes = np.meshgrid(*(np.asarray(values) for values in grid.values()), indexing='ij')
+    points = dict(zip(grid, axes))
+    columns = {field: points.get(field, inputs.get(field)) for field in batch_analysis.INPUT_FIELDS
+               if field in points or field in inputs}
+    shape = axes[0].shape
+    results = {name: np.broadcast_to(value, shape)
+               for name, value in batch_analysis.check_sections(**columns).items()}
+    swept = {'grid': points, 'results': results}
+    if derivatives:
+        swept['sensitivities'] = calc_sensitivities(
+            **{field: columns[field] for field in batch_analysis.INPUT_FIELDS if field not in
+               ('V_u', 'phi_m', 'phi_v')},
+            wrt=tuple(grid), phi_m=columns.get('phi_m', 0.9))
+    return swept
@@ -0,0 +1,185 @@
+import numpy as np
+
+import batch_analysis
+
+INERTIA_METHODS = ('branson', 'bischoff', 'gross')
+# deflection coefficient of a simple span under uniform load, Δ = K·M·L²/(E_c·I)
+K_SIMPLE_UNIFORM = 5 / 48
+
+def calc_cracked_inertia(width, d, k, n, steel_area):
+    """
+    Calculates the cracked moment of inertia of a singly reinforced
+    section, I_cr = b·(kd)³/3 + n·A_s·(d - kd)².
+
+    Parameters:
+    - width: Beam width (in).
+    - d: Effective depth (in).
+    - k: Compressive depth factor.
+    - n: Modular ratio.
+    - steel_area: Area of steel reinforcement (in²).
+
+    Returns:
+    - Cracked moment of inertia, I_cr (in⁴).
+    """
+    kd = k * d
+    return width * kd ** 3 / 3 + n * steel_area * (d - kd) ** 2
+
+def calc_branson_inertia(M_a, M_cr, I_g, I_cr):
+    """
+    Calculates the effective moment of inertia by Branson's equation,
+    I_e = (M_cr/M_a)³·I_g + (1 - (M_cr/M_a)³)·I_cr, not more than I_g.
+
+    Parameters:
+    - M_a: Service moment at the stage deflection is computed (k-ft).
+    - M_cr: Cracking moment (k-ft).
+    - I_g: Gross moment of inertia (in⁴).
+    - I_cr: Cracked moment of inertia (in⁴).
+
+    Returns:
+    - Effective moment of inertia, I_e (in⁴).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.minimum(np.abs(M_cr / np.asarray(M_a, dtype=float)), 1.0) ** 3
+    return np.minimum(ratio * I_g + (1 - ratio) * I_cr, I_g)
+
+def calc_bischoff_inertia(M_a, M_cr, I_g, I_cr, cracking_factor=1.0):
+    """
+    Calculates the effective moment of inertia by Bischoff's equation,
+    I_e = I_cr / (1 - (1 - I_cr/I_g)·(M_cr/M_a)²), not more than I_g.
+
+    Parameters:
+    - M_a, M_cr, I_g, I_cr: As for calc_branson_inertia.
+    - cracking_factor: Reduction of M_cr for restraint and shrinkage,
+      e.g. 2/3 as in ACI 318-19.
+
+    Returns:
+    - Effective moment of inertia, I_e (in⁴).
+    """
+    M_cr = cracking_factor * np.asarray(M_cr, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.minimum(np.abs(M_cr / np.asarray(M_a, dtype=float)), 1.0) ** 2
+        return np.minimum(I_cr / (1 - (1 - I_cr / I_g) * ratio), I_g)
+
+def calc_immediate_deflection(M_a, span, E_c, I_e, K=K_SIMPLE_UNIFORM):
+    """
+    Calculates the immediate deflection, Δ = K·M_a·L²/(E_c·I_e).
+
+    Parameters:
+    - M_a: Service moment (k-ft).
+    - span: Span length (ft).
+    - E_c: Elastic modulus of concrete (ksi).
+    - I_e: Effective moment of inertia (in⁴).
+    - K: Deflection coefficient for the support and load arrangement.
+
+    Returns:
+    - Deflection (in).
+    """
+    return K * np.asarray(M_a) * 12 * (np.asarray(span) * 12) ** 2 / (E_c * I_e)
+
+def calc_long_term_factor(steel_area, compression_steel_area=0.0, gross: bool=False):
+    """
+    Calculates the AASHTO multiplier of the immediate deflection for the
+    long-term deflection: 4.0 when the immediate deflection uses I_g,
+    otherwise 3.0 - 1.2·(A's/A_s), not less than 1.6.
+
+    Parameters:
+    - steel_area: Area of tension reinforcement, A_s (in²).
+    - compression_steel_area: Area of compression reinforcement, A's (in²).
+    - gross: Immediate deflection is based on the gross inertia.
+    """
+    factor = np.maximum(3.0 - 1.2 * np.asarray(compression_steel_area) / steel_area, 1.6)
+    return np.where(gross, 4.0, factor)
+
+def calc_deflections(section: dict, M_a, span, M_sustained=None, K=K_SIMPLE_UNIFORM,
+                     method: str='branson', compression_steel_area=0.0, cracking_factor=1.0,
+                     load_axis: bool=False) -> dict:
+    """
+    Calculates cracked and effective inertia and immediate and long-term
+    deflections of many sections.
+
+    The effective inertia is found at M_a and used for both the immediate
+    deflection and that under the sustained moment. The long-term
+    deflection is the sustained deflection times calc_long_term_factor;
+    the total adds the non-sustained part of the immediate deflection.
+
+    Parameters:
+    - section: Result of batch_analysis.prepare_sections.
+    - M_a: Maximum service moment (k-ft).
+    - span: Span length (ft).
+    - M_sustained: Sustained service moment (k-ft), M_a by default.
+    - K: Deflection coefficient, K_SIMPLE_UNIFORM by default.
+    - method: One of INERTIA_METHODS.
+    - compression_steel_area: Area of compression reinforcement (in²).
+    - cracking_factor: Reduction of M_cr in Bischoff's equation.
+    - load_axis: M_a and M_sustained are 1-D arrays of load levels applied
+      to every section; results gain a trailing axis of load levels.
+
+    Returns:
+    - Dictionary of 'I_cr', 'I_e' (in⁴), 'immediate', 'sustained',
+      'long_term' and 'total' deflection (in) and the 'long_term_factor'.
+    """
+    if method not in INERTIA_METHODS:
+        raise ValueError(f"Unknown inertia method '{method}'.")
+    names = ('d', 'k', 'n', 'width', 'steel_area', 'M_cr', 'I_g', 'E_c')
+    d, k, n, width, steel_area, M_cr, I_g, E_c = (np.asarray(section[name], dtype=float) for name in names)
+    span = np.asarray(span, dtype=float)
+    compression_steel_area = np.asarray(compression_steel_area, dtype=float)
+    M_a = np.asarray(M_a, dtype=float)
+    M_sustained = M_a if M_sustained is None else np.asarray(M_sustained, dtype=float)
+    if load_axis:
+        if M_a.ndim != 1 or M_sustained.ndim != 1:
+            raise ValueError("Load levels must be 1-D arrays.")
+        d, k, n, width, steel_area, M_cr, I_g, E_c, span, compression_steel_area = (
+            value[..., np.newaxis] for value in
+            np.broadcast_arrays(d, k, n, width, steel_area, M_cr, I_g, E_c, span, compression_steel_area))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        I_cr = calc_cracked_inertia(width, d, k, n, steel_area)
+        if method == 'branson':
+            I_e = calc_branson_inertia(M_a, M_cr, I_g, I_cr)
+        elif method == 'bischoff':
+            I_e = calc_bischoff_inertia(M_a, M_cr, I_g, I_cr, cracking_factor)
+        else:
+            I_e = np.broadcast_to(I_g, np.broadcast(I_g, M_a).shape)
+        immediate = calc_immediate_deflection(M_a, span, E_c, I_e, K)
+        sustained = calc_immediate_deflection(M_sustained, span, E_c, I_e, K)
+        long_term_factor = calc_long_term_factor(steel_area, compression_steel_area, method == 'gross')
+        long_term = long_term_factor * sustained
+    return {
+        'I_cr': np.broadcast_to(I_cr, I_e.shape),
+        'I_e': I_e,
+        'immediate': immediate,
+        'sustained': sustained,
+        'long_term': long_term,
+        'total': long_term + immediate - sustained,
+        'long_term_factor': long_term_factor,
+    }
+
+def check_deflections(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density, M_a, span,
+                      M_sustained=None, limit_ratio=800, load_axis: bool=False,
+                      full_precision: bool=False, **options) -> dict:
+    """
+    Screens many sections against a span/limit_ratio deflection limit.
+
+    Section parameters take the same names and units as the input form.
+
+    Parameters:
+    - M_a, M_sustained, span, load_axis: See calc_deflections.
+    - limit_ratio: Allowable deflection is span / limit_ratio.
+    - full_precision: Skip the rounding of the scalar classes.
+    - options: Further arguments for calc_deflections.
+
+    Returns:
+    - calc_deflections results with the 'allowable' deflection (in) and
+      'deflection_check' and 'deflection_ratio' for the immediate
+      deflection.
+    """
+    section = batch_analysis.prepare_sections(width, height, cover, bar_size, spacing, f_c, f_y, E_s,
+                                              conc_density, full_precision)
+    results = calc_deflections(section, M_a, span, M_sustained, load_axis=load_axis, **options)
+    span = np.asarray(span, dtype=float)
+    allowable = (span[..., np.newaxis] if load_axis else span) * 12 / limit_ratio
+    results['allowable'] = allowable
+    results['deflection_check'] = results['immediate'] <= allowable
+    results['deflection_ratio'] = results['immediate'] / allowable
+    return results
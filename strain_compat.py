@@ -0,0 +1,233 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from conc_analysis_classes import ConcreteBeam, calc_beta1
+
+class SteelLayer(NamedTuple):
+    """
+    Layer of reinforcing steel.
+
+    - depth: Compression face to center of the layer (in).
+    - area: Steel area of the layer (in²).
+    """
+    depth: float
+    area: float
+
+def solve_bracketed_newton(func, lower: float, upper: float, x0: float=None,
+                           xtol: float=1e-10, ftol: float=1e-9, max_iter: int=100):
+    """
+    Finds a root of an increasing function with Newton steps kept inside a
+    bracket, falling back to bisection when a step leaves the bracket.
+
+    Parameters:
+    - func: Callable returning (value, derivative) at x.
+    - lower, upper: Bracket with func(lower) <= 0 <= func(upper).
+    - x0: Starting point, e.g. the root from the previous step.
+    - xtol: Bracket width at which to stop.
+    - ftol: Residual at which to stop.
+
+    Returns:
+    - Root and number of iterations.
+    """
+    x = 0.5 * (lower + upper) if x0 is None or not lower < x0 < upper else x0
+    for iteration in range(1, max_iter + 1):
+        value, derivative = func(x)
+        if abs(value) <= ftol:
+            return x, iteration
+        if value < 0:
+            lower = x
+        else:
+            upper = x
+        if upper - lower <= xtol:
+            return 0.5 * (lower + upper), iteration
+        step = x - value / derivative if derivative > 0 else np.nan
+        x = step if lower < step < upper else 0.5 * (lower + upper)
+    return x, max_iter
+
+class FiberSection:
+    def __init__(self, width: float, height: float, f_c: float, layers, f_y: float,
+                 E_s: float=29000, conc_density: float=150, num_fibers: int=100,
+                 epsilon_cu: float=0.003):
+        """
+        Rectangular section discretized into concrete fibers with any number
+        of steel layers, for strain compatibility analysis.
+
+        Concrete follows the Hognestad curve in compression and carries no
+        tension. Steel is elastic-perfectly plastic. Strains and forces are
+        positive in compression.
+
+        Parameters:
+        - width: Beam width (in).
+        - height: Beam height (in).
+        - f_c: Compressive strength of concrete (ksi).
+        - layers: SteelLayer (or (depth, area)) for each layer of bars.
+        - f_y: Yield strength of steel (ksi).
+        - E_s: Elastic modulus of steel (ksi).
+        - conc_density: Concrete density (pcf).
+        - num_fibers: Number of concrete fibers over the height.
+        - epsilon_cu: Concrete crushing strain.
+        """
+        self.b = width
+        self.h = height
+        self.f_c = f_c
+        self.f_y = f_y
+        self.E_s = E_s
+        self.epsilon_cu = epsilon_cu
+        self.E_c = ConcreteBeam(width, height, 0, f_c).calc_Ec(conc_density)
+        self.f_cc = 0.85 * f_c
+        self.epsilon_0 = 2 * self.f_cc / self.E_c
+        fiber_depth = height / num_fibers
+        self.fiber_y = (np.arange(num_fibers) + 0.5) * fiber_depth
+        self.fiber_area = width * fiber_depth
+        layers = [SteelLayer(*layer) for layer in layers]
+        self.layer_depth = np.array([layer.depth for layer in layers], dtype=float)
+        self.layer_area = np.array([layer.area for layer in layers], dtype=float)
+
+    def concrete_stress(self, strain):
+        """
+        Returns concrete stress and tangent modulus (ksi) at the given strains.
+        """
+        eps_0 = self.epsilon_0
+        falling_slope = -0.15 * self.f_cc / (self.epsilon_cu - eps_0)
+        rising = (strain > 0) & (strain <= eps_0)
+        falling = (strain > eps_0) & (strain <= self.epsilon_cu)
+        ratio = strain / eps_0
+        stress = np.where(rising, self.f_cc * (2 * ratio - ratio ** 2),
+                          np.where(falling, self.f_cc + falling_slope * (strain - eps_0), 0.0))
+        tangent = np.where(rising, self.f_cc * (2 - 2 * ratio) / eps_0,
+                           np.where(falling, falling_slope, 0.0))
+        return stress, tangent
+
+    def steel_stress(self, strain):
+        """
+        Returns steel stress and tangent modulus (ksi) at the given strains.
+        """
+        epsilon_y = self.f_y / self.E_s
+        stress = np.clip(self.E_s * strain, -self.f_y, self.f_y)
+        tangent = np.where(np.abs(strain) < epsilon_y, self.E_s, 0.0)
+        return stress, tangent
+
+    def _fiber_response(self, c, epsilon_top):
+        # strains from a linear profile with zero strain at depth c
+        fiber_strain = epsilon_top * (1 - self.fiber_y / c)
+        layer_strain = epsilon_top * (1 - self.layer_depth / c)
+        conc_stress, conc_tangent = self.concrete_stress(fiber_strain)
+        steel_stress, steel_tangent = self.steel_stress(layer_strain)
+        displaced, displaced_tangent = self.concrete_stress(layer_strain)
+        # net forces and their derivatives with respect to c
+        conc_force = conc_stress * self.fiber_area
+        steel_force = (steel_stress - displaced) * self.layer_area
+        conc_slope = conc_tangent * epsilon_top * self.fiber_y / c ** 2 * self.fiber_area
+        steel_slope = ((steel_tangent - displaced_tangent) * epsilon_top * self.layer_depth / c ** 2
+                       * self.layer_area)
+        return conc_force, steel_force, conc_slope.sum() + steel_slope.sum(), layer_strain
+
+    def _bracket(self, residual):
+        lower = 1e-9 * self.h
+        upper = self.h
+        while residual(upper)[0] < 0:
+            upper *= 2
+            if upper > 1e6 * self.h:
+                raise ValueError("Could not bracket the neutral axis.")
+        return lower, upper
+
+    def solve_neutral_axis(self, epsilon_top: float, c0: float=None):
+        """
+        Solves for the neutral axis depth giving zero axial force.
+
+        Parameters:
+        - epsilon_top: Strain at the compression face.
+        - c0: Starting guess for the neutral axis depth (in).
+
+        Returns:
+        - Neutral axis depth (in) and number of solver iterations.
+        """
+        def residual(c):
+            conc_force, steel_force, slope, _ = self._fiber_response(c, epsilon_top)
+            return conc_force.sum() + steel_force.sum(), slope
+
+        lower, upper = self._bracket(residual)
+        return solve_bracketed_newton(residual, lower, upper, c0, xtol=1e-10 * self.h)
+
+    def section_moment(self, c: float, epsilon_top: float) -> float:
+        """
+        Returns the moment (k-ft) about mid-height for a strain profile.
+        """
+        conc_force, steel_force, _, _ = self._fiber_response(c, epsilon_top)
+        lever_arm = self.h / 2
+        return ((conc_force * (lever_arm - self.fiber_y)).sum()
+                + (steel_force * (lever_arm - self.layer_depth)).sum()) / 12
+
+    def moment_curvature(self, num_steps: int=60) -> dict:
+        """
+        Traces the moment-curvature curve by stepping the compression face
+        strain up to crushing, warm starting each solve from the previous
+        neutral axis.
+
+        Returns:
+        - Dictionary of arrays: curvature (1/in), moment (k-ft), c (in),
+          epsilon_top, steel_strain (per step and layer) and iterations.
+        """
+        epsilon_top = np.linspace(self.epsilon_cu / num_steps, self.epsilon_cu, num_steps)
+        c = np.empty(num_steps)
+        moment = np.empty(num_steps)
+        iterations = np.empty(num_steps, dtype=int)
+        steel_strain = np.empty((num_steps, len(self.layer_depth)))
+        c_prev = None
+        for step, eps_top in enumerate(epsilon_top):
+            c[step], iterations[step] = self.solve_neutral_axis(eps_top, c_prev)
+            c_prev = c[step]
+            moment[step] = self.section_moment(c[step], eps_top)
+            steel_strain[step] = eps_top * (1 - self.layer_depth / c[step])
+        return {
+            'curvature': epsilon_top / c,
+            'moment': moment,
+            'c': c,
+            'epsilon_top': epsilon_top,
+            'steel_strain': steel_strain,
+            'iterations': iterations
+        }
+
+    def nominal_capacity(self) -> dict:
+        """
+        Calculates nominal moment capacity at the crushing strain using the
+        rectangular stress block, with every steel layer at its compatible
+        strain (yielded or not).
+
+        Returns:
+        - Dictionary of c (in), a (in), M_n (k-ft), steel_strain,
+          steel_stress (ksi) and epsilon_t (strain of the extreme tension layer).
+        """
+        beta_1 = calc_beta1(self.f_c)
+        block_stress = 0.85 * self.f_c
+        epsilon_cu = self.epsilon_cu
+
+        def forces(c):
+            a = min(beta_1 * c, self.h)
+            layer_strain = epsilon_cu * (1 - self.layer_depth / c)
+            steel_stress, steel_tangent = self.steel_stress(layer_strain)
+            in_block = self.layer_depth < a
+            steel_force = (steel_stress - np.where(in_block, block_stress, 0.0)) * self.layer_area
+            slope = ((steel_tangent * epsilon_cu * self.layer_depth / c ** 2) * self.layer_area).sum()
+            if beta_1 * c < self.h:
+                slope += block_stress * self.b * beta_1
+            return a, block_stress * self.b * a, steel_force, slope, layer_strain, steel_stress
+
+        def residual(c):
+            _, conc_force, steel_force, slope, _, _ = forces(c)
+            return conc_force + steel_force.sum(), slope
+
+        lower, upper = self._bracket(residual)
+        c, _ = solve_bracketed_newton(residual, lower, upper, xtol=1e-12 * self.h)
+        a, conc_force, steel_force, _, layer_strain, steel_stress = forces(c)
+        M_n = (conc_force * (self.h / 2 - a / 2)
+               + (steel_force * (self.h / 2 - self.layer_depth)).sum()) / 12
+        return {
+            'c': c,
+            'a': a,
+            'M_n': M_n,
+            'steel_strain': layer_strain,
+            'steel_stress': steel_stress,
+            'epsilon_t': -layer_strain[np.argmax(self.layer_depth)]
+        }
@@ -0,0 +1,41 @@
+import pytest
+
+import app as beam_app
+
+CASE = {'width': 12, 'height': 24, 'cover': 2, 'bar_size': '#6', 'spacing': 6, 'f_c': 4.3, 'f_y': 60,
+        'E_s': 29000, 'conc_density': 150, 'M_u': 80, 'M_s': 50, 'V_u': 10}
+
+@pytest.fixture
+def client():
+    return beam_app.app.test_client()
+
+def test_precision_top_level_and_per_case(client):
+    rounded = client.post('/api/v1/check', json=[CASE]).get_json()[0]
+    full = client.post('/api/v1/check', json={'precision': 'full', 'cases': [CASE]}).get_json()[0]
+    assert full['moment_capacity'] != rounded['moment_capacity']
+    assert full['moment_capacity'] == pytest.approx(rounded['moment_capacity'], abs=0.05)
+    mixed = client.post('/api/v1/check', json={'precision': 'full',
+                                               'cases': [dict(CASE, precision='rounded'), CASE]}).get_json()
+    assert mixed == [rounded, full]
+
+def test_unknown_precision_is_rejected(client):
+    response = client.post('/api/v1/check', json=[dict(CASE, precision='exact')])
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('field, value', [('spacing', 0), ('width', -12), ('height', 0), ('cover', -1),
+                                          ('f_c', 'x'), ('spacing', None)])
+def test_invalid_case_is_rejected(client, field, value):
+    response = client.post('/api/v1/check', json=[CASE, dict(CASE, **{field: value})])
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith(f"Case 1: '{field}'")
+
+def test_case_must_be_object(client):
+    response = client.post('/api/v1/check', json=[CASE, 'x'])
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Case 1 must be an object of input fields."
+
+def test_missing_field_is_rejected(client):
+    case = dict(CASE)
+    del case['M_s']
+    response = client.post('/api/v1/check', json=[case])
+    assert response.get_json()['error'] == "Case 0: missing input field 'M_s'."
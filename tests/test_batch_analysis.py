@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+
+import batch_analysis
+import design_check_funcs
+import rebar_props
+from conc_analysis_classes import ConcreteBeam, BeamCapacity, BeamStress, calc_fr
+
+def _scalar_chain(width, height, cover, bar_size, spacing, f_c, f_y, E_s, conc_density, M_u, M_s, V_u,
+                  phi_m=0.9, phi_v=0.9) -> dict:
+    # the /process chain of the scalar classes
+    rebar = rebar_props.RebarProperties(bar_size)
+    d_c = rebar_props.calc_position(cover, rebar.bar_diameter)
+    steel_area = width / spacing * rebar.bar_area
+    As_per_ft = rebar_props.calc_As_per_ft(rebar.bar_area, spacing)
+    beam = ConcreteBeam(width, height, d_c, f_c)
+    M_cr = beam.calc_Mcr()
+    capacity = BeamCapacity(width, height, d_c, f_c, steel_area, f_y)
+    M_n = capacity.calc_moment_capacity()
+    epsilon_st = capacity.calc_epsilon_t()
+    V_n = capacity.calc_shear_capacity()
+    stress = BeamStress(width, height, d_c, f_c, steel_area, E_s, conc_density)
+    f_ct = stress.calc_uncracked_stress(M_s)
+    f_s = stress.calc_steel_stress(M_s)
+    M_design = design_check_funcs.calc_design_M(M_u, M_cr, gamma_3=design_check_funcs.determine_gamma_3(f_y))
+    s_max = design_check_funcs.calc_design_spacing(calc_fr(f_c), f_ct, f_s, f_y, height, d_c)
+    A_ts = design_check_funcs.calc_dist_reinf(width, height, f_y)
+    return {
+        'd_s': beam.d,
+        'w_DL': beam.calc_self_load(conc_density),
+        'M_cr': M_cr,
+        'a': capacity.calc_comp_block_depth(),
+        'moment_capacity': phi_m * M_n,
+        'epsilon_st': epsilon_st,
+        'd_v': capacity.calc_dv(),
+        'shear_capacity': phi_v * V_n,
+        'f_s': f_s,
+        'f_c': f_ct if M_u / M_cr < 1 else stress.calc_conc_stress(M_s),
+        'A_ts': A_ts,
+        'moment_check': design_check_funcs.check_capacity(M_n, M_u, phi_m) >= 1,
+        'shear_check': design_check_funcs.check_capacity(V_n, V_u, phi_v) >= 1,
+        'min_reinf_check': design_check_funcs.check_capacity(M_n, M_design, phi_m) >= 1,
+        'crack_control_check': spacing <= s_max,
+        'ductility_check': epsilon_st > design_check_funcs.calc_epsilon_tl(f_y),
+        'distr_reinf_check': As_per_ft / A_ts >= 1,
+        'gamma_er': design_check_funcs.calc_excess_reinf(M_design, phi_m * M_n),
+        'moment_ratio': design_check_funcs.calc_demand_ratio(M_u, M_n, phi_m),
+        'shear_ratio': design_check_funcs.calc_demand_ratio(V_u, V_n, phi_v),
+        'min_reinf_ratio': design_check_funcs.calc_demand_ratio(M_design, M_n, phi_m),
+        'crack_control_ratio': spacing / s_max,
+    }
+
+def _random_cases(seed: int, num_cases: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        'width': rng.choice(np.arange(6, 49, 0.5), num_cases),
+        'height': rng.choice(np.arange(8, 61, 0.5), num_cases),
+        'cover': rng.choice([1.5, 2, 2.5, 3], num_cases),
+        'bar_size': rng.choice(['#3', '#4', '#5', '#6', '#7', '#8', '#9', '#10', '#11'], num_cases),
+        'spacing': rng.choice(np.arange(3, 19, 0.5), num_cases),
+        'f_c': rng.choice([3, 3.5, 4, 4.5, 5, 6, 8], num_cases),
+        'f_y': rng.choice([60, 75, 80], num_cases),
+        'E_s': np.full(num_cases, 29000.0),
+        'conc_density': rng.choice([115, 140, 145, 150], num_cases),
+        'M_u': rng.uniform(5, 400, num_cases).round(1),
+        'M_s': rng.uniform(3, 250, num_cases).round(1),
+        'V_u': rng.uniform(2, 60, num_cases).round(1),
+    }
+
+def test_round_array_matches_round():
+    values = [0.765, 2.675, -0.765, 0.125, 1.005, 12.345, 0.5, 1e-9]
+    for decimals in (0, 1, 2, 3):
+        assert batch_analysis.round_array(values, decimals).tolist() == [round(value, decimals) for value in values]
+    assert math.isnan(batch_analysis.round_array(math.nan, 2))
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_check_sections_matches_scalar_chain(seed):
+    cases = _random_cases(seed, 1000)
+    results = batch_analysis.check_sections(**cases)
+    for index in range(1000):
+        case = {field: str(values[index]) if field == 'bar_size' else float(values[index])
+                for field, values in cases.items()}
+        for field, expected in _scalar_chain(**case).items():
+            assert results[field][index] == expected, (index, field)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from beam_section import BeamSection, BeamSectionArray
+
+SECTIONS = [BeamSection(12, 24, 2.5, 4, 1.2, 60), BeamSection(18, 36, 3.0, 5, 3.0, 75),
+            BeamSection(10, 20, 2.0, 8, 0.8, 80)]
+
+def test_array_matches_scalar_classes():
+    sections = BeamSectionArray.from_records(SECTIONS)
+    for index, section in enumerate(SECTIONS):
+        for name, value in section.results().items():
+            assert getattr(sections, name)[index] == pytest.approx(value), name
+        stress = section.stress_analyzer()
+        assert sections.uncracked_stress(40)[index] == stress.calc_uncracked_stress(40)
+        assert sections.steel_stress(40)[index] == stress.calc_steel_stress(40)
+        assert sections.conc_stress(40)[index] == stress.calc_conc_stress(40)
+
+def test_full_precision_skips_rounding():
+    rounded = BeamSectionArray.from_records(SECTIONS)
+    exact = BeamSectionArray.from_records(SECTIONS, full_precision=True)
+    np.testing.assert_allclose(exact.M_n, rounded.M_n, atol=0.05)
+    assert not np.array_equal(exact.M_n, np.round(exact.M_n, 1))
+
+def test_scalar_inputs_give_one_section():
+    sections = BeamSectionArray(12, 24, 2.5, 4, 1.2, 60)
+    assert len(sections) == 1
+    assert sections[0] == SECTIONS[0]
+    assert list(sections) == [SECTIONS[0]]
+    assert sections.M_n.shape == (1,)
+    assert sections.M_n[0] == SECTIONS[0].results()['M_n']
+
+def test_columns_are_copied():
+    width = np.full(3, 12.0)
+    sections = BeamSectionArray(width, 24, 2.5, 4, 1.2, 60)
+    M_n = sections.M_n.copy()
+    width[:] = 48.0
+    np.testing.assert_array_equal(sections.width, 12.0)
+    np.testing.assert_array_equal(sections.M_n, M_n)
+    with pytest.raises(ValueError):
+        sections.width[0] = 48.0
+
+def test_nbytes_counts_columns_and_cache():
+    num_sections = 1000
+    sections = BeamSectionArray(np.full(num_sections, 12.0), np.full(num_sections, 24.0), 2.5, 4,
+                                np.full(num_sections, 1.2), 60)
+    # three array columns and five broadcast scalars stored once
+    assert sections.nbytes == 3 * num_sections * 8 + 5 * 8
+    sections.M_n
+    assert sections.nbytes == (3 + len(sections._cache)) * num_sections * 8 + 5 * 8
+    sections.clear_cache()
+    assert sections.nbytes == 3 * num_sections * 8 + 5 * 8
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import batch_analysis
+import design_charts
+
+@pytest.fixture(scope='module')
+def chart(tmp_path_factory):
+    # the default grid of the command line tool
+    return design_charts.generate_charts(
+        str(tmp_path_factory.mktemp('chart')), np.linspace(6, 48, 169),
+        [3, 3.5, 4, 4.5, 5, 5.5, 6, 7, 8, 9, 10], np.linspace(0.1, 3.0, 117),
+        [40, 50, 60, 70, 75, 80, 90, 100])
+
+def test_stored_error_bounds(chart):
+    bounds = design_charts.DesignChart(chart.path).error_bounds
+    assert bounds['M_n']['p99_rel_error'] <= 0.006
+    assert bounds['f_s']['p99_rel_error'] <= 0.0003
+    assert bounds['s_max']['p99_rel_error'] <= 0.0003
+
+def test_error_bounds_hold_at_new_points(chart):
+    bounds = chart.check_error_bounds(num_samples=1000, seed=11)
+    assert bounds['M_n']['p99_rel_error'] <= 0.006
+    assert bounds['f_s']['p99_rel_error'] <= 0.0003
+    assert bounds['s_max']['p99_rel_error'] <= 0.0003
+
+def test_lookup_is_exact_at_grid_nodes(chart):
+    height, f_c, steel_area, f_y = (axis[[0, 5, -1]] for axis in chart.axes)
+    exact = batch_analysis.analyze_sections(12, height, 2, f_c, steel_area, f_y, 29000, 150)
+    np.testing.assert_allclose(chart.moment_capacity(height, f_c, steel_area, f_y), exact['M_n'])
+    np.testing.assert_allclose(chart.moment_arm_factor(height, f_c, steel_area, f_y), exact['j'])
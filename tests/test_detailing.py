@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+import detailing
+
+def test_straight_bars_larger_than_bend_tables():
+    results = detailing.detail_bars(np.array(['#14', '#18', '#5']), 5, 60, np.array([40.0, 40.0, 20.0]),
+                                    48, 12, num_hooks=np.array([0, 0, 2]))
+    np.testing.assert_array_equal(results['cut_length'][:2], [40.0, 40.0])
+    assert np.isnan(results['hook_A'][:2]).all()
+    assert results['cut_length'][2] == pytest.approx(20 + 2 * results['hook_A'][2] / 12)
+    assert np.all(results['steel_weight'] > 0)
+
+def test_hooked_bar_without_bend_raises():
+    with pytest.raises(ValueError, match="#14"):
+        detailing.detail_bars('#14', 5, 60, 40.0, 48, 12, num_hooks=1)
@@ -0,0 +1,65 @@
+import pytest
+
+import batch_analysis
+import incremental
+
+INPUTS = {'width': 12.0, 'height': 24.0, 'cover': 2.0, 'bar_size': '#6', 'spacing': 6.0, 'f_c': 4.0,
+          'f_y': 60.0, 'E_s': 29000.0, 'conc_density': 150.0, 'M_u': 120.0, 'M_s': 60.0, 'V_u': 20.0,
+          'phi_m': 0.9, 'phi_v': 0.9}
+
+def _recording_evaluator():
+    evaluated = []
+
+    def record(name, func):
+        def wrapper(*args):
+            evaluated.append(name)
+            return func(*args)
+        return wrapper
+    nodes = {name: incremental.Node(record(name, node.func), node.inputs)
+             for name, node in incremental.PROCESS_NODES.items()}
+    graph = incremental.DependencyGraph(incremental.INPUT_NAMES, nodes)
+    return incremental.IncrementalEvaluator(graph, incremental.INPUT_DEFAULTS), evaluated
+
+def test_first_update_matches_check_sections():
+    evaluator = incremental.IncrementalEvaluator(incremental.process_graph, incremental.INPUT_DEFAULTS)
+    outputs = incremental.changed_outputs(evaluator.update(INPUTS))
+    expected = batch_analysis.check_sections(**INPUTS)
+    for field in batch_analysis.RESULT_FIELDS:
+        assert outputs[field] == pytest.approx(expected[field]), field
+
+def test_spacing_change_does_not_recompute_cracking_moment():
+    evaluator, evaluated = _recording_evaluator()
+    evaluator.update(INPUTS)
+    assert 'M_cr' in evaluated
+    evaluated.clear()
+    changed = evaluator.update({'spacing': 5.0})
+    assert 'M_cr' not in evaluated
+    assert 'w_DL' not in evaluated and 'A_ts' not in evaluated
+    assert {'steel_area', 'M_n', 'crack_control_ratio'} <= set(evaluated)
+    assert 'M_cr' not in changed and 'spacing' in changed
+
+def test_unchanged_update_evaluates_nothing():
+    evaluator, evaluated = _recording_evaluator()
+    evaluator.update(INPUTS)
+    evaluated.clear()
+    assert evaluator.update({'spacing': 6.0}) == {}
+    assert evaluated == []
+
+def test_missing_inputs_on_first_update():
+    evaluator = incremental.IncrementalEvaluator(incremental.process_graph, incremental.INPUT_DEFAULTS)
+    with pytest.raises(ValueError, match='Missing inputs'):
+        evaluator.update({'width': 12.0})
+
+def test_cycle_is_rejected():
+    nodes = {'a': incremental.Node(lambda b: b, ('b',)), 'b': incremental.Node(lambda a: a, ('a',))}
+    with pytest.raises(ValueError, match='cycle'):
+        incremental.DependencyGraph((), nodes)
+
+def test_session_store_evicts_least_recent():
+    store = incremental.SessionStore(maxsize=2)
+    first, second = store.add('first'), store.add('second')
+    store.get(first)
+    store.add('third')
+    assert store.get(second) is None
+    assert store.get(first) == 'first'
+    assert store.get(None) is None
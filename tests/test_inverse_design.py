@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import batch_analysis
+import inverse_design
+
+def _random_sections(seed, num_rows=100):
+    rng = np.random.default_rng(seed)
+    return dict(width=rng.uniform(12, 48, num_rows), cover=rng.uniform(1.5, 3, num_rows),
+                bar_size=rng.choice(['#4', '#5', '#6', '#8'], num_rows), spacing=rng.uniform(4, 14, num_rows),
+                f_c=rng.choice([3.0, 4.0, 5.0, 6.0], num_rows), f_y=rng.choice([60.0, 75.0, 80.0], num_rows),
+                E_s=29000.0, conc_density=150.0, M_u=rng.uniform(2, 150, num_rows),
+                M_s=rng.uniform(1, 80, num_rows), V_u=rng.uniform(1, 40, num_rows))
+
+def _brute_force_min_height(sections, max_height, step, full_precision):
+    num_rows = len(sections['width'])
+    columns = {name: np.broadcast_to(np.asarray(value), (num_rows,))[:, None] for name, value in sections.items()}
+    heights = np.arange(4, max_height + step / 2, step)
+    best = np.full(num_rows, np.nan)
+    for start in range(0, len(heights), 250):
+        block = heights[None, start:start + 250]
+        results = batch_analysis.check_sections(height=block, full_precision=full_precision, **columns)
+        ok = np.logical_and.reduce([np.broadcast_to(results[check], (num_rows, block.shape[1]))
+                                    for check in inverse_design.HEIGHT_CHECKS])
+        found = ok.any(axis=1) & np.isnan(best)
+        best[found] = block[0, ok[found].argmax(axis=1)]
+    return best
+
+@pytest.mark.parametrize('seed, full_precision', [(0, False), (1, False), (2, False), (0, True)])
+def test_min_height_matches_brute_force(seed, full_precision):
+    # min_reinf_check passes, fails and passes again with height in these sections
+    sections = _random_sections(seed)
+    solved = inverse_design.solve_min_height(max_height=60, full_precision=full_precision, **sections)
+    expected = _brute_force_min_height(sections, 60, 0.01, full_precision)
+    np.testing.assert_array_equal(np.isnan(solved['height']), np.isnan(expected))
+    found = ~np.isnan(expected)
+    assert np.all(np.abs(solved['height'][found] - expected[found]) <= 0.011)
+
+def test_max_service_moment_unbounded_above_cracking():
+    # spacing over 18 in with an allowable steel stress above 0.6·f_y:
+    # uncracked sections fail crack control, cracked ones pass at any moment
+    section = (12, 30, 0.125, '#3', 19, 4, 40, 29000, 150)
+    max_loads = inverse_design.calc_max_loads(*section)
+    assert max_loads['M_s'] == np.inf
+    results = batch_analysis.check_sections(*section, M_u=1.5 * np.array([5.0, 500.0, 5000.0]),
+                                            M_s=np.array([5.0, 500.0, 5000.0]), V_u=1)
+    np.testing.assert_array_equal(results['crack_control_check'], [False, True, True])
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+import batch_analysis
+import load_envelope
+
+SECTION = dict(width=12, height=24, cover=2, bar_size='#6', spacing=6, f_c=4, f_y=60, E_s=29000,
+               conc_density=150)
+
+def test_envelope_picks_controlling_case():
+    M_u = [40, 150, 90]
+    M_s = [10, 40, 60]
+    V_u = [25, 5, 10]
+    results = load_envelope.analyze_load_cases(**SECTION, M_u=M_u, M_s=M_s, V_u=V_u)
+    envelope = results['envelope']
+    assert envelope['moment']['case'] == 1
+    assert envelope['shear']['case'] == 0
+    assert envelope['crack_control']['case'] == 2
+    for index in range(3):
+        single = batch_analysis.check_sections(**SECTION, M_u=M_u[index], M_s=M_s[index], V_u=V_u[index])
+        for name, (ratio_field, check_field) in load_envelope.ENVELOPE_CHECKS.items():
+            assert envelope[name]['ratio'] >= single[ratio_field] or np.isnan(single[ratio_field])
+            if check_field is not None and not single[check_field]:
+                assert envelope[name]['passes'] is False
+    assert envelope['moment']['ratio'] == pytest.approx(
+        float(batch_analysis.check_sections(**SECTION, M_u=150, M_s=60, V_u=5)['moment_ratio']))
+
+def test_envelope_passes_when_every_case_passes():
+    envelope = load_envelope.analyze_load_cases(**SECTION, M_u=[40, 50], M_s=[20, 30], V_u=[5, 6])['envelope']
+    assert envelope['moment']['passes'] is True
+    assert envelope['shear']['passes'] is True
+    assert envelope['excess_reinf']['passes'] is None
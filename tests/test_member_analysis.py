@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import member_analysis
+from conc_analysis_classes import ConcreteBeam
+from member_analysis import MemberSection
+
+SECTION = MemberSection(12, 24, 2, '#6', 6, 4, 60)
+
+def test_two_span_uniform_load_matches_closed_form():
+    L, w = 20.0, 1.5
+    end_forces = member_analysis.solve_end_forces([L, L], ['pin', 'pin', 'pin'], [1.0, 1.0], [w, w], [[], []])
+    x = np.array([0, 3 * L / 8, L])
+    M, V = member_analysis.calc_station_actions([L, L], end_forces, [w, w], [[], []], np.zeros(3, dtype=int), x)
+    np.testing.assert_allclose(M, [0, 9 * w * L ** 2 / 128, -w * L ** 2 / 8], atol=1e-9)
+    np.testing.assert_allclose(V, [3 * w * L / 8, 0, -5 * w * L / 8], atol=1e-9)
+
+def test_fixed_span_point_load_matches_closed_form():
+    L, P = 16.0, 10.0
+    end_forces = member_analysis.solve_end_forces([L], ['fixed', 'fixed'], [1.0], [0.0], [[(L / 2, P)]])
+    M, _ = member_analysis.calc_station_actions([L], end_forces, [0.0], [[(L / 2, P)]], np.zeros(2, dtype=int),
+                                                np.array([0, L / 2]))
+    np.testing.assert_allclose(M, [-P * L / 8, P * L / 8], atol=1e-9)
+
+def test_member_envelope_two_spans():
+    L, w_dead, w_live = 20.0, 1.0, 2.0
+    results = member_analysis.analyze_member([L, L], SECTION, w_dead=w_dead, w_live=w_live,
+                                             stations_per_span=9)
+    stations = results['stations']
+    w_self = ConcreteBeam(SECTION.width, SECTION.height, 0, SECTION.f_c).calc_self_load(SECTION.conc_density)
+    w_D = w_dead + w_self
+    support = np.flatnonzero((stations['span'] == 0) & (stations['x'] == L))[0]
+    # both spans loaded governs the interior support moment
+    assert stations['M_s_neg'][support] == pytest.approx(-(w_D + w_live) * L ** 2 / 8)
+    assert stations['M_u_neg'][support] == pytest.approx(-(1.25 * w_D + 1.75 * w_live) * L ** 2 / 8)
+    # live load on the first span only governs its positive moment
+    x = 3 * L / 8
+    station = np.flatnonzero((stations['span'] == 0) & np.isclose(stations['x'], x))[0]
+    M_D = 3 / 8 * w_D * L * x - w_D * x ** 2 / 2
+    M_L = 7 / 16 * w_live * L * x - w_live * x ** 2 / 2
+    assert stations['M_s_pos'][station] == pytest.approx(M_D + M_L)
+    assert results['governing']['moment']['span'] in (0, 1)
+
+def test_unstable_supports_raise():
+    with pytest.raises(ValueError):
+        member_analysis.analyze_member([10.0], SECTION, supports=['free', 'free'], w_dead=1.0)
@@ -0,0 +1,23 @@
+import pytest
+
+import app as beam_app
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(beam_app.app.config, 'PROFILE_SAMPLE_RATE', 0.0)
+    return beam_app.app.test_client()
+
+def test_profile_control_disabled_by_default(client, monkeypatch):
+    monkeypatch.setitem(beam_app.app.config, 'PROFILE_CONTROL', False)
+    response = client.post('/metrics/profile', json={'sample_rate': 1.0, 'reset': True})
+    assert response.status_code == 403
+    assert beam_app.app.config['PROFILE_SAMPLE_RATE'] == 0.0
+
+def test_profile_control_when_enabled(client, monkeypatch):
+    monkeypatch.setitem(beam_app.app.config, 'PROFILE_CONTROL', True)
+    response = client.post('/metrics/profile', json={'sample_rate': 2.0})
+    assert response.get_json()['sample_rate'] == 1.0
+
+def test_profile_limit_must_be_positive(client):
+    assert client.get('/metrics/profile?limit=0').status_code == 400
+    assert client.get('/metrics/profile?limit=5').status_code == 200
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import batch_analysis
+import rebar_optimizer
+import rebar_props
+
+CASES = [
+    dict(width=12, height=24, cover=2, f_c=4, f_y=60, E_s=29000, conc_density=150, M_u=120, M_s=80, V_u=20),
+    dict(width=36, height=30, cover=2, f_c=5, f_y=60, E_s=29000, conc_density=150, M_u=400, M_s=250, V_u=60),
+    dict(width=12, height=18, cover=1.5, f_c=4, f_y=75, E_s=29000, conc_density=145, M_u=40, M_s=25, V_u=8),
+]
+
+def _brute_force_lightest(case):
+    # every bar size and spacing, with the clear spacing rule of the optimizer
+    sizes, spacings = np.meshgrid(np.array(rebar_optimizer.DEFAULT_BAR_SIZES),
+                                  np.array(rebar_optimizer.DEFAULT_SPACINGS), indexing='ij')
+    sizes, spacings = sizes.ravel(), spacings.ravel()
+    results = batch_analysis.check_sections(bar_size=sizes, spacing=spacings, **case)
+    passing = np.logical_and.reduce([results[field] for field in rebar_optimizer.CHECK_FIELDS])
+    best = None
+    for bar_size, spacing in zip(sizes[passing], spacings[passing]):
+        bar = rebar_props.RebarProperties(str(bar_size))
+        if spacing < bar.bar_diameter + max(1.5 * bar.bar_diameter, 1.5):
+            continue
+        weight = case['width'] / spacing * bar.bar_weight
+        if best is None or weight < best[0]:
+            best = (weight, str(bar_size), float(spacing))
+    return best
+
+@pytest.mark.parametrize('case', CASES)
+def test_lightest_layout_matches_brute_force(case):
+    layouts = rebar_optimizer.optimize_reinforcement(**case)
+    weight, bar_size, spacing = _brute_force_lightest(case)
+    assert layouts[0]['steel_weight'] == pytest.approx(weight)
+    assert (layouts[0]['bar_size'], layouts[0]['spacing']) == (bar_size, spacing)
+    weights = [layout['steel_weight'] for layout in layouts]
+    assert weights == sorted(weights)
+
+def test_no_layout_for_impossible_moment():
+    case = dict(CASES[0], M_u=5000, M_s=3000)
+    assert rebar_optimizer.optimize_reinforcement(**case) == []
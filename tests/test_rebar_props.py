@@ -0,0 +1,14 @@
+import os
+
+import rebar_props
+
+def test_legacy_default_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bar = rebar_props.RebarProperties('#5', '/data/props.csv')
+    assert bar.bar_area == rebar_props.RebarProperties('#5').bar_area
+    assert rebar_props._resolve_path('/data/props.csv') == os.path.join(rebar_props.DATA_DIR, 'props.csv')
+
+def test_prop_table():
+    table = rebar_props.RebarProperties('#5').prop_table
+    assert len(table) == 1
+    assert float(table['bar_area'].values[0]) == rebar_props.RebarProperties('#5').bar_area
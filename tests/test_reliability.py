@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+import reliability
+from reliability import Distribution
+
+INPUTS = {'width': 12, 'height': 24, 'cover': 2, 'bar_size': '#6', 'spacing': 6, 'f_c': 4, 'f_y': 60,
+          'E_s': 29000, 'conc_density': 150, 'M_u': 80, 'M_s': 50, 'V_u': 10}
+
+def test_positive_samples_are_truncated_at_zero():
+    values = Distribution('normal', 1.0, 1.0).sample(np.random.default_rng(0), 10000, positive=True)
+    assert values.min() > 0
+    assert (Distribution('normal', 1.0, 1.0).sample(np.random.default_rng(0), 10000) <= 0).any()
+
+def test_wide_strength_distribution_gives_no_nan_failures():
+    inputs = dict(INPUTS, f_c=Distribution('normal', 4, 3), cover=Distribution('uniform', 2, 2))
+    columns = reliability.sample_inputs(inputs, np.random.default_rng(1), 20000)
+    assert columns['f_c'].min() > 0 and columns['cover'].min() > 0
+    results = reliability.run_monte_carlo(inputs, max_samples=20000, chunk_size=5000,
+                                           min_samples=20000)
+    assert results['num_samples'] == 20000
+    assert results['checks']['moment_check']['p_f'] < 1
+
+def test_non_positive_mean_is_rejected():
+    with pytest.raises(ValueError, match="f_c"):
+        reliability.run_monte_carlo(dict(INPUTS, f_c=Distribution('normal', -1, 1)), max_samples=10)
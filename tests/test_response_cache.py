@@ -0,0 +1,53 @@
+import pytest
+
+import app as beam_app
+import response_cache
+
+FORM = {'width': '12', 'height': '24', 'cover': '2', 'bar_size': '#6', 'spacing': '6', 'f_c': '4',
+        'f_y': '60', 'E_s': '29000', 'conc_density': '150', 'M_u': '120', 'M_s': '60', 'V_u': '20',
+        'phi_m': '0.9', 'phi_v': '0.9'}
+
+@pytest.fixture
+def client():
+    beam_app.response_cache.response_cache.clear()
+    return beam_app.app.test_client()
+
+def test_canonical_key_ignores_formatting():
+    key = response_cache.canonical_key(FORM)
+    assert response_cache.canonical_key(dict(FORM, width='12.0', bar_size=' #6 ')) == key
+    assert response_cache.canonical_key(dict(FORM, precision='rounded')) == key
+    assert response_cache.canonical_key(dict(FORM, precision='full')) != key
+    assert response_cache.canonical_key(dict(FORM, width='x')) is None
+    assert response_cache.canonical_key({k: v for k, v in FORM.items() if k != 'M_s'}) is None
+
+def test_repeated_process_with_etag_returns_not_modified(client):
+    first = client.post('/process', data=FORM)
+    assert first.status_code == 200 and first.headers['ETag']
+    cached = client.post('/process', data=dict(FORM, width='12.0'))
+    assert cached.data == first.data
+    assert beam_app.response_cache.response_cache.hits == 1
+    revalidated = client.post('/process', data=FORM, headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert not revalidated.data
+    changed = client.post('/process', data=dict(FORM, M_u='130'),
+                          headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_backends_evict_least_recent(backend, tmp_path):
+    cache = response_cache.create_cache(str(tmp_path / 'cache.db') if backend == 'sqlite' else None, maxsize=2)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    cache.get('a')
+    cache.set('c', b'3')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1'
+    assert cache.get('c') == b'3'
+    assert len(cache.backend) == 2
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (3, 1)
+
+def test_expired_entries_are_dropped(tmp_path):
+    for cache in (response_cache.create_cache(ttl=-1),
+                  response_cache.create_cache(str(tmp_path / 'cache.db'), ttl=-1)):
+        cache.set('a', b'1')
+        assert cache.get('a') is None
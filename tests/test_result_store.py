@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+import batch_check
+import result_store
+
+def test_float_chunk_after_integer_chunk(tmp_path):
+    path = str(tmp_path / 'results.store')
+    first = pd.DataFrame({'spacing': [6, 8], 'M_u': [40, 50], 'bar_size': ['#5', '#6'],
+                          'moment_check': [True, False]})
+    second = pd.DataFrame({'spacing': [7.5, 9.25], 'M_u': [40.5, 55.1], 'bar_size': ['#8', '#11'],
+                           'moment_check': [False, True]})
+    store = result_store.open_store(path, result_store.infer_schema(first))
+    store.append(first)
+    store.append(second)
+
+    store = result_store.ResultStore(path)
+    assert store.schema['spacing'] == np.dtype('<f8')
+    assert store.schema['moment_check'] == np.dtype(bool)
+    np.testing.assert_array_equal(store['spacing'], [6, 8, 7.5, 9.25])
+    np.testing.assert_array_equal(store['M_u'], [40, 50, 40.5, 55.1])
+    assert list(store.select(columns=['bar_size'])['bar_size']) == ['#5', '#6', '#8', '#11']
+
+def test_run_batch_store_matches_results(tmp_path):
+    beams = pd.DataFrame({
+        'width': [12, 12, 12.5, 24, 18, 36], 'height': [18, 20, 24, 30, 22.5, 40],
+        'cover': [2, 2, 2, 2.5, 2, 3], 'bar_size': ['#5', '#6', '#8', '#6', '#5', '#9'],
+        'spacing': [6, 8, 7.5, 6, 9, 12], 'f_c': [4, 4, 5, 4, 4.5, 6], 'f_y': [60] * 6,
+        'E_s': [29000] * 6, 'conc_density': [150] * 6, 'M_u': [40, 60, 40.5, 120, 55, 300],
+        'M_s': [25, 40, 30, 80, 35.5, 200], 'V_u': [15, 20, 18.5, 40, 20, 90],
+        'phi_m': [0.9] * 6, 'phi_v': [0.9] * 6})
+    input_path = str(tmp_path / 'beams.csv')
+    output_path = str(tmp_path / 'results.store')
+    beams.to_csv(input_path, index=False)
+
+    assert batch_check.run_batch(input_path, output_path, chunk_size=2) == len(beams)
+    store = result_store.ResultStore(output_path)
+    expected = batch_check.check_chunk(pd.read_csv(input_path, dtype={'bar_size': str}))
+    stored = store.to_frame()
+    for column in expected.columns:
+        np.testing.assert_array_equal(stored[column].to_numpy(), expected[column].to_numpy())
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import batch_analysis
+import sensitivity
+
+BEAMS = dict(width=np.array([12.0, 18.0, 10.0]), height=np.array([24.0, 36.0, 20.0]), cover=2.0,
+             bar_size=np.array(['#6', '#8', '#5']), spacing=np.array([6.0, 5.0, 4.0]),
+             f_c=np.array([4.5, 6.0, 5.0]), f_y=np.array([60.0, 80.0, 60.0]), E_s=29000.0,
+             conc_density=150.0, M_u=np.array([80.0, 300.0, 40.0]), M_s=np.array([50.0, 180.0, 25.0]))
+
+def _values(**inputs):
+    bars = batch_analysis.lookup_bar_props(inputs.pop('bar_size'))
+    return sensitivity.calc_closed_forms(bar_diameter=bars['bar_diameter'], bar_area=bars['bar_area'], **inputs)
+
+@pytest.mark.parametrize('param', sensitivity.SENSITIVITY_INPUTS)
+def test_derivatives_match_finite_differences(param):
+    analytic = sensitivity.calc_sensitivities(**BEAMS, wrt=(param,))
+    step = 1e-6 * np.maximum(np.abs(np.broadcast_to(BEAMS[param], (3,))), 1.0)
+    upper = _values(**dict(BEAMS, **{param: BEAMS[param] + step}))
+    lower = _values(**dict(BEAMS, **{param: BEAMS[param] - step}))
+    for name in sensitivity.SENSITIVITY_OUTPUTS:
+        numeric = (sensitivity.Dual.lift(upper[name]).value - sensitivity.Dual.lift(lower[name]).value) / (2 * step)
+        np.testing.assert_allclose(analytic['derivatives'][name][param], numeric, rtol=1e-5, atol=1e-8,
+                                   err_msg=f"d{name}/d{param}")
+
+def test_values_match_full_precision_checks():
+    values = sensitivity.calc_sensitivities(**BEAMS)['values']
+    results = batch_analysis.check_sections(V_u=10.0, full_precision=True, **BEAMS)
+    np.testing.assert_allclose(values['moment_ratio'], results['moment_ratio'])
+    np.testing.assert_allclose(values['crack_control_ratio'], results['crack_control_ratio'])
+    np.testing.assert_allclose(values['s_max'], results['s_max'])
+
+def test_unknown_parameter_is_rejected():
+    with pytest.raises(ValueError):
+        sensitivity.calc_sensitivities(**BEAMS, wrt=('V_u',))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import batch_analysis
+import serviceability
+
+SECTIONS = dict(width=np.array([12.0, 18.0]), height=np.array([24.0, 30.0]), cover=2.0,
+                bar_size=np.array(['#6', '#8']), spacing=np.array([6.0, 5.0]), f_c=4.0, f_y=60.0,
+                E_s=29000.0, conc_density=150.0)
+
+@pytest.fixture
+def section():
+    return batch_analysis.prepare_sections(**SECTIONS, full_precision=True)
+
+def test_cracked_inertia_about_transformed_neutral_axis(section):
+    b, d, k, n, A_s = (section[name] for name in ('width', 'd', 'k', 'n', 'steel_area'))
+    kd = k * d
+    # the neutral axis balances the first moments of the transformed section
+    np.testing.assert_allclose(b * kd ** 2 / 2, n * A_s * (d - kd))
+    I_cr = serviceability.calc_cracked_inertia(b, d, k, n, A_s)
+    np.testing.assert_allclose(I_cr, b * kd ** 3 / 12 + b * kd * (kd / 2) ** 2 + n * A_s * (d - kd) ** 2)
+    assert np.all(I_cr < section['I_g'])
+
+def test_effective_inertia_limits(section):
+    M_cr, I_g = section['M_cr'], section['I_g']
+    I_cr = serviceability.calc_cracked_inertia(section['width'], section['d'], section['k'], section['n'],
+                                               section['steel_area'])
+    for calc in (serviceability.calc_branson_inertia, serviceability.calc_bischoff_inertia):
+        np.testing.assert_allclose(calc(0.5 * M_cr, M_cr, I_g, I_cr), I_g)
+        np.testing.assert_allclose(calc(1e6 * M_cr, M_cr, I_g, I_cr), I_cr, rtol=1e-6)
+    ratio = M_cr / (2 * M_cr)
+    np.testing.assert_allclose(serviceability.calc_branson_inertia(2 * M_cr, M_cr, I_g, I_cr),
+                               ratio ** 3 * I_g + (1 - ratio ** 3) * I_cr)
+
+def test_simple_span_deflection_matches_closed_form():
+    w, L, E_c, I = 2.0, 30.0, 3600.0, 20000.0
+    M_a = w * L ** 2 / 8
+    expected = 5 * (w / 12) * (L * 12) ** 4 / (384 * E_c * I)
+    assert serviceability.calc_immediate_deflection(M_a, L, E_c, I) == pytest.approx(expected)
+
+def test_long_term_factor():
+    np.testing.assert_allclose(serviceability.calc_long_term_factor(2.0, [0.0, 1.0, 2.0]), [3.0, 2.4, 1.8])
+    assert serviceability.calc_long_term_factor(2.0, 4.0) == pytest.approx(1.6)
+    assert serviceability.calc_long_term_factor(2.0, 0.0, gross=True) == pytest.approx(4.0)
+
+def test_load_axis_matches_per_load_results(section):
+    levels = np.array([20.0, 80.0, 160.0])
+    stacked = serviceability.calc_deflections(section, levels, 24.0, load_axis=True)
+    assert stacked['immediate'].shape == (2, 3)
+    for index, M_a in enumerate(levels):
+        single = serviceability.calc_deflections(section, M_a, 24.0)
+        for name in ('I_e', 'immediate', 'long_term', 'total'):
+            np.testing.assert_allclose(stacked[name][:, index], single[name])
+
+def test_check_deflections_limit():
+    results = serviceability.check_deflections(**SECTIONS, M_a=[60.0, 120.0], span=24.0, limit_ratio=800)
+    np.testing.assert_allclose(results['allowable'], 24.0 * 12 / 800)
+    np.testing.assert_array_equal(results['deflection_check'], results['immediate'] <= results['allowable'])
+
+def test_unknown_method_is_rejected(section):
+    with pytest.raises(ValueError):
+        serviceability.calc_deflections(section, 50.0, 20.0, method='exact')
@@ -0,0 +1,30 @@
+import pytest
+
+from conc_analysis_classes import BeamCapacity
+from strain_compat import FiberSection, SteelLayer, solve_bracketed_newton
+
+@pytest.mark.parametrize('width, height, d_c, f_c, steel_area, f_y', [
+    (12, 24, 2.5, 4, 1.2, 60),
+    (18, 36, 3.0, 6, 3.0, 75),
+    (10, 20, 2.0, 8, 0.8, 80),
+])
+def test_single_layer_matches_beam_capacity(width, height, d_c, f_c, steel_area, f_y):
+    section = FiberSection(width, height, f_c, [SteelLayer(height - d_c, steel_area)], f_y)
+    capacity = BeamCapacity(width, height, d_c, f_c, steel_area, f_y, full_precision=True)
+    nominal = section.nominal_capacity()
+    assert nominal['a'] == pytest.approx(capacity.calc_comp_block_depth(), rel=1e-9)
+    assert nominal['M_n'] == pytest.approx(capacity.calc_moment_capacity(), rel=1e-9)
+    assert nominal['epsilon_t'] == pytest.approx(capacity.calc_epsilon_t(), rel=1e-9)
+    # compression positive, so the yielded tension layer is at -f_y
+    assert nominal['steel_stress'][0] == pytest.approx(-f_y)
+
+def test_moment_curvature_approaches_nominal_capacity():
+    section = FiberSection(12, 24, 4, [SteelLayer(21.5, 1.2)], 60, num_fibers=200)
+    curve = section.moment_curvature()
+    assert all(later >= earlier for earlier, later in zip(curve['curvature'], curve['curvature'][1:]))
+    assert curve['moment'][-1] == pytest.approx(section.nominal_capacity()['M_n'], rel=0.03)
+
+def test_bracketed_newton_finds_root():
+    root, iterations = solve_bracketed_newton(lambda x: (x ** 3 - 2, 3 * x ** 2), 0, 2)
+    assert root == pytest.approx(2 ** (1 / 3))
+    assert iterations < 20
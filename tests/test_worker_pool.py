@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+import worker_pool
+
+class _ImmediateExecutor:
+    def submit(self, function, *args):
+        future = Future()
+        future.set_result(None)
+        return future
+
+def test_concurrent_submits_respect_max_rows(monkeypatch):
+    manager = worker_pool.JobManager(max_workers=1, chunk_size=10, max_rows=100)
+    manager._executor = _ImmediateExecutor()
+    release = threading.Event()
+    # the first submit waits between its capacity check and queuing its chunks
+    monkeypatch.setattr(manager, 'start', lambda: release.wait(5))
+
+    first = threading.Thread(target=manager.submit, args=({'width': list(range(60))}, 60))
+    first.start()
+    try:
+        while not manager._jobs:
+            pass
+        with pytest.raises(worker_pool.JobCapacityError):
+            manager.submit({'width': list(range(60))}, 60)
+    finally:
+        release.set()
+        first.join()
+    assert len(manager._jobs) == 1
+    job, = manager._jobs.values()
+    assert job['queued'] and len(job['futures']) == 6
+
+def test_failed_submit_releases_rows(monkeypatch):
+    manager = worker_pool.JobManager(max_workers=1, max_rows=100)
+    monkeypatch.setattr(manager, 'start', lambda: (_ for _ in ()).throw(OSError("no workers")))
+    with pytest.raises(OSError):
+        manager.submit({'width': list(range(60))}, 60)
+    assert not manager._jobs
@@ -0,0 +1,219 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import rebar_props
+import batch_analysis
+
+def init_worker():
+    """
+    Loads the rebar catalog once in each worker process.
+    """
+    rebar_props.get_bar_catalog()
+
+def _ready():
+    return os.getpid()
+
+def run_check_chunk(columns: dict) -> dict:
+    """
+    Runs batch_analysis.check_sections on a chunk of input columns.
+
+    Returns:
+    - Dictionary of result lists keyed by the names in RESULT_FIELDS.
+    """
+    results = batch_analysis.check_sections(**columns)
+    return {field: np.asarray(results[field]).tolist() for field in batch_analysis.RESULT_FIELDS}
+
+def check_chunk_arrays(columns: dict) -> dict:
+    """
+    Runs batch_analysis.check_sections on a chunk of input columns.
+
+    Returns:
+    - Dictionary of result arrays keyed by the names in RESULT_FIELDS.
+    """
+    results = batch_analysis.check_sections(**columns)
+    return {field: np.ascontiguousarray(results[field]) for field in batch_analysis.RESULT_FIELDS}
+
+def map_ordered(executor, func, items, max_pending: int):
+    """
+    Submits func(item) for each item and yields the results in input order,
+    keeping at most max_pending tasks queued so inputs are read lazily.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def check_parallel(columns: dict, num_rows: int, max_workers: int=None, chunk_size: int=10000) -> dict:
+    """
+    Runs the design check chain over a dataset on several processes.
+
+    The rows are split into chunks of chunk_size, each worker loads the
+    rebar catalog once, and the chunk results are merged in input order.
+
+    Parameters:
+    - columns: Input arrays keyed by the names in INPUT_FIELDS.
+    - num_rows: Number of beams.
+    - max_workers: Number of processes, defaults to the CPU count.
+    - chunk_size: Number of beams per task.
+
+    Returns:
+    - Dictionary of result arrays keyed by the names in RESULT_FIELDS.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    columns = {field: np.asarray(values) for field, values in columns.items()}
+    columns = {field: np.broadcast_to(values, (num_rows,)) if values.ndim == 0 else values
+               for field, values in columns.items()}
+    chunks = ({field: values[start:start + chunk_size] for field, values in columns.items()}
+              for start in range(0, num_rows, chunk_size))
+    with ProcessPoolExecutor(max_workers, initializer=init_worker) as executor:
+        results = list(map_ordered(executor, check_chunk_arrays, chunks, 2 * max_workers))
+    if not results:
+        return check_chunk_arrays(columns)
+    return {field: np.concatenate([chunk[field] for chunk in results])
+            for field in batch_analysis.RESULT_FIELDS}
+
+class JobCapacityError(Exception):
+    """
+    Raised when a job would take the retained results past their limit.
+    """
+
+def _pool_context():
+    # the web server has threads running when the pool starts, and forking
+    # a threaded process can copy held locks into the workers
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+class JobManager:
+    """
+    Runs batch check jobs on a pool of worker processes and keeps their
+    results for polling.
+
+    Results are returned once: the first poll after a job finishes hands
+    them over and frees them. Finished jobs are dropped after result_ttl
+    seconds, and no more than max_rows rows are held by unfetched jobs.
+    """
+    def __init__(self, max_workers: int=None, chunk_size: int=10000, max_jobs: int=1000,
+                 result_ttl: float=600, max_rows: int=5000000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_jobs = max_jobs
+        self.result_ttl = result_ttl
+        self.max_rows = max_rows
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Creates the process pool and starts every worker up front.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=_pool_context(),
+                                                     initializer=init_worker)
+                executor = self._executor
+            else:
+                return
+        for future in [executor.submit(_ready) for _ in range(self.max_workers)]:
+            future.result()
+
+    def shutdown(self, wait: bool=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def submit(self, columns: dict, num_rows: int) -> str:
+        """
+        Splits the input columns into chunks and queues them on the pool.
+
+        Parameters:
+        - columns: Input arrays keyed by the names in INPUT_FIELDS.
+        - num_rows: Number of beams in the job.
+
+        Returns:
+        - Job id.
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._evict()
+            retained = sum(job['num_rows'] for job in self._jobs.values() if 'futures' in job)
+            if retained + num_rows > self.max_rows:
+                raise JobCapacityError(f"Job queue is full; {retained} of {self.max_rows} rows are held "
+                                       "by unfinished or unretrieved jobs.")
+            # the rows are reserved before the lock is released, so
+            # concurrent submits cannot both pass the check
+            job = self._jobs[job_id] = {'futures': [], 'num_rows': num_rows, 'finished': None, 'queued': False}
+        try:
+            self.start()
+            for start in range(0, num_rows, self.chunk_size):
+                chunk = {field: values[start:start + self.chunk_size] for field, values in columns.items()}
+                job['futures'].append(self._executor.submit(run_check_chunk, chunk))
+        except BaseException:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            raise
+        with self._lock:
+            job['queued'] = True
+        return job_id
+
+    def _evict(self):
+        now = time.monotonic()
+        for job_id, job in list(self._jobs.items()):
+            if job['finished'] is None and job['queued'] \
+                    and all(future.done() for future in job.get('futures', ())):
+                job['finished'] = now
+            if job['finished'] is not None and now - job['finished'] > self.result_ttl:
+                del self._jobs[job_id]
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((job_id for job_id, job in self._jobs.items() if job['finished'] is not None), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    def status(self, job_id: str) -> dict:
+        """
+        Returns the state of a job and, once finished, its results.
+
+        Returns:
+        - None for an unknown or expired job, otherwise a dictionary with
+          'status' ('running', 'done', 'failed' or 'retrieved'), progress
+          and 'results' or 'error'. Results are included only in the first
+          'done' state returned.
+        """
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            futures = job.get('futures')
+            state = {'job_id': job_id, 'num_rows': job['num_rows']}
+            if futures is None:
+                state['status'] = 'retrieved'
+                return state
+            finished = sum(future.done() for future in futures)
+            state.update(chunks_done=finished, chunks_total=len(futures))
+            if finished < len(futures) or not job['queued']:
+                state['status'] = 'running'
+                return state
+            errors = [future.exception() for future in futures if future.exception() is not None]
+            if errors:
+                state['status'] = 'failed'
+                state['error'] = str(errors[0])
+                return state
+            # hand the results over and keep only the job's state
+            del job['futures']
+        state['status'] = 'done'
+        state['results'] = {field: [value for future in futures for value in future.result()[field]]
+                            for field in batch_analysis.RESULT_FIELDS}
+        return state